@@ -1,7 +1,27 @@
-import type { LessonPlanResponse } from '../types/api';
+import type { LessonPlanResponse, LessonPlanJobResponse } from '../types/api';
 
+const API_BASE = 'http://localhost:8000';
+const POLL_INTERVAL_MS = 2000;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Returns the stored plan if one exists; otherwise queues a generation job
+// and polls it, so page refreshes never re-run the generation pipeline.
 export const fetchLessonPlan = async (sessionId: string): Promise<LessonPlanResponse> => {
-  const response = await fetch(`http://localhost:8000/lesson-plan/generate/${sessionId}`);
-  if (!response.ok) throw new Error('Failed to fetch lesson plan');
-  return response.json();
-};
\ No newline at end of file
+  const stored = await fetch(`${API_BASE}/lesson-plan/${sessionId}`);
+  if (stored.ok) return (await stored.json()).data;
+  if (stored.status !== 404) throw new Error('Failed to fetch lesson plan');
+
+  const enqueued = await fetch(`${API_BASE}/lesson-plan/jobs/${sessionId}`, { method: 'POST' });
+  if (!enqueued.ok) throw new Error('Failed to start lesson plan generation');
+  const { job } = (await enqueued.json()) as LessonPlanJobResponse;
+
+  while (true) {
+    await sleep(POLL_INTERVAL_MS);
+    const polled = await fetch(`${API_BASE}/lesson-plan/jobs/${job.job_id}`);
+    if (!polled.ok) throw new Error('Failed to fetch lesson plan job status');
+    const status = (await polled.json()) as LessonPlanJobResponse;
+    if (status.job.status === 'succeeded' && status.data) return status.data;
+    if (status.job.status === 'failed') throw new Error(status.job.error ?? 'Lesson plan generation failed');
+  }
+};
@@ -15,6 +15,7 @@ export interface StartInterviewRequest {
   export interface AnswerInterviewRequest {
     user_id: string;
     answer: string;
+    session_id?: string;
   }
   
   export interface AnswerInterviewIntermediateResponse {
@@ -84,4 +85,22 @@ export interface StartInterviewRequest {
       score: number;
     }[];
     curriculum_generated: string[];
-  }
\ No newline at end of file
+  }
+  
+  export interface LessonPlanJob {
+    job_id: string;
+    session_id: string;
+    status: "queued" | "running" | "succeeded" | "failed";
+    stage: string | null;
+    created_at: string;
+    started_at: string | null;
+    finished_at: string | null;
+    lesson_plan_id: string | null;
+    error: string | null;
+  }
+
+  export interface LessonPlanJobResponse {
+    status?: string;
+    job: LessonPlanJob;
+    data?: LessonPlanResponse;
+  }
@@ -0,0 +1,263 @@
+"""
+Load benchmark: full simulated interviews through the FastAPI app.
+
+Each simulated user runs POST /interview/start, POST /interview/answer until
+the interview is done, then GET /lesson-plan/generate/{id} and GET
+/persona/{id}. Reports p50/p95/p99 per endpoint, requests/s, the per-node
+time breakdown from /stats/nodes, Mongo/Qdrant call counts and memory growth.
+
+By default the app runs in-process on the offline providers (fixture LLM,
+in-memory Qdrant, mongomock; see interview_module/core/fakes.py), so it
+measures the orchestration itself:
+
+    python benchmarks/interview_load.py --interviews 50 --concurrency 10
+    FAKE_LLM_LATENCY_MS=300 python benchmarks/interview_load.py --concurrency 20
+
+Or against a live server (uvicorn main:app) with whatever backends it uses;
+node timings are then cumulative since the server started:
+
+    python benchmarks/interview_load.py --base-url http://localhost:8000 --interviews 10
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import os
+import resource
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+OFFLINE_ENV = {
+    "LLM_PROVIDER": "fake",
+    "VECTOR_STORE_PROVIDER": "memory",
+    "MONGO_PROVIDER": "mock",
+    "INTERVIEW_CHECKPOINTER": "memory",
+    # The gateway's rate limit would otherwise dominate the measurement
+    "LLM_REQUESTS_PER_MINUTE": "1000000",
+    "LLM_BURST": "1000",
+    "GOOGLE_API_KEY": "offline",
+}
+
+# Mix of requests: repeated subjects exercise the curriculum cache, the
+# Python/ML goals match the fixture documents and take the RAG path
+INTERVIEW_REQUESTS = [
+    ("Python", "learn python variables lists and functions", "Beginner"),
+    ("Machine Learning", "understand supervised machine learning and overfitting", "Intermediate"),
+    ("Cooking", "bake bread at home", "Beginner"),
+    ("Databases", "write SQL queries with joins", "Beginner"),
+]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        # Not Linux: fall back to the peak
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, label, request):
+        start = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError as e:
+            self.errors[label] += 1
+            print(f"❌ {label}: {type(e).__name__}: {e}", file=sys.stderr)
+            return None
+        self.latencies[label].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+            print(f"❌ {label}: HTTP {response.status_code} {response.text[:200]}", file=sys.stderr)
+            return None
+        return response.json()
+
+    @property
+    def failed(self):
+        return sum(self.errors.values())
+
+    @property
+    def requests(self):
+        return sum(len(samples) for samples in self.latencies.values())
+
+
+async def run_interview(client, recorder, number, max_answers):
+    subject, goal, level = INTERVIEW_REQUESTS[number % len(INTERVIEW_REQUESTS)]
+    user_id = f"bench-user-{number}"
+    started = time.perf_counter()
+
+    body = await recorder.call("POST /interview/start", client.post(
+        "/interview/start", json={"user_id": user_id, "subject": subject, "goal": goal, "level": level}
+    ))
+    if body is None:
+        return None
+    session_id = body["session_id"]
+
+    for i in range(max_answers):
+        body = await recorder.call("POST /interview/answer", client.post(
+            "/interview/answer",
+            json={"user_id": user_id, "session_id": session_id, "answer": f"Answer {i} about {subject}"},
+        ))
+        if body is None:
+            return None
+        if body.get("status") == "done":
+            break
+    else:
+        print(f"❌ Interview {session_id} not done after {max_answers} answers", file=sys.stderr)
+
+    await recorder.call("GET /lesson-plan/generate", client.get(f"/lesson-plan/generate/{session_id}"))
+    await recorder.call("GET /persona", client.get(f"/persona/{session_id}"))
+    return time.perf_counter() - started
+
+
+async def run_interviews(client, recorder, args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(number):
+        async with semaphore:
+            return await run_interview(client, recorder, number, args.max_answers)
+
+    return await asyncio.gather(*(limited(number) for number in range(args.interviews)))
+
+
+def report_latencies(recorder, elapsed):
+    print(f"\n{'endpoint':<28}{'n':>6}{'err':>5}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for label, samples in recorder.latencies.items():
+        print(
+            f"{label:<28}{len(samples):>6}{recorder.errors[label]:>5}"
+            f"{statistics.median(samples):>8.1f}ms{percentile(samples, 95):>8.1f}ms"
+            f"{percentile(samples, 99):>8.1f}ms{max(samples):>8.1f}ms"
+        )
+    print(f"\nrequests: {recorder.requests} in {elapsed:.2f}s = {recorder.requests / elapsed:.1f} req/s")
+
+
+def report_nodes(stats):
+    nodes = stats["nodes"]
+    total = sum(node["total_ms"] for node in nodes.values()) or 1
+    print(f"\n{'node':<28}{'calls':>7}{'total':>11}{'share':>7}{'mean':>10}{'p95':>10}"
+          f"{'tokens':>9}{'vector':>10}{'db':>10}")
+    for name, node in nodes.items():
+        print(
+            f"{name:<28}{node['calls']:>7}{node['total_ms']:>9.0f}ms{node['total_ms'] / total:>7.0%}"
+            f"{node['mean_ms']:>8.1f}ms{node['p95_ms']:>8.1f}ms"
+            f"{node['prompt_tokens'] + node['completion_tokens']:>9}"
+            f"{node['vector_search_ms']:>8.0f}ms{node['db_ms']:>8.0f}ms"
+        )
+
+
+def report_external_calls(before, after, interviews):
+    print()
+    for backend in ("mongo", "qdrant"):
+        operations = after.get(backend, {})
+        previous = before.get(backend, {})
+        delta = {op: calls - previous.get(op, 0) for op, calls in operations.items()}
+        detail = ", ".join(
+            f"{op}={calls}" for op, calls in sorted(delta.items()) if op not in ("total", "seconds") and calls
+        )
+        total = delta.get("total", 0)
+        seconds = delta.get("seconds", 0)
+        print(f"{backend}: {total} calls ({total / interviews:.1f}/interview, {seconds:.2f}s) {detail}")
+
+
+async def benchmark(client, args, in_process, app_output):
+    with app_output:
+        # One warm-up interview loads models and fills lazy singletons
+        warmup = Recorder()
+        await run_interviews(client, warmup, argparse.Namespace(**{**vars(args), "interviews": 1}))
+    if warmup.failed:
+        print("❌ Warm-up interview failed")
+        return 1
+
+    if in_process:
+        from interview_module.core.instrumentation import reset_metrics
+
+        reset_metrics()
+    before = (await client.get("/stats/nodes")).json()
+    gc.collect()
+    rss_before = current_rss_mb()
+
+    recorder = Recorder()
+    start = time.perf_counter()
+    with app_output:
+        durations = await run_interviews(client, recorder, args)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    after = (await client.get("/stats/nodes")).json()
+    completed = [seconds for seconds in durations if seconds is not None]
+
+    report_latencies(recorder, elapsed)
+    if completed:
+        print(
+            f"interviews: {len(completed)}/{args.interviews} completed, "
+            f"p50={statistics.median(completed):.2f}s p95={percentile(completed, 95):.2f}s"
+        )
+    report_nodes(after)
+    report_external_calls(before["external_calls"], after["external_calls"], max(1, len(completed)))
+    if in_process:
+        growth = current_rss_mb() - rss_before
+        print(f"memory: rss {rss_before:.0f}MB -> {rss_before + growth:.0f}MB "
+              f"({growth:+.1f}MB, {growth * 1024 / max(1, len(completed)):+.0f}KB/interview)")
+    else:
+        print(f"server peak rss: {before['max_rss_mb']}MB -> {after['max_rss_mb']}MB")
+
+    if recorder.failed:
+        print(f"❌ {recorder.failed} failed requests")
+        return 1
+    print(f"✅ {len(completed)} interviews at concurrency {args.concurrency}")
+    return 0
+
+
+async def main(args):
+    timeout = httpx.Timeout(args.request_timeout)
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=timeout) as client:
+            return await benchmark(client, args, in_process=False, app_output=contextlib.nullcontext())
+
+    for key, value in OFFLINE_ENV.items():
+        os.environ.setdefault(key, value)
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    with open(os.devnull, "w") as devnull:
+        # The app logs every node with print; keep the report readable
+        app_output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(devnull)
+        with app_output:
+            from main import app
+
+            transport = httpx.ASGITransport(app=app)
+            lifespan = app.router.lifespan_context(app)
+            await lifespan.__aenter__()
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=timeout) as client:
+                return await benchmark(client, args, in_process=True, app_output=app_output)
+        finally:
+            with app_output:
+                await lifespan.__aexit__(None, None, None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Benchmark a live server instead of the in-process offline app")
+    parser.add_argument("--interviews", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--max-answers", type=int, default=30, help="Give up on an interview after this many answers")
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--verbose", action="store_true", help="Show the in-process app's own output")
+    sys.exit(asyncio.run(main(parser.parse_args())))
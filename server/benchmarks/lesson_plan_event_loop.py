@@ -0,0 +1,91 @@
+"""
+Regression benchmark: `/` health latency must stay flat while lesson plans are generating.
+
+Runs against a live server (uvicorn main:app) with real backends:
+
+    python benchmarks/lesson_plan_event_loop.py --session-id <id> --concurrency 4
+
+It first samples `GET /` on an idle server, then samples it again while
+`--concurrency` lesson-plan generations are in flight, and fails (exit code 1)
+if the loaded p95 exceeds the idle p95 by more than `--max-slowdown-ms`.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def sample_health(client, duration, interval, stop_event=None):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline and not (stop_event and stop_event.is_set()):
+        start = time.perf_counter()
+        response = await client.get("/")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def generate(client, session_id):
+    start = time.perf_counter()
+    response = await client.get(f"/lesson-plan/generate/{session_id}")
+    return response.status_code, time.perf_counter() - start
+
+
+def report(label, latencies):
+    print(
+        f"{label:>8}: n={len(latencies)} "
+        f"p50={statistics.median(latencies):.1f}ms "
+        f"p95={percentile(latencies, 95):.1f}ms "
+        f"max={max(latencies):.1f}ms"
+    )
+
+
+async def main(args):
+    timeout = httpx.Timeout(args.request_timeout)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=timeout) as client:
+        idle = await sample_health(client, args.idle_seconds, args.interval)
+
+        stop_event = asyncio.Event()
+        health_task = asyncio.create_task(
+            sample_health(client, args.request_timeout, args.interval, stop_event)
+        )
+        generations = await asyncio.gather(
+            *(generate(client, args.session_id) for _ in range(args.concurrency))
+        )
+        stop_event.set()
+        loaded = await health_task
+
+    for status, seconds in generations:
+        print(f"lesson plan generation: status={status} took={seconds:.1f}s")
+    report("idle", idle)
+    report("loaded", loaded)
+
+    slowdown = percentile(loaded, 95) - percentile(idle, 95)
+    if slowdown > args.max_slowdown_ms:
+        print(f"❌ Health p95 degraded by {slowdown:.1f}ms during lesson plan generation")
+        return 1
+    print(f"✅ Health p95 stayed within {args.max_slowdown_ms}ms ({slowdown:+.1f}ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--session-id", required=True, help="Session with a finished interview and persona report")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--request-timeout", type=float, default=300.0)
+    parser.add_argument("--max-slowdown-ms", type=float, default=50.0)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,229 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUTTLCache:
+    """
+    Thread-safe in-process cache with a maximum size (LRU eviction)
+    and an optional time-to-live per entry. With `sliding`, a hit restarts
+    the entry's time-to-live.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = None, sliding: bool = False):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.sliding = sliding
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            if self.sliding and expires_at is not None:
+                self._data[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._data.items() if expires_at is not None and expires_at < now]
+        for key in expired:
+            del self._data[key]
+
+    def __len__(self):
+        # Live entries only; expired ones are dropped on the way
+        with self._lock:
+            self._purge_expired()
+            return len(self._data)
+
+    def __contains__(self, key):
+        # Does not count as a hit or refresh the entry's LRU position
+        with self._lock:
+            entry = self._data.get(key)
+        return entry is not None and (entry[1] is None or entry[1] >= time.monotonic())
+
+    def stats(self):
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class SQLiteCacheTier:
+    """
+    Shared on-disk cache tier backed by SQLite, so several worker processes
+    on the same host can reuse each other's entries. Values are stored as JSON.
+    Expired rows are deleted by writes, at most once per `purge_interval` seconds.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = None, purge_interval: float = 60):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return None
+        return json.loads(value)
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), expires_at),
+        )
+        now = time.time()
+        if now - self._last_purge >= self.purge_interval:
+            self._last_purge = now
+            conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+        conn.commit()
+
+
+class RedisCacheTier:
+    """
+    Shared cache tier for any Redis-protocol server (Redis, Valkey, KeyDB...).
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, ttl_seconds: float = None, prefix: str = "viveka:"):
+        import redis  # optional dependency
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        ttl = int(self.ttl_seconds) if self.ttl_seconds else None
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+
+
+class TieredCache:
+    """
+    In-process LRU/TTL cache in front of an optional shared tier.
+    Shared tier failures are logged and treated as misses so a broken
+    cache never takes down a request.
+    """
+
+    def __init__(self, local: LRUTTLCache, shared=None):
+        self.local = local
+        self.shared = shared
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.shared_errors = 0
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is not None or self.shared is None:
+            return value
+        try:
+            value = self.shared.get(key)
+        except Exception as e:
+            self.shared_errors += 1
+            print(f"❌ Shared cache read error: {e}")
+            return None
+        if value is None:
+            self.shared_misses += 1
+            return None
+        self.shared_hits += 1
+        self.local.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.local.set(key, value)
+        if self.shared is None:
+            return
+        try:
+            self.shared.set(key, value)
+        except Exception as e:
+            self.shared_errors += 1
+            print(f"❌ Shared cache write error: {e}")
+
+    def stats(self):
+        stats = self.local.stats()
+        stats["shared_tier"] = type(self.shared).__name__ if self.shared else None
+        stats["shared_hits"] = self.shared_hits
+        stats["shared_misses"] = self.shared_misses
+        stats["shared_errors"] = self.shared_errors
+        return stats
+
+
+def build_shared_tier(redis_url: str = None, sqlite_path: str = None, ttl_seconds: float = None):
+    """
+    Builds the optional shared tier from configuration. Redis wins if both are set.
+    """
+    if redis_url:
+        try:
+            return RedisCacheTier(redis_url, ttl_seconds=ttl_seconds)
+        except Exception as e:
+            print(f"❌ Could not initialize Redis cache tier: {e}")
+    if sqlite_path:
+        try:
+            return SQLiteCacheTier(sqlite_path, ttl_seconds=ttl_seconds)
+        except Exception as e:
+            print(f"❌ Could not initialize SQLite cache tier: {e}")
+    return None
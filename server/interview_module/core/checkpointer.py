@@ -0,0 +1,184 @@
+import os
+from dotenv import load_dotenv
+from bson.binary import Binary
+from pymongo import UpdateOne
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple
+
+load_dotenv()
+
+INTERVIEW_CHECKPOINTER = os.getenv("INTERVIEW_CHECKPOINTER", "sqlite")  # sqlite | mongo | memory
+INTERVIEW_CHECKPOINT_SQLITE_PATH = os.getenv("INTERVIEW_CHECKPOINT_SQLITE_PATH", "interview_checkpoints.sqlite3")
+# Mongo checkpoints expire after this many seconds (None keeps them forever)
+INTERVIEW_CHECKPOINT_TTL_SECONDS = os.getenv("INTERVIEW_CHECKPOINT_TTL_SECONDS")
+
+
+class SqliteBlobStore:
+    def __init__(self, conn):
+        self.conn = conn
+        self._ready = False
+
+    async def _setup(self):
+        if not self._ready:
+            await self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoint_blobs (key TEXT PRIMARY KEY, type TEXT, value BLOB)"
+            )
+            await self.conn.commit()
+            self._ready = True
+
+    async def put_many(self, blobs):
+        await self._setup()
+        await self.conn.executemany(
+            "INSERT OR IGNORE INTO checkpoint_blobs (key, type, value) VALUES (?, ?, ?)",
+            [(key, type_, value) for key, (type_, value) in blobs.items()],
+        )
+        await self.conn.commit()
+
+    async def get_many(self, keys):
+        await self._setup()
+        if not keys:
+            return {}
+        placeholders = ",".join("?" for _ in keys)
+        async with self.conn.execute(
+            f"SELECT key, type, value FROM checkpoint_blobs WHERE key IN ({placeholders})", list(keys)
+        ) as cursor:
+            return {key: (type_, value) for key, type_, value in await cursor.fetchall()}
+
+    async def delete_thread(self, thread_id):
+        await self._setup()
+        await self.conn.execute("DELETE FROM checkpoint_blobs WHERE key LIKE ?", (f"{thread_id}|%",))
+        await self.conn.commit()
+
+    async def aclose(self):
+        await self.conn.close()
+
+
+class MongoBlobStore:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def put_many(self, blobs):
+        if not blobs:
+            return
+        # One round trip for all changed channels; blobs are immutable, so existing ones are left alone
+        await self.collection.bulk_write([
+            UpdateOne({"_id": key}, {"$setOnInsert": {"type": type_, "value": Binary(value)}}, upsert=True)
+            for key, (type_, value) in blobs.items()
+        ], ordered=False)
+
+    async def get_many(self, keys):
+        if not keys:
+            return {}
+        cursor = self.collection.find({"_id": {"$in": list(keys)}})
+        return {doc["_id"]: (doc["type"], bytes(doc["value"])) async for doc in cursor}
+
+    async def delete_thread(self, thread_id):
+        await self.collection.delete_many({"_id": {"$regex": f"^{thread_id}\\|"}})
+
+    async def aclose(self):
+        pass  # The shared Mongo client is closed by its owner
+
+
+class DeltaCheckpointSaver(BaseCheckpointSaver):
+    """
+    Wraps a LangGraph checkpointer so each checkpoint only stores the channels
+    that changed since the previous one. Channel values are kept as
+    content-addressed blobs keyed by (thread, namespace, channel, version);
+    the wrapped saver stores the checkpoint with empty `channel_values`.
+    """
+
+    def __init__(self, inner: BaseCheckpointSaver, blobs):
+        super().__init__(serde=inner.serde)
+        self.inner = inner
+        self.blobs = blobs
+
+    @staticmethod
+    def _blob_key(thread_id, checkpoint_ns, channel, version):
+        return f"{thread_id}|{checkpoint_ns}|{channel}|{version}"
+
+    async def _with_values(self, checkpoint_tuple):
+        configurable = checkpoint_tuple.config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        versions = checkpoint_tuple.checkpoint["channel_versions"]
+        keys = {
+            self._blob_key(thread_id, checkpoint_ns, channel, version): channel
+            for channel, version in versions.items()
+        }
+        stored = await self.blobs.get_many(list(keys))
+        channel_values = {
+            keys[key]: self.serde.loads_typed(blob)
+            for key, blob in stored.items()
+            if blob[0] != "empty"
+        }
+        return CheckpointTuple(
+            config=checkpoint_tuple.config,
+            checkpoint={**checkpoint_tuple.checkpoint, "channel_values": channel_values},
+            metadata=checkpoint_tuple.metadata,
+            parent_config=checkpoint_tuple.parent_config,
+            pending_writes=checkpoint_tuple.pending_writes,
+        )
+
+    async def aget_tuple(self, config):
+        checkpoint_tuple = await self.inner.aget_tuple(config)
+        if checkpoint_tuple is None:
+            return None
+        return await self._with_values(checkpoint_tuple)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        async for checkpoint_tuple in self.inner.alist(config, filter=filter, before=before, limit=limit):
+            yield await self._with_values(checkpoint_tuple)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        values = checkpoint["channel_values"]
+        await self.blobs.put_many({
+            self._blob_key(thread_id, checkpoint_ns, channel, version):
+                self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b"")
+            for channel, version in new_versions.items()
+        })
+        slim_checkpoint = {**checkpoint, "channel_values": {}}
+        return await self.inner.aput(config, slim_checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await self.inner.aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        await self.inner.adelete_thread(thread_id)
+        await self.blobs.delete_thread(thread_id)
+
+    def get_next_version(self, current, channel):
+        return self.inner.get_next_version(current, channel)
+
+    async def aclose(self):
+        await self.blobs.aclose()
+
+
+async def build_checkpointer(backend: str = INTERVIEW_CHECKPOINTER):
+    """
+    Creates the interview checkpointer: SQLite for local runs, Mongo for production.
+    """
+    if backend == "mongo":
+        from langgraph.checkpoint.mongodb.aio import AsyncMongoDBSaver
+        from interview_module.core.mongo import client, db
+
+        ttl = int(INTERVIEW_CHECKPOINT_TTL_SECONDS) if INTERVIEW_CHECKPOINT_TTL_SECONDS else None
+        inner = AsyncMongoDBSaver(
+            client,
+            db_name=db.name,
+            checkpoint_collection_name="interview_checkpoints",
+            writes_collection_name="interview_checkpoint_writes",
+            ttl=ttl,
+        )
+        return DeltaCheckpointSaver(inner, MongoBlobStore(db["interview_checkpoint_blobs"]))
+
+    if backend == "sqlite":
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        conn = await aiosqlite.connect(INTERVIEW_CHECKPOINT_SQLITE_PATH)
+        return DeltaCheckpointSaver(AsyncSqliteSaver(conn), SqliteBlobStore(conn))
+
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    return InMemorySaver()
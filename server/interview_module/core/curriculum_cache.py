@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import json
+import math
+import os
+from dotenv import load_dotenv
+from interview_module.core.cache import LRUTTLCache
+from interview_module.core.embedding_cache import normalize_text
+
+load_dotenv()
+
+CURRICULUM_CACHE_ENABLED = os.getenv("CURRICULUM_CACHE_ENABLED", "true").lower() == "true"
+CURRICULUM_CACHE_SIZE = int(os.getenv("CURRICULUM_CACHE_SIZE", "1024"))
+CURRICULUM_CACHE_TTL_SECONDS = float(os.getenv("CURRICULUM_CACHE_TTL_SECONDS", "86400"))
+# Cosine similarity above which two goals count as the same request. Unset to
+# only match goals exactly (after normalization).
+CURRICULUM_CACHE_GOAL_SIMILARITY = os.getenv("CURRICULUM_CACHE_GOAL_SIMILARITY", "0.95")
+
+
+def context_hash(records):
+    """Identifies the retrieval context a RAG curriculum was generated from."""
+    ids = [str(r["id"]) for r in records]
+    return hashlib.sha256("|".join(ids).encode("utf-8")).hexdigest()[:16] if ids else ""
+
+
+def _cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class CurriculumCache:
+    """
+    Caches generated curricula by normalized (source, subject, goal, level,
+    retrieval-context hash, prompt version). On an exact miss, goals with the
+    same other fields are compared by embedding similarity so rephrasings of
+    a popular goal reuse its curriculum.
+    """
+
+    def __init__(self, max_size: int = CURRICULUM_CACHE_SIZE, ttl_seconds: float = CURRICULUM_CACHE_TTL_SECONDS,
+                 goal_similarity=CURRICULUM_CACHE_GOAL_SIMILARITY, enabled: bool = CURRICULUM_CACHE_ENABLED):
+        self.enabled = enabled
+        self._cache = LRUTTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.goal_similarity = float(goal_similarity) if goal_similarity else None
+        # (source, subject, level, context, version) -> {exact key: goal embedding}
+        self._goal_index = {}
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    @staticmethod
+    def _bucket(source, subject, level, context, prompt_version):
+        return (source, normalize_text(subject), normalize_text(level), context, prompt_version)
+
+    @staticmethod
+    def _key(bucket, goal):
+        encoded = json.dumps([*bucket, normalize_text(goal)]).encode("utf-8")
+        return "curriculum:" + hashlib.sha256(encoded).hexdigest()
+
+    async def _goal_embedding(self, goal):
+        from interview_module.core.vector_Store import embed_query
+
+        return await asyncio.to_thread(embed_query, normalize_text(goal))
+
+    async def get(self, source, subject, goal, level, prompt_version, context="", bypass=False):
+        if not self.enabled or bypass:
+            self.bypassed += 1
+            return None
+
+        bucket = self._bucket(source, subject, level, context, prompt_version)
+        curriculum = self._cache.get(self._key(bucket, goal))
+        if curriculum is not None:
+            self.exact_hits += 1
+            return curriculum
+
+        candidates = self._goal_index.get(bucket)
+        if self.goal_similarity and candidates:
+            goal_vector = await self._goal_embedding(goal)
+            best_key, best_score = None, self.goal_similarity
+            for key, vector in list(candidates.items()):
+                score = _cosine(goal_vector, vector)
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key:
+                curriculum = self._cache.get(best_key)
+                if curriculum is not None:
+                    self.semantic_hits += 1
+                    return curriculum
+                # Evicted or expired
+                candidates.pop(best_key, None)
+
+        self.misses += 1
+        return None
+
+    async def set(self, source, subject, goal, level, prompt_version, curriculum, context=""):
+        if not self.enabled or not curriculum:
+            return
+        bucket = self._bucket(source, subject, level, context, prompt_version)
+        key = self._key(bucket, goal)
+        self._cache.set(key, list(curriculum))
+        if self.goal_similarity:
+            candidates = self._goal_index.setdefault(bucket, {})
+            if key not in candidates:
+                candidates[key] = await self._goal_embedding(goal)
+                self._prune()
+
+    def _prune(self):
+        # The goal index only needs entries the cache still holds
+        if sum(len(candidates) for candidates in self._goal_index.values()) <= self._cache.max_size:
+            return
+        for bucket, candidates in list(self._goal_index.items()):
+            for key in [key for key in candidates if key not in self._cache]:
+                del candidates[key]
+            if not candidates:
+                del self._goal_index[bucket]
+
+    def stats(self):
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._cache),
+            "max_size": self._cache.max_size,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "goal_similarity": self.goal_similarity,
+        }
+
+
+curriculum_cache = CurriculumCache()
@@ -0,0 +1,65 @@
+import hashlib
+import os
+from dotenv import load_dotenv
+from interview_module.core.cache import LRUTTLCache, TieredCache, build_shared_tier
+
+load_dotenv()
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+EMBEDDING_CACHE_TTL_SECONDS = float(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", "86400"))
+# Optional shared tiers (e.g. redis://localhost:6379/0 or ./.cache/embeddings.sqlite3)
+EMBEDDING_CACHE_REDIS_URL = os.getenv("EMBEDDING_CACHE_REDIS_URL")
+EMBEDDING_CACHE_SQLITE_PATH = os.getenv("EMBEDDING_CACHE_SQLITE_PATH")
+
+
+def normalize_text(text: str) -> str:
+    # all-MiniLM-L6-v2 uses an uncased tokenizer, so case and whitespace
+    # differences produce the same vector.
+    return " ".join(text.split()).lower()
+
+
+def embedding_cache_key(text: str, model_name: str) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"emb:{model_name}:{digest}"
+
+
+embedding_cache = TieredCache(
+    LRUTTLCache(max_size=EMBEDDING_CACHE_SIZE, ttl_seconds=EMBEDDING_CACHE_TTL_SECONDS),
+    shared=build_shared_tier(
+        redis_url=EMBEDDING_CACHE_REDIS_URL,
+        sqlite_path=EMBEDDING_CACHE_SQLITE_PATH,
+        ttl_seconds=EMBEDDING_CACHE_TTL_SECONDS,
+    ),
+)
+
+
+def cached_embed_query(text: str, model_name: str, embed_fn):
+    """
+    Returns the embedding for `text`, computing it with `embed_fn` only on a cache miss.
+    """
+    key = embedding_cache_key(text, model_name)
+    vector = embedding_cache.get(key)
+    if vector is None:
+        vector = embed_fn(text)
+        embedding_cache.set(key, list(vector))
+    return vector
+
+
+def cached_embed_queries(texts, model_name: str, embed_many_fn):
+    """
+    Batch variant of `cached_embed_query`: all cache misses are embedded
+    together in a single `embed_many_fn` call.
+    """
+    keys = [embedding_cache_key(text, model_name) for text in texts]
+    vectors = [embedding_cache.get(key) for key in keys]
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        computed = embed_many_fn([texts[i] for i in missing])
+        for i, vector in zip(missing, computed):
+            vectors[i] = list(vector)
+            embedding_cache.set(keys[i], vectors[i])
+    return vectors
+
+
+def embedding_cache_stats():
+    return embedding_cache.stats()
@@ -0,0 +1,293 @@
+"""
+Deterministic offline stand-ins for Gemini, Qdrant and MongoDB, used to
+measure the orchestration itself without network access.
+
+Selected with environment variables:
+    LLM_PROVIDER=fake            fixture chat model (FAKE_LLM_LATENCY_MS adds a delay per call)
+    VECTOR_STORE_PROVIDER=memory in-process Qdrant seeded with fixture chunks
+    MONGO_PROVIDER=mock          mongomock-motor client shared by both modules
+"""
+import asyncio
+import hashlib
+import inspect
+import json
+import math
+import os
+import re
+from typing import Any, List, Optional
+from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.output_parsers import JsonOutputParser, PydanticOutputParser
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+load_dotenv()
+
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+FAKE_EMBEDDING_SIZE = 384  # Same as all-MiniLM-L6-v2
+
+FIXTURE_CHUNKS = [
+    ("Python Basics", "Python variables hold values of data types such as int, float, str and bool."),
+    ("Python Basics", "Python lists and tuples store ordered collections; lists are mutable, tuples are not."),
+    ("Python Control Flow", "Python if, elif and else statements choose a branch; for and while loops repeat code."),
+    ("Python Functions", "Python functions are defined with def, take parameters and return values."),
+    ("Python Data Structures", "Python dictionaries map keys to values and sets store unique items."),
+    ("Machine Learning", "Supervised machine learning fits a model to labelled training data."),
+    ("Machine Learning", "Linear regression predicts a continuous value by minimizing squared error."),
+    ("Machine Learning", "Overfitting happens when a model memorizes training data and fails to generalize."),
+    ("Machine Learning", "Gradient descent updates model parameters in the direction that lowers the loss."),
+    ("Databases", "SQL databases store rows in tables and are queried with SELECT statements and joins."),
+]
+
+
+def _stable_int(text: str, low: int, high: int) -> int:
+    digest = int(hashlib.md5(text.encode("utf-8")).hexdigest(), 16)
+    return low + digest % (high - low + 1)
+
+
+def _find(pattern: str, text: str, default: str) -> str:
+    match = re.search(pattern, text)
+    return match.group(1).strip() if match else default
+
+
+def structured_fixture(schema_name: str, prompt: str):
+    """A valid response for each structured-output schema used by the graphs."""
+    if schema_name == "RelevanceCheck":
+        return {"is_relevant": True}
+    if schema_name == "CurriculumList":
+        # RAG prompts list the retrieved sections; build the curriculum from those
+        sections = re.findall(r"--- Document Title: (.+)", prompt)
+        defaults = ["Fundamentals", "Core Techniques", "Applied Practice"]
+        return {"curriculum": list(dict.fromkeys(sections + defaults))[:3]}
+    if schema_name == "QuestionResponse":
+        concept = _find(r"Concept:\s*(.+)", prompt, "the concept")
+        return {
+            "question_type": "detailed_answer",
+            "question": f"Explain {concept} and give an example of where you would use it.",
+        }
+    if schema_name == "ScoreEvaluation":
+        score = _stable_int(prompt, 30, 100)
+        return {
+            "score": score,
+            "feedback": f"The answer scored {score}. It covers the main idea; add a concrete example to strengthen it.",
+        }
+    if schema_name == "NextAction":
+        return {"action": "next", "reason": "Fixture decision"}
+    if schema_name == "PersonaSummary":
+        return {
+            "learner_profile_summary": "A motivated learner with a practical approach to new topics.",
+            "learning_style_assessment": ["Prefers examples", "Practical"],
+            "strengths": ["Fundamentals"],
+            "weaknesses_and_gaps": ["Applied Practice"],
+            "common_misconceptions": ["Confuses related terminology"],
+            "engagement_and_confidence": "Engaged and reasonably confident.",
+            "actionable_learning_recommendations": ["Work through small exercises after each topic"],
+            "preliminary_personalized_roadmap_suggestions": ["Core Techniques in depth", "Applied mini projects"],
+        }
+    raise ValueError(f"No fixture for schema {schema_name}")
+
+
+def _fixture_chapter(title: str):
+    sub_topics = [
+        {"sub_topic_title": f"{title}: {part}", "sub_topic_outcome": f"Understand {title.lower()} {part.lower()}",
+         "estimated_time_minutes": 45}
+        for part in ("Concepts", "Exercises")
+    ]
+    return {
+        "chapter_title": title,
+        "chapter_outcome": f"Apply {title.lower()} with confidence",
+        "sub_topics": sub_topics,
+        "chapter_total_time_minutes": 90,
+    }
+
+
+def text_fixture(prompt: str) -> str:
+    """Free-text responses: the lesson plan generator, repair and evaluator parse JSON from these."""
+    if "LESSON PLAN EVALUATOR" in prompt:
+        return json.dumps({
+            "grade": "Good",
+            "feedback": "Well structured plan with realistic timings.",
+            "evaluation_metrics": {
+                "Topic Structure": {"score": 8, "comment": "Clear chapters"},
+                "Time Allocation": {"score": 8, "comment": "Realistic"},
+            },
+        })
+
+    if "LESSON PLAN CHAPTER REPAIR" in prompt:
+        titles = re.findall(r"### Chapter \d+\n.*?\"chapter_title\": \"([^\"]*)\"", prompt, re.S)
+        return json.dumps({"chapters": [_fixture_chapter(title) for title in titles]})
+
+    subject = _find(r"\*\*Subject:\*\*\s*(.+)", prompt, "Subject")
+    goal = _find(r"\*\*Goal:\*\*\s*(.+)", prompt, "Goal")
+    level = _find(r"\*\*Current Level:\*\*\s*(.+)", prompt, "Beginner")
+    chapters = [_fixture_chapter(title) for title in ("Fundamentals", "Core Techniques", "Applied Practice")]
+    return json.dumps({
+        "subject_name": subject,
+        "learner_level": level,
+        "learner_goal": goal,
+        "overall_course_outcome": f"Reach the goal: {goal}",
+        "chapters": chapters,
+        "total_module_time_hours": 4.5,
+        "prerequisites": [],
+        "adaptive_notes": "Fixture plan",
+    })
+
+
+def _prompt_text(messages) -> str:
+    return "\n".join(str(message.content) for message in messages)
+
+
+def _usage(prompt: str, content: str):
+    # Rough 4-characters-per-token estimate so token metrics are non-zero
+    input_tokens, output_tokens = len(prompt) // 4, len(content) // 4
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens}
+
+
+class FixtureChatModel(BaseChatModel):
+    """
+    Chat model returning fixture responses after `latency_seconds`.
+    Structured output is produced as JSON and parsed like a real model's.
+    """
+
+    latency_seconds: float = FAKE_LLM_LATENCY_MS / 1000
+    stream_chunk_size: int = 24
+
+    @property
+    def _llm_type(self) -> str:
+        return "fixture"
+
+    def _respond(self, messages, fixture_schema: Optional[str]):
+        prompt = _prompt_text(messages)
+        if fixture_schema:
+            content = json.dumps(structured_fixture(fixture_schema, prompt))
+        else:
+            content = text_fixture(prompt)
+        return prompt, content
+
+    def _generate(self, messages, stop=None, run_manager=None, fixture_schema=None, **kwargs):
+        prompt, content = self._respond(messages, fixture_schema)
+        message = AIMessage(content=content, usage_metadata=_usage(prompt, content),
+                            response_metadata={"model_name": self._llm_type})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, fixture_schema=None, **kwargs):
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return self._generate(messages, stop, None, fixture_schema)
+
+    async def _astream(self, messages, stop=None, run_manager=None, fixture_schema=None, **kwargs):
+        prompt, content = self._respond(messages, fixture_schema)
+        pieces = [content[i:i + self.stream_chunk_size] for i in range(0, len(content), self.stream_chunk_size)]
+        for i, piece in enumerate(pieces):
+            # Spread the latency over the stream
+            if self.latency_seconds:
+                await asyncio.sleep(self.latency_seconds / len(pieces))
+            usage = _usage(prompt, content) if i == len(pieces) - 1 else None
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content=piece, usage_metadata=usage, response_metadata={"model_name": self._llm_type}
+            ))
+
+    def with_structured_output(self, schema, *, include_raw: bool = False, **kwargs):
+        if isinstance(schema, dict):
+            name, parser = schema.get("title"), JsonOutputParser()
+        else:
+            name, parser = schema.__name__, PydanticOutputParser(pydantic_object=schema)
+        return self.bind(fixture_schema=name) | parser
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Bag-of-words feature hashing: texts sharing words get similar vectors, so
+    retrieval against the fixture chunks behaves plausibly.
+    """
+
+    def __init__(self, size: int = FAKE_EMBEDDING_SIZE):
+        self.size = size
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [0.0] * self.size
+        for word in re.findall(r"[a-z0-9]+", text.lower()):
+            vector[_stable_int(word, 0, self.size - 1)] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+async def seed_fixture_collection(client, collection_name: str, embeddings: Embeddings):
+    from qdrant_client import models
+
+    if await client.collection_exists(collection_name):
+        return
+    await client.create_collection(
+        collection_name,
+        vectors_config=models.VectorParams(size=FAKE_EMBEDDING_SIZE, distance=models.Distance.COSINE),
+    )
+    await client.upsert(collection_name, points=[
+        models.PointStruct(
+            id=i,
+            vector=embeddings.embed_query(f"{title} {content}"),
+            payload={"section_title": title, "content": content, "type": "content"},
+        )
+        for i, (title, content) in enumerate(FIXTURE_CHUNKS)
+    ])
+
+
+_mock_mongo_client: Any = None
+
+# Collection methods counted and timed as Mongo calls, standing in for the
+# command listener a real client reports through
+MOCK_MONGO_COUNTED_METHODS = (
+    "find", "find_one", "aggregate", "count_documents", "insert_one", "insert_many",
+    "update_one", "update_many", "replace_one", "delete_one", "delete_many",
+    "find_one_and_update", "find_one_and_replace", "find_one_and_delete",
+    "bulk_write", "create_index",
+)
+
+
+def _count_mock_calls(collection_class):
+    from interview_module.core.instrumentation import record_external_call, timed_external_call
+
+    async def timed(operation, pending):
+        with timed_external_call("mongo", operation):
+            return await pending
+
+    def counted(operation, method):
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            if inspect.isawaitable(result):
+                return timed(operation, result)
+            record_external_call("mongo", operation)  # Cursors run lazily
+            return result
+
+        return wrapper
+
+    for operation in MOCK_MONGO_COUNTED_METHODS:
+        setattr(collection_class, operation, counted(operation, getattr(collection_class, operation)))
+
+
+def _accept_bulk_update_sort():
+    # pymongo 4.11+ UpdateOne passes sort= to the bulk builder, which mongomock predates
+    from mongomock.collection import BulkOperationBuilder
+
+    add_update = BulkOperationBuilder.add_update
+
+    def compatible(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+
+    BulkOperationBuilder.add_update = compatible
+
+
+def mock_mongo_client():
+    """One in-memory Mongo client per process, shared by every module."""
+    global _mock_mongo_client
+    if _mock_mongo_client is None:
+        from mongomock_motor import AsyncMongoMockClient, AsyncMongoMockCollection  # optional dependency
+
+        _count_mock_calls(AsyncMongoMockCollection)
+        _accept_bulk_update_sort()
+        _mock_mongo_client = AsyncMongoMockClient()
+    return _mock_mongo_client
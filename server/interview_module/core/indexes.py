@@ -0,0 +1,238 @@
+"""
+Declares the MongoDB indexes behind the app's hot queries and provisions them.
+
+At startup the declared indexes are compared with the live ones, and missing
+ones are reported and created in a background task. Creating an index that
+already exists is a no-op, so every worker can do this on boot. Set
+MONGO_CREATE_INDEXES=false to only report.
+
+A live index with the declared keys but not the declared uniqueness (e.g.
+lesson_plans.session_id before it became unique) is only reported at boot.
+Rebuilding it means dropping it first, so it is a one-off migration:
+
+    python -m interview_module.core.indexes --rebuild-unique
+
+Check that the hot queries actually use the indexes with explain():
+
+    python -m interview_module.core.indexes
+"""
+import argparse
+import asyncio
+import os
+import sys
+from dotenv import load_dotenv
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from interview_module.core.mongo import db
+
+load_dotenv()
+
+MONGO_CREATE_INDEXES = os.getenv("MONGO_CREATE_INDEXES", "true").lower() == "true"
+
+# collection -> indexes it needs
+INDEXES = {
+    "qa_history": [
+        # fetch_feedback_history and lesson plan inputs: a session's answers in order
+        IndexModel([("session_id", ASCENDING), ("created_at", ASCENDING)], name="session_id_created_at"),
+    ],
+    "persona_reports": [
+        # /persona/{id} and lesson plan inputs: latest report of a session
+        IndexModel([("session_id", ASCENDING), ("created_at", DESCENDING)], name="session_id_created_at"),
+        # fetch_persona_summary: latest report of a user
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_id_created_at"),
+    ],
+    "lesson_plans": [
+        # fetch_lesson_plan, and the upsert in save_lesson_plan relies on one plan per session
+        IndexModel([("session_id", ASCENDING)], name="session_id", unique=True),
+    ],
+    "lesson_plan_versions": [
+        # save_lesson_plan pruning and get_lesson_plan_versions
+        IndexModel([("session_id", ASCENDING), ("version", DESCENDING)], name="session_id_version", unique=True),
+    ],
+}
+
+# The hot queries and the index each should be planned with:
+# (collection, filter, sort, expected index)
+HOT_QUERIES = [
+    ("qa_history", {"session_id": "explain"}, [("created_at", ASCENDING)], "session_id_created_at"),
+    ("persona_reports", {"session_id": "explain"}, [("created_at", DESCENDING)], "session_id_created_at"),
+    ("persona_reports", {"user_id": "explain"}, [("created_at", DESCENDING)], "user_id_created_at"),
+    ("lesson_plans", {"session_id": "explain"}, None, "session_id"),
+    ("lesson_plan_versions", {"session_id": "explain"}, [("version", DESCENDING)], "session_id_version"),
+]
+
+
+def _keys(index_model):
+    return list(index_model.document["key"].items())
+
+
+def _unique(index_model):
+    return bool(index_model.document.get("unique"))
+
+
+async def _missing(database):
+    """
+    (collection, index model, conflicting live index name) for each declared
+    index with no live index on the same keys and uniqueness. The conflicting
+    name is set when a live index has the keys but not the uniqueness.
+    """
+    missing = []
+    for collection_name, index_models in INDEXES.items():
+        live = await database[collection_name].index_information()
+        live_indexes = {
+            name: ([tuple(key) for key in info["key"]], bool(info.get("unique")))
+            for name, info in live.items()
+        }
+        for index_model in index_models:
+            if (_keys(index_model), _unique(index_model)) in live_indexes.values():
+                continue
+            conflict = next(
+                (name for name, (keys, _) in live_indexes.items() if keys == _keys(index_model)), None
+            )
+            missing.append((collection_name, index_model, conflict))
+    return missing
+
+
+async def missing_indexes(database=db):
+    """Declared indexes with no live index on the same keys, as 'collection.name'."""
+    return [f"{name}.{index_model.document['name']}" for name, index_model, _ in await _missing(database)]
+
+
+def _index_names(plan):
+    """Index names used anywhere in an explain() plan tree."""
+    names = set()
+    if isinstance(plan, dict):
+        if plan.get("stage") == "IXSCAN":
+            names.add(plan.get("indexName"))
+        for value in plan.values():
+            names |= _index_names(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            names |= _index_names(value)
+    return names
+
+
+async def explain_hot_queries(database=db):
+    """
+    Runs explain() on each hot query. Returns one entry per query with the
+    indexes its winning plan uses and whether that includes the expected one.
+    """
+    results = []
+    for collection_name, query, sort, expected in HOT_QUERIES:
+        cursor = database[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        used = _index_names(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        results.append({
+            "collection": collection_name,
+            "query": query,
+            "sort": sort,
+            "expected_index": expected,
+            "indexes_used": sorted(used),
+            "ok": expected in used,
+        })
+    return results
+
+
+class IndexProvisioner:
+    """
+    Reports missing indexes at boot and creates them in the background.
+    Indexes that conflict with a live one are only rebuilt with `rebuild_conflicts`.
+    """
+
+    def __init__(self, database=db, create: bool = MONGO_CREATE_INDEXES, rebuild_conflicts: bool = False):
+        self.database = database
+        self.create = create
+        self.rebuild_conflicts = rebuild_conflicts
+        self.missing_at_boot = None
+        self.conflicts = []
+        self.created = []
+        self.errors = []
+        self._task = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._provision())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _provision(self):
+        try:
+            missing = await _missing(self.database)
+        except Exception as e:
+            self.errors.append(str(e))
+            print(f"❌ Could not check MongoDB indexes: {str(e)}")
+            return
+        self.missing_at_boot = [f"{name}.{index_model.document['name']}" for name, index_model, _ in missing]
+        if not missing:
+            print("✅ All MongoDB indexes present")
+            return
+        print(f"❌ Missing MongoDB indexes: {', '.join(self.missing_at_boot)}")
+        if not self.create:
+            return
+
+        # Only the missing ones: an index on the same keys under another name would conflict
+        for collection_name, index_model, conflict in missing:
+            collection = self.database[collection_name]
+            if conflict and not self.rebuild_conflicts:
+                self.conflicts.append(f"{collection_name}.{conflict}")
+                print(f"❌ {collection_name}.{conflict} differs from the declared {index_model.document['name']} "
+                      f"(unique={_unique(index_model)}); rebuild it with: "
+                      f"python -m interview_module.core.indexes --rebuild-unique")
+                continue
+            try:
+                if conflict:
+                    # Same keys without the uniqueness (e.g. lesson_plans.session_id before
+                    # it became unique): MongoDB needs the old one dropped first
+                    await collection.drop_index(conflict)
+                names = await collection.create_indexes([index_model])
+                self.created += [f"{collection_name}.{name}" for name in names]
+            except Exception as e:
+                self.errors.append(f"{collection_name}: {str(e)}")
+                print(f"❌ Could not create index on {collection_name}: {str(e)}")
+                if conflict:
+                    # Typically duplicates blocking a unique index; keep the queries indexed meanwhile
+                    await self._restore(collection, conflict, index_model)
+        if self.created:
+            print(f"✅ Created MongoDB indexes: {', '.join(self.created)}")
+
+    async def _restore(self, collection, name, index_model):
+        try:
+            await collection.create_indexes([IndexModel(list(index_model.document["key"].items()), name=name)])
+        except Exception as e:
+            self.errors.append(f"{collection.name}: {str(e)}")
+
+    def stats(self):
+        return {
+            "create": self.create,
+            "running": bool(self._task and not self._task.done()),
+            "missing_at_boot": self.missing_at_boot,
+            "conflicts": self.conflicts,
+            "created": self.created,
+            "errors": self.errors,
+        }
+
+
+index_provisioner = IndexProvisioner()
+
+
+async def _verify(rebuild_unique=False):
+    provisioner = IndexProvisioner(create=MONGO_CREATE_INDEXES or rebuild_unique, rebuild_conflicts=rebuild_unique)
+    await provisioner._provision()
+    failures = 0
+    for result in await explain_hot_queries():
+        mark = "✅" if result["ok"] else "❌"
+        failures += not result["ok"]
+        print(f"{mark} {result['collection']} {result['query']} sort={result['sort']}: "
+              f"uses {result['indexes_used'] or 'COLLSCAN'}, expected {result['expected_index']}")
+    return 1 if failures or provisioner.errors or provisioner.conflicts else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Provision the MongoDB indexes and explain() the hot queries.")
+    parser.add_argument("--rebuild-unique", action="store_true",
+                        help="Drop and rebuild live indexes that lack the declared uniqueness. "
+                             "Run once, from one process; lookups are unindexed while it runs.")
+    sys.exit(asyncio.run(_verify(parser.parse_args().rebuild_unique)))
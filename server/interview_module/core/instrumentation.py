@@ -0,0 +1,437 @@
+"""
+Per-node metrics for the LangGraph flows.
+
+Every graph node is wrapped with `instrument_node`, which records its wall
+time, LLM token usage and cost, gateway retries, and the time spent in
+Qdrant and MongoDB while it ran. Results are served as JSON on /stats/nodes
+and in the Prometheus text format on /metrics. When `opentelemetry-api` is
+installed each node run is also an OpenTelemetry span, exported by whatever
+SDK/exporter the deployment configures. MongoDB connection pool usage is
+tracked by `mongo_pool_monitor`.
+"""
+import functools
+import inspect
+import os
+import resource
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+from pymongo import monitoring
+
+try:
+    from opentelemetry import trace  # optional dependency
+except ImportError:
+    trace = None
+
+load_dotenv()
+
+# Recent durations kept per node for percentiles
+NODE_SAMPLE_SIZE = 1000
+# USD per million tokens, defaults are gemini-1.5-flash list prices
+LLM_PROMPT_COST_PER_MILLION = float(os.getenv("LLM_PROMPT_COST_PER_MILLION", "0.075"))
+LLM_COMPLETION_COST_PER_MILLION = float(os.getenv("LLM_COMPLETION_COST_PER_MILLION", "0.30"))
+
+# Prometheus histogram buckets for node durations, in seconds
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Where each external backend's time is booked on the running node
+_BACKEND_TIME_FIELDS = {"qdrant": "vector_search_seconds", "mongo": "db_seconds"}
+
+_current_run = ContextVar("instrumented_node_run", default=None)
+
+_tracer = trace.get_tracer("viveka.langgraph") if trace else None
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def llm_cost(prompt_tokens, completion_tokens):
+    return (prompt_tokens * LLM_PROMPT_COST_PER_MILLION
+            + completion_tokens * LLM_COMPLETION_COST_PER_MILLION) / 1_000_000
+
+
+def _new_run():
+    return {"llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "llm_retries": 0,
+            "vector_search_seconds": 0.0, "db_seconds": 0.0}
+
+
+class NodeMetrics:
+    """Per graph node totals: runs, errors, durations and what each run spent them on."""
+
+    def __init__(self, sample_size: int = NODE_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self._nodes = {}
+
+    def _entry(self, name):
+        if name not in self._nodes:
+            self._nodes[name] = {
+                "calls": 0, "errors": 0, "total": 0.0, "max": 0.0,
+                "samples": deque(maxlen=self.sample_size),
+                "buckets": [0] * len(DURATION_BUCKETS),
+                **_new_run(),
+            }
+        return self._nodes[name]
+
+    def record(self, name, seconds, run, error=False):
+        entry = self._entry(name)
+        entry["calls"] += 1
+        entry["errors"] += int(error)
+        entry["total"] += seconds
+        entry["max"] = max(entry["max"], seconds)
+        entry["samples"].append(seconds)
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if seconds <= bound:
+                entry["buckets"][i] += 1
+        for field, value in run.items():
+            entry[field] += value
+
+    def reset(self):
+        self._nodes.clear()
+
+    def items(self):
+        return sorted(self._nodes.items(), key=lambda item: -item[1]["total"])
+
+    def stats(self):
+        return {
+            name: {
+                "calls": entry["calls"],
+                "errors": entry["errors"],
+                "total_ms": round(entry["total"] * 1000, 1),
+                "mean_ms": round(entry["total"] / entry["calls"] * 1000, 2),
+                "p50_ms": round(percentile(entry["samples"], 50) * 1000, 2),
+                "p95_ms": round(percentile(entry["samples"], 95) * 1000, 2),
+                "max_ms": round(entry["max"] * 1000, 2),
+                "llm_calls": entry["llm_calls"],
+                "prompt_tokens": entry["prompt_tokens"],
+                "completion_tokens": entry["completion_tokens"],
+                "llm_retries": entry["llm_retries"],
+                "llm_cost_usd": round(llm_cost(entry["prompt_tokens"], entry["completion_tokens"]), 6),
+                "vector_search_ms": round(entry["vector_search_seconds"] * 1000, 1),
+                "db_ms": round(entry["db_seconds"] * 1000, 1),
+            }
+            for name, entry in self.items()
+        }
+
+
+node_metrics = NodeMetrics()
+
+# (backend, operation) -> calls / seconds, e.g. ("qdrant", "query_points")
+external_calls = Counter()
+external_call_seconds = Counter()
+
+
+def record_external_call(backend: str, operation: str, seconds: float = 0.0):
+    external_calls[(backend, operation)] += 1
+    external_call_seconds[(backend, operation)] += seconds
+    run = _current_run.get()
+    if run is not None and backend in _BACKEND_TIME_FIELDS:
+        run[_BACKEND_TIME_FIELDS[backend]] += seconds
+
+
+@contextmanager
+def timed_external_call(backend: str, operation: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_external_call(backend, operation, time.perf_counter() - started)
+
+
+def record_llm_retry():
+    run = _current_run.get()
+    if run is not None:
+        run["llm_retries"] += 1
+
+
+def reset_metrics():
+    node_metrics.reset()
+    external_calls.clear()
+    external_call_seconds.clear()
+
+
+def external_call_stats():
+    stats = {}
+    for (backend, operation), calls in sorted(external_calls.items()):
+        backend_stats = stats.setdefault(backend, {"total": 0, "seconds": 0.0})
+        backend_stats[operation] = calls
+        backend_stats["total"] += calls
+        backend_stats["seconds"] = round(
+            backend_stats["seconds"] + external_call_seconds[(backend, operation)], 4
+        )
+    return stats
+
+
+class MongoCommandCounter(monitoring.CommandListener):
+    """
+    Times commands sent by a real Motor client (pass as `event_listeners`).
+    Motor runs them in a thread that carries the caller's context, so the
+    time is booked on the node that issued them.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record_external_call("mongo", event.command_name, event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        record_external_call("mongo", event.command_name, event.duration_micros / 1_000_000)
+
+
+mongo_command_counter = MongoCommandCounter()
+
+
+class MongoPoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Tracks the connection pool of each MongoDB server the client talks to:
+    open and checked-out connections, checkout waits and failures. Events
+    arrive on driver threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pools = {}
+
+    def _pool(self, address):
+        return self.pools.setdefault(f"{address[0]}:{address[1]}", {
+            "max_size": 100,
+            "open": 0,
+            "checked_out": 0,
+            "max_checked_out": 0,
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "checkout_wait_seconds": 0.0,
+            "max_checkout_wait_seconds": 0.0,
+            "cleared": 0,
+        })
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address)["max_size"] = event.options.get("maxPoolSize", 100)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pool(event.address)["cleared"] += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self.pools.pop(f"{event.address[0]}:{event.address[1]}", None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._pool(event.address)["open"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["open"] = max(0, pool["open"] - 1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self._pool(event.address)["checkout_failures"] += 1
+
+    def connection_checked_out(self, event):
+        wait = getattr(event, "duration", None) or 0.0
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["checkouts"] += 1
+            pool["checked_out"] += 1
+            pool["max_checked_out"] = max(pool["max_checked_out"], pool["checked_out"])
+            pool["checkout_wait_seconds"] += wait
+            pool["max_checkout_wait_seconds"] = max(pool["max_checkout_wait_seconds"], wait)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["checked_out"] = max(0, pool["checked_out"] - 1)
+
+    def stats(self):
+        with self._lock:
+            return {
+                address: {
+                    **pool,
+                    "utilization": round(pool["checked_out"] / pool["max_size"], 3) if pool["max_size"] else 0.0,
+                    "checkout_wait_seconds": round(pool["checkout_wait_seconds"], 4),
+                }
+                for address, pool in self.pools.items()
+            }
+
+
+mongo_pool_monitor = MongoPoolMonitor()
+
+
+class NodeUsageCallback(BaseCallbackHandler):
+    """Adds the token usage of every chat model call to the node run it belongs to."""
+
+    run_inline = True
+
+    def __init__(self, run):
+        super().__init__()
+        self.run = run
+
+    def on_llm_end(self, response, **kwargs):
+        self.run["llm_calls"] += 1
+        try:
+            message = response.generations[0][0].message
+        except (IndexError, AttributeError):
+            return
+        usage = getattr(message, "usage_metadata", None) or {}
+        self.run["prompt_tokens"] += usage.get("input_tokens", 0)
+        self.run["completion_tokens"] += usage.get("output_tokens", 0)
+
+
+# Registered once; `get_usage_metadata_callback` would add a hook per call
+_usage_callback = ContextVar("instrumented_node_usage_callback", default=None)
+register_configure_hook(_usage_callback, inheritable=True)
+
+
+@contextmanager
+def _node_run(name):
+    run = _new_run()
+    run_token = _current_run.set(run)
+    callback_token = _usage_callback.set(NodeUsageCallback(run))
+    span_context = _tracer.start_as_current_span(f"langgraph.node {name}") if _tracer else nullcontext()
+    started = time.perf_counter()
+    error = False
+    try:
+        with span_context as span:
+            try:
+                yield
+            except BaseException:
+                error = True
+                raise
+            finally:
+                if span is not None:
+                    _set_span_attributes(span, name, run)
+    finally:
+        _usage_callback.reset(callback_token)
+        _current_run.reset(run_token)
+        node_metrics.record(name, time.perf_counter() - started, run, error=error)
+
+
+def _set_span_attributes(span, name, run):
+    span.set_attribute("langgraph.node", name)
+    span.set_attribute("gen_ai.usage.input_tokens", run["prompt_tokens"])
+    span.set_attribute("gen_ai.usage.output_tokens", run["completion_tokens"])
+    span.set_attribute("llm.calls", run["llm_calls"])
+    span.set_attribute("llm.retries", run["llm_retries"])
+    span.set_attribute("llm.cost_usd", llm_cost(run["prompt_tokens"], run["completion_tokens"]))
+    span.set_attribute("vector_search.seconds", run["vector_search_seconds"])
+    span.set_attribute("db.seconds", run["db_seconds"])
+
+
+def instrument_node(name: str, node):
+    """Wraps a graph node (sync or async) so every run is measured under `name`."""
+    if not inspect.iscoroutinefunction(node):
+        @functools.wraps(node)
+        def measured_sync(state):
+            with _node_run(name):
+                return node(state)
+
+        return measured_sync
+
+    @functools.wraps(node)
+    async def measured(state):
+        with _node_run(name):
+            return await node(state)
+
+    return measured
+
+
+def max_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def node_stats():
+    return {
+        "nodes": node_metrics.stats(),
+        "external_calls": external_call_stats(),
+        "max_rss_mb": max_rss_mb(),
+    }
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_metrics():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            label_text = ",".join(f'{key}="{_label(val)}"' for key, val in labels.items())
+            lines.append(f"{name}{suffix}{{{label_text}}} {value}" if label_text else f"{name}{suffix} {value}")
+
+    nodes = node_metrics.items()
+
+    duration_samples = []
+    for name, entry in nodes:
+        for bound, count in zip(DURATION_BUCKETS, entry["buckets"]):
+            duration_samples.append(("_bucket", {"node": name, "le": bound}, count))
+        duration_samples.append(("_bucket", {"node": name, "le": "+Inf"}, entry["calls"]))
+        duration_samples.append(("_sum", {"node": name}, entry["total"]))
+        duration_samples.append(("_count", {"node": name}, entry["calls"]))
+    metric("langgraph_node_duration_seconds", "histogram", "Wall time of graph node runs.", duration_samples)
+
+    metric("langgraph_node_errors_total", "counter", "Graph node runs that raised.",
+           [("", {"node": name}, entry["errors"]) for name, entry in nodes])
+    metric("langgraph_node_llm_calls_total", "counter", "LLM calls made by graph nodes.",
+           [("", {"node": name}, entry["llm_calls"]) for name, entry in nodes])
+    metric("langgraph_node_llm_tokens_total", "counter", "LLM tokens used by graph nodes.",
+           [("", {"node": name, "type": kind}, entry[f"{kind}_tokens"])
+            for name, entry in nodes for kind in ("prompt", "completion")])
+    metric("langgraph_node_llm_retries_total", "counter", "LLM gateway retries during graph node runs.",
+           [("", {"node": name}, entry["llm_retries"]) for name, entry in nodes])
+    metric("langgraph_node_llm_cost_usd_total", "counter", "Estimated LLM cost of graph nodes in USD.",
+           [("", {"node": name}, llm_cost(entry["prompt_tokens"], entry["completion_tokens"]))
+            for name, entry in nodes])
+    metric("langgraph_node_vector_search_seconds_total", "counter", "Qdrant time spent by graph nodes.",
+           [("", {"node": name}, entry["vector_search_seconds"]) for name, entry in nodes])
+    metric("langgraph_node_db_seconds_total", "counter", "MongoDB time spent by graph nodes.",
+           [("", {"node": name}, entry["db_seconds"]) for name, entry in nodes])
+
+    calls = sorted(external_calls.items())
+    metric("external_calls_total", "counter", "Calls to Qdrant and MongoDB.",
+           [("", {"backend": backend, "operation": op}, count) for (backend, op), count in calls])
+    metric("external_call_seconds_total", "counter", "Time spent in Qdrant and MongoDB calls.",
+           [("", {"backend": backend, "operation": op}, external_call_seconds[(backend, op)])
+            for (backend, op), _ in calls])
+    pools = sorted(mongo_pool_monitor.stats().items())
+    metric("mongo_pool_connections", "gauge", "Open MongoDB connections per server.",
+           [("", {"server": address}, pool["open"]) for address, pool in pools])
+    metric("mongo_pool_checked_out_connections", "gauge", "MongoDB connections in use per server.",
+           [("", {"server": address}, pool["checked_out"]) for address, pool in pools])
+    metric("mongo_pool_max_connections", "gauge", "MongoDB connection pool size per server.",
+           [("", {"server": address}, pool["max_size"]) for address, pool in pools])
+    metric("mongo_pool_checkouts_total", "counter", "MongoDB connection checkouts.",
+           [("", {"server": address}, pool["checkouts"]) for address, pool in pools])
+    metric("mongo_pool_checkout_failures_total", "counter", "Failed MongoDB connection checkouts.",
+           [("", {"server": address}, pool["checkout_failures"]) for address, pool in pools])
+    metric("mongo_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a MongoDB connection.",
+           [("", {"server": address}, pool["checkout_wait_seconds"]) for address, pool in pools])
+    metric("process_max_resident_memory_megabytes", "gauge", "Peak resident set size.",
+           [("", {}, max_rss_mb())])
+    return "\n".join(lines) + "\n"
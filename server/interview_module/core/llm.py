@@ -0,0 +1,242 @@
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dotenv import load_dotenv
+from langchain_google_genai import ChatGoogleGenerativeAI
+from interview_module.core.instrumentation import record_llm_retry
+
+load_dotenv()
+
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-1.5-flash")
+# gemini | fake (offline fixture responses, see interview_module/core/fakes.py)
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Token bucket: sustained request rate and the burst allowed on top of it
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "300"))
+LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+
+# Priority classes, lower runs first
+INTERACTIVE = 0  # A user is waiting on the response (questions, scoring, persona)
+BACKGROUND = 1  # Lesson plans, speculative and prefetched work
+
+_RETRYABLE_STATUS = {"429", "500", "502", "503", "504"}
+
+_priority_override = ContextVar("llm_priority_override", default=None)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Runs the enclosed LLM calls at `priority`, e.g. speculative work at BACKGROUND."""
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, up to `capacity` stored."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Waits for a token and returns the seconds spent waiting."""
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - started
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class PrioritySemaphore:
+    """Bounded concurrency where waiting callers are admitted by priority, then FIFO."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiters = []
+        self._order = itertools.count()
+
+    def waiting(self, priority=None):
+        return sum(
+            1 for p, _, future in self._waiters
+            if not future.done() and (priority is None or p == priority)
+        )
+
+    async def acquire(self, priority: int):
+        if self.active < self.limit and not self.waiting():
+            self.active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # Slot passes straight to the waiter
+                return
+        self.active -= 1
+
+
+def is_retryable(exc):
+    """Rate limits, server errors and timeouts are worth retrying."""
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if status is not None and str(getattr(status, "value", status)) in _RETRYABLE_STATUS:
+        return True
+    return type(exc).__name__ in {
+        "ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+        "InternalServerError", "DeadlineExceeded",
+    }
+
+
+class LLMGateway:
+    """
+    Single entry point for every LLM call in the app: a token-bucket rate
+    limit, bounded concurrency with priority classes and jittered
+    exponential-backoff retries.
+    """
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 requests_per_minute: float = LLM_REQUESTS_PER_MINUTE, burst: int = LLM_BURST,
+                 max_retries: int = LLM_MAX_RETRIES):
+        self.max_retries = max_retries
+        self._bucket = TokenBucket(rate=requests_per_minute / 60, capacity=burst)
+        self._slots = PrioritySemaphore(max_concurrency)
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.throttled_seconds = 0.0
+
+    async def _admit(self, priority):
+        await self._slots.acquire(priority)
+        try:
+            self.throttled_seconds += await self._bucket.acquire()
+        except BaseException:
+            self._slots.release()
+            raise
+        self.requests += 1
+
+    async def _backoff(self, attempt, exc):
+        self.retries += 1
+        record_llm_retry()
+        delay = min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** attempt)
+        delay = random.uniform(0, delay)  # Full jitter
+        print(f"❌ LLM call failed ({type(exc).__name__}), retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+    async def ainvoke(self, runnable, priority, input, config=None, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            await self._admit(priority)
+            try:
+                return await runnable.ainvoke(input, config, **kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    self.failures += 1
+                    raise
+                retry_error = e
+            finally:
+                self._slots.release()
+            await self._backoff(attempt, retry_error)
+
+    async def astream(self, runnable, priority, input, config=None, **kwargs):
+        # Only retried before the first chunk; a partial stream can't be replayed
+        for attempt in range(self.max_retries + 1):
+            await self._admit(priority)
+            started = False
+            try:
+                async for chunk in runnable.astream(input, config, **kwargs):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or attempt == self.max_retries or not is_retryable(e):
+                    self.failures += 1
+                    raise
+                retry_error = e
+            finally:
+                self._slots.release()
+            await self._backoff(attempt, retry_error)
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "active": self._slots.active,
+            "max_concurrency": self._slots.limit,
+            "waiting_interactive": self._slots.waiting(INTERACTIVE),
+            "waiting_background": self._slots.waiting(BACKGROUND),
+        }
+
+
+class GatedRunnable:
+    """A runnable whose calls go through the gateway at a fixed priority."""
+
+    def __init__(self, gateway, runnable, priority):
+        self.gateway = gateway
+        self.runnable = runnable
+        self.priority = priority
+
+    def _priority(self):
+        override = _priority_override.get()
+        return self.priority if override is None else override
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        return await self.gateway.ainvoke(self.runnable, self._priority(), input, config, **kwargs)
+
+    def astream(self, input, config=None, **kwargs):
+        return self.gateway.astream(self.runnable, self._priority(), input, config, **kwargs)
+
+
+llm_gateway = LLMGateway()
+
+_chat_models = {}
+
+
+def get_chat_model(model: str = LLM_MODEL):
+    """
+    Shared chat model per model name, so all nodes reuse one client and its
+    connection pool. Retries are left to the gateway.
+    """
+    if model not in _chat_models:
+        if LLM_PROVIDER == "fake":
+            from interview_module.core.fakes import FixtureChatModel
+
+            _chat_models[model] = FixtureChatModel()
+        else:
+            _chat_models[model] = ChatGoogleGenerativeAI(model=model, max_retries=1)
+    return _chat_models[model]
+
+
+def gated_llm(runnable, priority: int = INTERACTIVE):
+    """Routes a model or structured-output chain through the shared gateway."""
+    return GatedRunnable(llm_gateway, runnable, priority)
@@ -1,22 +1,153 @@
-from pymongo.mongo_client import MongoClient
+"""
+The MongoDB client shared by the interview and lesson plan modules.
+
+One client means one connection pool per server for the whole process.
+The client object is built when this module is imported, but with
+connect=False: no connections are opened until the first query. The startup
+hook pings the server and reports configuration problems such as missing
+compressors (see main.py); the shutdown hook closes the client.
+
+Pool, timeouts and compression come from the environment:
+MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_MAX_IDLE_TIME_MS,
+MONGO_WAIT_QUEUE_TIMEOUT_MS, MONGO_SERVER_SELECTION_TIMEOUT_MS,
+MONGO_CONNECT_TIMEOUT_MS, MONGO_SOCKET_TIMEOUT_MS and MONGO_COMPRESSORS.
+Pool usage is reported by `mongo_pool_monitor` on /stats/mongo and /metrics.
+"""
+import asyncio
+import importlib.util
 import os
 import certifi
 from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from interview_module.core.instrumentation import mongo_command_counter, mongo_pool_monitor
+
 load_dotenv()
 
 uri = os.getenv("MONGO_URI")
 
-client = MongoClient(uri,tlsCAFile=certifi.where(),  
-    serverSelectionTimeoutMS=5000 )
+# mongo | mock (in-memory mongomock-motor, for offline benchmarks)
+MONGO_PROVIDER = os.getenv("MONGO_PROVIDER", "mongo")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "interview_ai")
+
+
+def _optional_int(name, default=None):
+    value = os.getenv(name, default)
+    return int(value) if value not in (None, "") else None
+
+
+MONGO_MAX_POOL_SIZE = _optional_int("MONGO_MAX_POOL_SIZE", "100")
+MONGO_MIN_POOL_SIZE = _optional_int("MONGO_MIN_POOL_SIZE", "0")
+MONGO_MAX_IDLE_TIME_MS = _optional_int("MONGO_MAX_IDLE_TIME_MS", "300000")
+# How long a query waits for a free pooled connection; unset waits for as long as the timeouts allow
+MONGO_WAIT_QUEUE_TIMEOUT_MS = _optional_int("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+MONGO_SERVER_SELECTION_TIMEOUT_MS = _optional_int("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")
+MONGO_CONNECT_TIMEOUT_MS = _optional_int("MONGO_CONNECT_TIMEOUT_MS", "10000")
+MONGO_SOCKET_TIMEOUT_MS = _optional_int("MONGO_SOCKET_TIMEOUT_MS")
+# Wire compression in order of preference; the server picks the first it also supports
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,snappy")
+MONGO_PING_TIMEOUT_SECONDS = float(os.getenv("MONGO_PING_TIMEOUT_SECONDS", "5"))
+
+# Python package each compressor needs
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def _requested_compressors(names: str = MONGO_COMPRESSORS):
+    return [name.strip() for name in names.split(",") if name.strip()]
+
+
+def available_compressors(names: str = MONGO_COMPRESSORS):
+    """The requested compressors whose Python package is installed."""
+    return [
+        name for name in _requested_compressors(names)
+        if name in _COMPRESSOR_MODULES and importlib.util.find_spec(_COMPRESSOR_MODULES[name])
+    ]
+
+
+def client_options():
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+    }
+    options = {key: value for key, value in options.items() if value is not None}
+    compressors = available_compressors()
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
+
+_client = None
+_client_options = {}
+
+
+def get_client():
+    """The process-wide client; building it opens no connections."""
+    global _client
+    if _client is None:
+        if MONGO_PROVIDER == "mock":
+            from interview_module.core.fakes import mock_mongo_client
+
+            _client = mock_mongo_client()
+        else:
+            _client_options.update(client_options())
+            # connect=False: no connections until the first operation
+            _client = AsyncIOMotorClient(
+                uri,
+                tlsCAFile=certifi.where(),
+                connect=False,
+                event_listeners=[mongo_command_counter, mongo_pool_monitor],
+                **_client_options,
+            )
+    return _client
+
+
+def get_database():
+    return get_client()[MONGO_DB_NAME]
+
+
+health = {"ok": None, "error": None}
+
+
+async def ping():
+    """Health check run by the startup hook. Returns whether MongoDB answered."""
+    if MONGO_PROVIDER != "mock":
+        skipped = sorted(set(_requested_compressors()) - set(available_compressors()))
+        if skipped:
+            print(f"❌ MongoDB compressors not available, skipping: {', '.join(skipped)}")
+    try:
+        await asyncio.wait_for(get_client().admin.command('ping'), timeout=MONGO_PING_TIMEOUT_SECONDS)
+        health.update(ok=True, error=None)
+        print("✅ Successfully connected to MongoDB!")
+    except Exception as e:
+        health.update(ok=False, error=str(e) or type(e).__name__)
+        print("❌ MongoDB connection error:", health["error"])
+    return health["ok"]
+
+
+def close():
+    """Closes the pooled connections; called by the shutdown hook."""
+    if _client is not None and MONGO_PROVIDER != "mock":
+        _client.close()
+
+
+def stats():
+    return {
+        "provider": MONGO_PROVIDER,
+        "healthy": health["ok"],
+        "error": health["error"],
+        "options": _client_options,
+        "pools": mongo_pool_monitor.stats(),
+    }
 
-try:
-    client.admin.command('ping')
-    print("✅ Successfully connected to MongoDB!")
-except Exception as e:
-    print("❌ MongoDB connection error:", e)
 
-db = client["interview_ai"]  # Your MongoDB database name
+client = get_client()
+db = get_database()
 sessions_col = db["interview_sessions"]
 qa_col = db["qa_history"]
 persona_col = db["persona_reports"]
-lesson_plan = db["lesson_plans"]
\ No newline at end of file
+lesson_plan = db["lesson_plans"]
+lesson_plan_versions = db["lesson_plan_versions"]
@@ -1,5 +1,7 @@
-from qdrant_client import QdrantClient
-from langchain_huggingface import HuggingFaceEmbeddings
+from qdrant_client import AsyncQdrantClient, models
+from interview_module.core.embedding_cache import cached_embed_query, cached_embed_queries
+from interview_module.core.instrumentation import timed_external_call
+import asyncio
 import os
 from dotenv import load_dotenv
 from pathlib import Path
@@ -15,35 +17,109 @@ print(os.getenv("QDRANT_URL"))
 QDRANT_URL = os.getenv("QDRANT_URL")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
 COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME")
+# qdrant | memory (offline fixture chunks, see interview_module/core/fakes.py)
+VECTOR_STORE_PROVIDER = os.getenv("VECTOR_STORE_PROVIDER", "qdrant")
 
-# Load embedding model (e.g., MiniLM)
-embedding_model = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2"
-)
+if VECTOR_STORE_PROVIDER == "memory":
+    from interview_module.core.fakes import HashingEmbeddings, seed_fixture_collection
 
-print(QDRANT_API_KEY)
-print(QDRANT_URL)
-print(COLLECTION_NAME)
-# Qdrant client (for cloud)
-client = QdrantClient(url=QDRANT_URL,api_key=QDRANT_API_KEY)
+    EMBEDDING_MODEL_NAME = "fixture-hashing"
+    embedding_model = HashingEmbeddings()
+    COLLECTION_NAME = COLLECTION_NAME or "fixture_chunks"
+    client = AsyncQdrantClient(":memory:")
+else:
+    from langchain_huggingface import HuggingFaceEmbeddings
 
+    EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+    # Load embedding model (e.g., MiniLM)
+    embedding_model = HuggingFaceEmbeddings(
+        model_name=EMBEDDING_MODEL_NAME
+    )
+
+    print(QDRANT_API_KEY)
+    print(QDRANT_URL)
+    print(COLLECTION_NAME)
+    # Qdrant client (for cloud)
+    client = AsyncQdrantClient(url=QDRANT_URL,api_key=QDRANT_API_KEY)
+
+_collection_ready = VECTOR_STORE_PROVIDER != "memory"
+
+async def _ensure_collection():
+    # The in-memory store starts empty; seed it on first use
+    global _collection_ready
+    if not _collection_ready:
+        await seed_fixture_collection(client, COLLECTION_NAME, embedding_model)
+        _collection_ready = True
 
 def embed_query(text: str):
-    return embedding_model.embed_query(text)
+    return cached_embed_query(text, EMBEDDING_MODEL_NAME, embedding_model.embed_query)
+
+def embed_queries(texts):
+    return cached_embed_queries(texts, EMBEDDING_MODEL_NAME, embedding_model.embed_documents)
 
-def search_similar_chunks(query_text: str, top_k: int = 5, score_threshold: float = 0.5):
-    query_vector = embed_query(query_text)
+async def search_similar_chunks(query_text: str, top_k: int = 5, score_threshold: float = 0.5):
+    # The embedding model is CPU-bound, keep it off the event loop
+    query_vector = await asyncio.to_thread(embed_query, query_text)
+    await _ensure_collection()
     try:
-        results = client.search(
-            collection_name=COLLECTION_NAME,  # Use the variable
-            query_vector=query_vector,
-            limit=top_k,
-            score_threshold=score_threshold
-        )
-        return results
+        with timed_external_call("qdrant", "query_points"):
+            response = await client.query_points(
+                collection_name=COLLECTION_NAME,  # Use the variable
+                query=query_vector,
+                limit=top_k,
+                score_threshold=score_threshold,
+                with_payload=True,
+            )
+        return response.points
     except Exception as e:
         print(f"Error searching collection '{COLLECTION_NAME}': {e}")
         # You could check if the collection exists
-        collections = client.get_collections()
+        collections = await client.get_collections()
         print(f"Available collections: {collections}")
-        return []
\ No newline at end of file
+        return []
+
+async def search_similar_chunks_batch(query_texts, top_k: int = 5, score_threshold: float = 0.5):
+    """
+    Embeds all queries in one model call and searches them in one Qdrant request.
+    Returns one list of hits per query, in the same order as `query_texts`.
+    """
+    if not query_texts:
+        return []
+    query_vectors = await asyncio.to_thread(embed_queries, query_texts)
+    await _ensure_collection()
+    try:
+        with timed_external_call("qdrant", "query_batch_points"):
+            responses = await client.query_batch_points(
+                collection_name=COLLECTION_NAME,
+                requests=[
+                    models.QueryRequest(
+                        query=vector,
+                        limit=top_k,
+                        score_threshold=score_threshold,
+                        with_payload=True,
+                    )
+                    for vector in query_vectors
+                ],
+            )
+        return [response.points for response in responses]
+    except Exception as e:
+        print(f"Error batch searching collection '{COLLECTION_NAME}': {e}")
+        return [[] for _ in query_texts]
+
+def to_context_records(results):
+    """
+    Converts Qdrant hits into plain dicts that can be carried in the graph state.
+    """
+    return [
+        {
+            "id": str(r.id),
+            "score": r.score,
+            "payload": {
+                key: r.payload.get(key)
+                for key in ("section_title", "content", "type")
+                if key in r.payload
+            },
+        }
+        for r in results
+    ]
@@ -1,15 +1,21 @@
+import asyncio
 from langgraph.graph import StateGraph, END
+from interview_module.core.checkpointer import build_checkpointer
+from interview_module.core.instrumentation import instrument_node
 from interview_module.langraph_flow.nodes.curriculum_llm import generate_curriculum_llm
 from interview_module.langraph_flow.nodes.curriculum_rag import generate_curriculum_rag
 from interview_module.langraph_flow.nodes.check_docs import check_docs
+from interview_module.langraph_flow.nodes.concept_context import precompute_concept_contexts
 from interview_module.langraph_flow.nodes.rag_question import generate_question_rag
 from interview_module.langraph_flow.nodes.llm_question import generate_question_llm
 from interview_module.langraph_flow.nodes.score import score_answer
-from interview_module.langraph_flow.nodes.decide import decide_next
+from interview_module.langraph_flow.nodes.decide import decide_next, DECIDE_MAX_RETRIES
 from interview_module.langraph_flow.nodes.persona import run_persona
+from interview_module.langraph_flow.nodes.prefetch import prefetch_next_question, serve_prefetched
+from interview_module.services.speculative_questions import speculative_questions, serve_speculative
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class InterviewState(BaseModel):
     user_id: str
@@ -27,81 +33,50 @@ class InterviewState(BaseModel):
     score_history: List[int] = Field(default_factory=list)
     retry_count: int = 0
     use_rag: bool = False
+    refresh_curriculum: bool = False  # Bypass the curriculum cache for this session
     done: bool = False
     session_id: Optional[str] = None
-    persona_summary: Optional[str] = None
+    persona_summary: Optional[Any] = None  # PersonaSummary once the interview is done
+    retrieved_chunks: List[Dict[str, Any]] = Field(default_factory=list)  # Top-k hits shared by CheckDocs and GenerateCurriculumRAG
+    concept_contexts: Dict[str, Dict[str, Any]] = Field(default_factory=dict)  # concept -> {chunk_ids, context}
+    prefetched_question: Optional[Dict[str, Any]] = None  # {concept_index, update} from PrefetchNextQuestion
 
-# Create a graph for just the first question (curriculum + first question)
-def create_initial_question_graph():
+# Full interview graph. It pauses before ScoreAnswer after every question, and the
+# checkpointer persists the state per session (thread_id = session_id), so
+# /interview/answer resumes from the last checkpoint even after a worker restart.
+#
+# The next question is prepared ahead in one of two ways. With speculation on
+# (SPECULATIVE_QUESTIONS, the default) it is generated while the user answers
+# and served by the AskQuestion nodes. With speculation off, ScoreAnswer and
+# PrefetchNextQuestion run in parallel on resume and join at DecideNext.
+def create_interview_graph(checkpointer=None, speculative: Optional[bool] = None):
+    if speculative is None:
+        speculative = speculative_questions.enabled
     builder = StateGraph(InterviewState)
-    
-    # Add nodes needed for initial flow
-    builder.add_node("CheckDocs", check_docs)
-    builder.add_node("GenerateCurriculumRAG", generate_curriculum_rag)
-    builder.add_node("GenerateCurriculumLLM", generate_curriculum_llm)
-    builder.add_node("AskQuestionRAG", generate_question_rag)
-    builder.add_node("AskQuestionLLM", generate_question_llm)
-    
-    # Set entry point
-    builder.set_entry_point("CheckDocs")
-    
-    # Define conditional routing from CheckDocs
-    builder.add_conditional_edges(
-        "CheckDocs",
-        lambda s: "GenerateCurriculumRAG" if s.use_rag else "GenerateCurriculumLLM"
-    )
-    
-    # Connect curriculum to question generation
-    builder.add_edge("GenerateCurriculumRAG", "AskQuestionRAG")
-    builder.add_edge("GenerateCurriculumLLM", "AskQuestionLLM")
-    
-    # End the flow after question generation
-    builder.add_edge("AskQuestionRAG", END)
-    builder.add_edge("AskQuestionLLM", END)
-    
-    return builder.compile()
 
-# Create a graph for the answer-question loop (scoring and beyond)
-def create_answer_loop_graph():
-    builder = StateGraph(InterviewState)
-    
-    # Add nodes for answer flow
-    builder.add_node("ScoreAnswer", score_answer)
-    builder.add_node("DecideNext", decide_next)
-    builder.add_node("AskQuestionRAG", generate_question_rag)
-    builder.add_node("AskQuestionLLM", generate_question_llm)
-    builder.add_node("Persona", run_persona)
-    
-    # Set entry point to score answer
-    builder.set_entry_point("ScoreAnswer")
-    
-    # Connect scoring to decision
-    builder.add_edge("ScoreAnswer", "DecideNext")
-    
-    # Conditional path from decision
-    builder.add_conditional_edges(
-        "DecideNext",
-        lambda s: "Persona" if s.done else ("AskQuestionRAG" if s.use_rag else "AskQuestionLLM")
-    )
-    
-    # Set end point
-    builder.add_edge("Persona", END)
-    
-    return builder.compile()
+    if speculative:
+        ask_rag = serve_speculative(generate_question_rag)
+        ask_llm = serve_speculative(generate_question_llm)
+    else:
+        ask_rag = serve_prefetched(generate_question_rag)
+        ask_llm = serve_prefetched(generate_question_llm)
 
-# Create full graph for backwards compatibility
-def create_full_interview_graph():
-    builder = StateGraph(InterviewState)
-    
-    # Add all nodes
-    builder.add_node("CheckDocs", check_docs)
-    builder.add_node("GenerateCurriculumRAG", generate_curriculum_rag)
-    builder.add_node("GenerateCurriculumLLM", generate_curriculum_llm)
-    builder.add_node("AskQuestionRAG", generate_question_rag)
-    builder.add_node("AskQuestionLLM", generate_question_llm)
-    builder.add_node("ScoreAnswer", score_answer)
-    builder.add_node("DecideNext", decide_next)
-    builder.add_node("Persona", run_persona)
+    # Add all nodes, timed per node (see /stats/nodes)
+    nodes = {
+        "CheckDocs": check_docs,
+        "GenerateCurriculumRAG": generate_curriculum_rag,
+        "GenerateCurriculumLLM": generate_curriculum_llm,
+        "PrecomputeConceptContext": precompute_concept_contexts,
+        "AskQuestionRAG": ask_rag,
+        "AskQuestionLLM": ask_llm,
+        "ScoreAnswer": score_answer,
+        "DecideNext": decide_next,
+        "Persona": run_persona,
+    }
+    if not speculative:
+        nodes["PrefetchNextQuestion"] = prefetch_next_question
+    for name, node in nodes.items():
+        builder.add_node(name, instrument_node(name, node))
     
     # Set entry point
     builder.set_entry_point("CheckDocs")
@@ -111,20 +86,61 @@ def create_full_interview_graph():
         "CheckDocs",
         lambda s: "GenerateCurriculumRAG" if s.use_rag else "GenerateCurriculumLLM"
     )
-    builder.add_edge("GenerateCurriculumRAG", "AskQuestionRAG")
+    builder.add_edge("GenerateCurriculumRAG", "PrecomputeConceptContext")
+    builder.add_edge("PrecomputeConceptContext", "AskQuestionRAG")
     builder.add_edge("GenerateCurriculumLLM", "AskQuestionLLM")
-    builder.add_edge("AskQuestionRAG", "ScoreAnswer")
-    builder.add_edge("AskQuestionLLM", "ScoreAnswer")
-    builder.add_edge("ScoreAnswer", "DecideNext")
+    for ask_node in ("AskQuestionRAG", "AskQuestionLLM"):
+        builder.add_edge(ask_node, "ScoreAnswer")
+        if not speculative:
+            builder.add_edge(ask_node, "PrefetchNextQuestion")
+    if speculative:
+        builder.add_edge("ScoreAnswer", "DecideNext")
+    else:
+        builder.add_edge(["ScoreAnswer", "PrefetchNextQuestion"], "DecideNext")
     builder.add_conditional_edges(
         "DecideNext",
         lambda s: "Persona" if s.done else ("AskQuestionRAG" if s.use_rag else "AskQuestionLLM")
     )
     builder.add_edge("Persona", END)
     
-    return builder.compile()
+    # Wait for the user's answer before scoring
+    return builder.compile(checkpointer=checkpointer, interrupt_before=["ScoreAnswer"])
+
+_interview_graph = None
+_interview_graph_lock = asyncio.Lock()
+
+async def get_interview_graph():
+    """
+    Returns the compiled interview graph, creating the checkpointer on first use.
+    """
+    global _interview_graph
+    async with _interview_graph_lock:
+        if _interview_graph is None:
+            _interview_graph = create_interview_graph(await build_checkpointer())
+    return _interview_graph
+
+async def close_interview_graph():
+    global _interview_graph
+    async with _interview_graph_lock:
+        if _interview_graph is not None and hasattr(_interview_graph.checkpointer, "aclose"):
+            await _interview_graph.checkpointer.aclose()
+        _interview_graph = None
+
+def thread_config(session_id: str):
+    return {"configurable": {"thread_id": session_id}}
 
-# Compile all graphs
-initial_question_graph = create_initial_question_graph()
-answer_loop_graph = create_answer_loop_graph()
-interview_graph = create_full_interview_graph()  # For backwards compatibility
\ No newline at end of file
+def start_question_speculation(values):
+    """
+    Pre-generates the questions for the possible outcomes of the pending answer:
+    retrying the current concept and moving to the next one.
+    """
+    state = InterviewState(**values)
+    if state.done or not state.curriculum:
+        return
+    branches = []
+    if state.retry_count < DECIDE_MAX_RETRIES:
+        branches.append((state.current_concept_index, state.retry_count + 1))
+    if state.current_concept_index + 1 < len(state.curriculum):
+        branches.append((state.current_concept_index + 1, 0))
+    generate = generate_question_rag if state.use_rag else generate_question_llm
+    speculative_questions.start(state, generate, branches)
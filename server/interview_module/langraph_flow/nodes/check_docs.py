@@ -1,26 +1,29 @@
-from interview_module.core.vector_Store import search_similar_chunks
-from langchain_google_genai import ChatGoogleGenerativeAI
+from interview_module.core.vector_Store import search_similar_chunks, to_context_records
+from interview_module.core.llm import get_chat_model, gated_llm
 
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
+llm = get_chat_model()
 from pydantic import BaseModel, Field
 
 class RelevanceCheck(BaseModel):
     is_relevant: bool = Field(..., description="Whether vector DB content is relevant to the user's subject and goal")
 
-structured_llm = llm.with_structured_output(RelevanceCheck)
-def check_docs(state):
+# One search serves both CheckDocs and GenerateCurriculumRAG; the relevance
+# check only looks at the best few hits.
+RAG_CONTEXT_TOP_K = 15
+RELEVANCE_SAMPLE_SIZE = 5
+
+structured_llm = gated_llm(llm.with_structured_output(RelevanceCheck))
+async def check_docs(state):
     query = f"{state.subject} {state.goal} {state.level}"
-    results = search_similar_chunks(query, top_k=5)
-    print(results)
+    results = await search_similar_chunks(query, top_k=RAG_CONTEXT_TOP_K)
+    retrieved_chunks = to_context_records(results)
     if not results:
-        state.use_rag = False
-        return state
+        return {"use_rag": False, "retrieved_chunks": retrieved_chunks}
 
     content_samples = "\n\n".join([
-        f"Section: {r.payload.get('section_title')}\n{r.payload.get('content')[:150]}"
-        for r in results if "content" in r.payload
+        f"Section: {r['payload'].get('section_title')}\n{r['payload'].get('content')[:150]}"
+        for r in retrieved_chunks[:RELEVANCE_SAMPLE_SIZE] if "content" in r["payload"]
     ])
-    print(content_samples)
 
     prompt = f"""
     A student wants to learn about "{state.subject}" to achieve the goal "{state.goal}" at a {state.level} level.
@@ -31,12 +34,12 @@ def check_docs(state):
     {content_samples}
     """
 
-    response = structured_llm.invoke(prompt)
-    state.use_rag = response.is_relevant
+    response = await structured_llm.ainvoke(prompt)
+    use_rag = response.is_relevant
     
-    if state.use_rag:
+    if use_rag:
         print("Relevant documents found:")
     else:
         print("No relevant documents found.")
     
-    return state
+    return {"use_rag": use_rag, "retrieved_chunks": retrieved_chunks}
@@ -0,0 +1,34 @@
+from interview_module.core.vector_Store import search_similar_chunks_batch, to_context_records
+
+CONCEPT_CONTEXT_TOP_K = 5
+CONCEPT_CONTEXT_CHUNKS = 3
+
+def build_concept_context(records):
+    """
+    Keeps the best content chunks for a concept as a compact {chunk_ids, context} entry.
+    """
+    content_records = [
+        r for r in records
+        if r["payload"].get("type") == "content" and "content" in r["payload"]
+    ][:CONCEPT_CONTEXT_CHUNKS]
+    return {
+        "chunk_ids": [r["id"] for r in content_records],
+        "context": "\n\n".join(r["payload"]["content"] for r in content_records),
+    }
+
+async def precompute_concept_contexts(state):
+    """
+    Fetches the RAG context of every curriculum concept up front (one batched
+    embedding call and one batched Qdrant search), so question generation on
+    later /interview/answer turns does no vector work.
+    """
+    if not state.curriculum:
+        return {}
+
+    results = await search_similar_chunks_batch(state.curriculum, top_k=CONCEPT_CONTEXT_TOP_K)
+    concept_contexts = {
+        concept: build_concept_context(to_context_records(hits))
+        for concept, hits in zip(state.curriculum, results)
+    }
+    print(f"Precomputed RAG context for {len(concept_contexts)} concepts")
+    return {"concept_contexts": concept_contexts}
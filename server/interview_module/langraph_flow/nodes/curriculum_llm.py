@@ -1,9 +1,10 @@
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+from interview_module.core.llm import get_chat_model, gated_llm
 from dotenv import load_dotenv
 from interview_module.services.mongo_persistence import save_curriculum
+from interview_module.core.curriculum_cache import curriculum_cache
 load_dotenv()
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
+llm = get_chat_model()
 from langchain.prompts import PromptTemplate
 from pydantic import BaseModel, Field
 from typing import List
@@ -11,9 +12,21 @@ from typing import List
 class CurriculumList(BaseModel):
     curriculum: List[str] = Field(..., description="A list of 5-7 foundational and progressively challenging concepts that form a logical learning path for the user's specific goal and level. Each concept should be a clear, distinct topic suitable for a dedicated learning module.")
 
-structured_llm = llm.with_structured_output(CurriculumList)
+structured_llm = gated_llm(llm.with_structured_output(CurriculumList))
+
+# Bump when the prompt changes so cached curricula are regenerated
+PROMPT_VERSION = 1
+
+async def generate_curriculum_llm(state):
+    cached = await curriculum_cache.get(
+        "llm", state.subject, state.goal, state.level, PROMPT_VERSION,
+        bypass=state.refresh_curriculum,
+    )
+    if cached is not None:
+        await save_curriculum(state.session_id, cached)
+        print(f"Curriculum (cached): {cached}")
+        return {"curriculum": cached}
 
-def generate_curriculum_llm(state):
     prompt_str = """
     You are an expert curriculum designer for a personalized AI learning platform.
     Your primary goal is to create a highly focused and progressive curriculum tailored to a single learner's specific needs.
@@ -48,8 +61,8 @@ def generate_curriculum_llm(state):
     }
 
     input_prompt = prompt.format(**state_dict)
-    response = structured_llm.invoke(input_prompt)
-    state.curriculum = response.curriculum
-    save_curriculum(state.session_id, state.curriculum)
+    response = await structured_llm.ainvoke(input_prompt)
+    await curriculum_cache.set("llm", state.subject, state.goal, state.level, PROMPT_VERSION, response.curriculum)
+    await save_curriculum(state.session_id, response.curriculum)
     print(f"Curriculum: {response.curriculum}")
-    return state
\ No newline at end of file
+    return {"curriculum": response.curriculum}
\ No newline at end of file
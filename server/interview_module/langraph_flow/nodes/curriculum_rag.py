@@ -1,26 +1,44 @@
 
-from interview_module.core.vector_Store import search_similar_chunks
-from langchain_google_genai import ChatGoogleGenerativeAI
+from interview_module.core.vector_Store import search_similar_chunks, to_context_records
+from interview_module.core.llm import get_chat_model, gated_llm
 from dotenv import load_dotenv
 from interview_module.services.mongo_persistence import save_curriculum
+from interview_module.core.curriculum_cache import curriculum_cache, context_hash
 
 load_dotenv()
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
+llm = get_chat_model()
 from pydantic import BaseModel, Field
 from typing import List
 
 class CurriculumList(BaseModel):
     curriculum: List[str] = Field(..., description="A list of 5-7 foundational and progressively challenging concepts extracted from the provided text, forming a logical learning path for the user's specific goal and level. Each concept should be a clear, distinct topic suitable for a dedicated learning module.")
 
-structured_llm = llm.with_structured_output(CurriculumList)
+structured_llm = gated_llm(llm.with_structured_output(CurriculumList))
 
-def generate_curriculum_rag(state):
-    query = f"{state.subject} {state.goal} {state.level}"
-    results = search_similar_chunks(query, top_k=15) # Increased top_k for more context
+# Bump when the prompt changes so cached curricula are regenerated
+PROMPT_VERSION = 1
+
+async def generate_curriculum_rag(state):
+    results = state.retrieved_chunks
+    if not results:
+        # Only reached when the graph is entered without CheckDocs
+        query = f"{state.subject} {state.goal} {state.level}"
+        results = to_context_records(await search_similar_chunks(query, top_k=15)) # Increased top_k for more context
+
+    # Same request against the same retrieved chunks -> same curriculum
+    context = context_hash(results)
+    cached = await curriculum_cache.get(
+        "rag", state.subject, state.goal, state.level, PROMPT_VERSION,
+        context=context, bypass=state.refresh_curriculum,
+    )
+    if cached is not None:
+        await save_curriculum(state.session_id, cached)
+        print(f"Curriculum (cached): {cached}")
+        return {"curriculum": cached, "retrieved_chunks": []}
 
     chunks = "\n\n".join([
-        f"--- Document Title: {r.payload.get('section_title', 'Unknown')}\n--- Content Snippet:\n{r.payload.get('content', '')[:600]}\n" # Show more content per chunk
-        for r in results if "content" in r.payload
+        f"--- Document Title: {r['payload'].get('section_title', 'Unknown')}\n--- Content Snippet:\n{r['payload'].get('content', '')[:600]}\n" # Show more content per chunk
+        for r in results if "content" in r["payload"]
     ])
 
     if not chunks: # Handle case where no relevant chunks are found
@@ -62,8 +80,11 @@ def generate_curriculum_rag(state):
     * **Goal Specificity:** Always prioritize concepts that directly contribute to the *specific* stated goal, even if other topics are present in the chunks.
 
     """
-    response = structured_llm.invoke(prompt)
-    state.curriculum = response.curriculum
-    save_curriculum(state.session_id, state.curriculum)
+    response = await structured_llm.ainvoke(prompt)
+    await curriculum_cache.set(
+        "rag", state.subject, state.goal, state.level, PROMPT_VERSION, response.curriculum, context=context
+    )
+    await save_curriculum(state.session_id, response.curriculum)
     print(f"Curriculum: {response.curriculum}")
-    return state
\ No newline at end of file
+    # retrieved_chunks is consumed; clear it to keep the session state small
+    return {"curriculum": response.curriculum, "retrieved_chunks": []}
\ No newline at end of file
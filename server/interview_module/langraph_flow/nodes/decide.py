@@ -1,16 +1,46 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import os
+from dotenv import load_dotenv
+from interview_module.core.llm import get_chat_model, gated_llm
 from langchain.prompts import PromptTemplate
 from pydantic import BaseModel, Field
 
+load_dotenv()
+
+# Decision policy. A score at or above the pass mark moves on; below it the
+# concept is retried until the retry limit is reached.
+DECIDE_PASS_SCORE = int(os.getenv("DECIDE_PASS_SCORE", "50"))
+DECIDE_MAX_RETRIES = int(os.getenv("DECIDE_MAX_RETRIES", "3"))
+# Scores within this many points of the pass mark are ambiguous and are sent to
+# the LLM controller. 0 disables the LLM entirely.
+DECIDE_AMBIGUOUS_MARGIN = int(os.getenv("DECIDE_AMBIGUOUS_MARGIN", "0"))
+
 class NextAction(BaseModel):
     action: str = Field(..., description='Action to take: "retry", "next", or "end"')
     reason: str = Field(..., description="Brief explanation for the decision")
 
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
-structured_llm = llm.with_structured_output(NextAction)
+llm = get_chat_model()
+structured_llm = gated_llm(llm.with_structured_output(NextAction))
+
+# Who decided (rules or llm) and what was decided
+decision_stats = {"rules": 0, "llm": 0, "retry": 0, "next": 0, "end": 0}
+
 
-def decide_next(state):
-    # Prepare interview progress summary
+def decide_by_rules(score, retry_count, pass_score=DECIDE_PASS_SCORE,
+                    max_retries=DECIDE_MAX_RETRIES, ambiguous_margin=DECIDE_AMBIGUOUS_MARGIN):
+    """
+    Applies the retry/next policy locally. Returns None when the score falls in
+    the ambiguous band and the LLM should decide.
+    """
+    if retry_count >= max_retries:
+        return NextAction(action="next", reason=f"Retry limit of {max_retries} reached")
+    if abs(score - pass_score) < ambiguous_margin:
+        return None
+    if score >= pass_score:
+        return NextAction(action="next", reason=f"Score {score} meets pass mark {pass_score}")
+    return NextAction(action="retry", reason=f"Score {score} below pass mark {pass_score}")
+
+
+async def ask_llm_for_decision(state):
     prompt = PromptTemplate.from_template("""
 You are an intelligent interview flow controller.
 
@@ -26,9 +56,10 @@ Retry count for this concept: {retry_count}
 Concept index: {current_index} / {total_concepts}
 
 Rules:
-- If score ≥ 50 and retry_count < 3 → Move to next concept.
-- If score < 50 and retry_count < 3 → Retry same concept.
-- If retry_count ≥ 3 → Move to next concept anyway.
+- If score ≥ {pass_score} and retry_count < {max_retries} → Move to next concept.
+- If score < {pass_score} and retry_count < {max_retries} → Retry same concept.
+- If retry_count ≥ {max_retries} → Move to next concept anyway.
+- The score is close to the pass mark, so weigh how complete and correct the answer is.
 """)
 
 
@@ -38,24 +69,43 @@ Rules:
     last_score=state.score_history[-1] if state.score_history else 0,
     current_index=state.current_concept_index,
     total_concepts=len(state.curriculum),
-    retry_count=state.retry_count
+    retry_count=state.retry_count,
+    pass_score=DECIDE_PASS_SCORE,
+    max_retries=DECIDE_MAX_RETRIES,
 )
 
+    return await structured_llm.ainvoke(input_prompt)
+
 
-    decision = structured_llm.invoke(input_prompt)
-    print(f"DEBUG: Decision made: {decision}")
+async def decide_next(state):
+    last_score = state.score_history[-1] if state.score_history else 0
+    decision = decide_by_rules(last_score, state.retry_count)
+    if decision is None:
+        decision_stats["llm"] += 1
+        decision = await ask_llm_for_decision(state)
+    else:
+        decision_stats["rules"] += 1
+    if decision.action in decision_stats:
+        decision_stats[decision.action] += 1
 
     # Apply the decision to state
+    current_concept_index = state.current_concept_index
+    retry_count = state.retry_count
+    done = state.done
     if decision.action == "retry":
-        state.retry_count += 1
+        retry_count += 1
     elif decision.action == "next":
-        state.current_concept_index += 1
-        state.retry_count = 0
+        current_concept_index += 1
+        retry_count = 0
     elif decision.action == "end":
-        state.done = True
+        done = True
 
     # Also safeguard end based on concept overflow
-    if state.current_concept_index >= len(state.curriculum):
-        state.done = True
+    if current_concept_index >= len(state.curriculum):
+        done = True
 
-    return state
+    return {
+        "current_concept_index": current_concept_index,
+        "retry_count": retry_count,
+        "done": done,
+    }
@@ -1,8 +1,9 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from interview_module.langraph_flow.streaming import ainvoke_structured, json_streaming_llm
+from interview_module.core.llm import get_chat_model, gated_llm
 from dotenv import load_dotenv
 load_dotenv()
 import random
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
+llm = get_chat_model()
 from pydantic import BaseModel, Field
 from typing import List
 question_variations = [
@@ -21,8 +22,9 @@ variation_prompts = {
 class QuestionResponse(BaseModel):
     question: str = Field(..., description="LLM-generated interview question for current concept it might be detailed_answer, one_word_answer, mcq, or fill_in_the_blanks")
     question_type: str = Field(..., description="The type of question generated (e.g., 'mcq', 'detailed_answer', 'one_word_answer', 'fill_in_the_blanks')")
-structured_llm = llm.with_structured_output(QuestionResponse)
-def generate_question_llm(state):
+structured_llm = gated_llm(llm.with_structured_output(QuestionResponse))
+streaming_llm = gated_llm(json_streaming_llm(llm, QuestionResponse))
+async def generate_question_llm(state):
     variation = random.choice(question_variations)
     extra_instruction = variation_prompts[variation]
     concept = state.curriculum[state.current_concept_index]
@@ -40,9 +42,6 @@ def generate_question_llm(state):
         - Do not include any explanations or additional information.
         - The question should be appropriate for the specified level.
         """
-    question = structured_llm.invoke(prompt)
-    state.current_question = question.question
-    state.current_question_type = variation
+    question = await ainvoke_structured(structured_llm, streaming_llm, QuestionResponse, prompt, "question")
     print(f"Question: {question.question}")
-    # state.current_question = question
-    return state
+    return {"current_question": question.question, "current_question_type": variation}
@@ -1,11 +1,12 @@
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+from interview_module.core.llm import get_chat_model, gated_llm
 from dotenv import load_dotenv
 load_dotenv()
 from interview_module.core.mongo import persona_col
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any
 from interview_module.services.mongo_persistence import save_persona
+from interview_module.langraph_flow.streaming import ainvoke_structured, json_streaming_llm
 # Ensure you have feedback_history in your state class
 class QAEntry(BaseModel):
     question: str
@@ -23,10 +24,11 @@ class PersonaSummary(BaseModel):
     actionable_learning_recommendations: List[str] = Field(..., description="Specific, actionable recommendations for how the learner should approach future study, what types of resources would be most effective (e.g., more practice problems, re-reading theoretical explanations, watching videos, hands-on labs), and strategies to overcome identified weaknesses. These should be directly useful for a lesson plan.")
     preliminary_personalized_roadmap_suggestions: List[str] = Field(..., description="A suggested sequence of 3-5 high-level topics or chapters (more granular than the initial curriculum concepts) that should be prioritized in their personalized lesson plan to address weaknesses and build on strengths, leading towards their overall goal. These should be highly specific, e.g., 'Mastering Python Dictionaries: Advanced Methods'.")
 
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
-structured_llm = llm.with_structured_output(PersonaSummary)
+llm = get_chat_model()
+structured_llm = gated_llm(llm.with_structured_output(PersonaSummary))
+streaming_llm = gated_llm(json_streaming_llm(llm, PersonaSummary))
 
-def run_persona(state):
+async def run_persona(state):
     # Ensure feedback_history is correctly populated from score.py
     if not hasattr(state, 'feedback_history') or not state.feedback_history:
         print("WARNING: feedback_history is empty or missing. Persona generation might be less detailed.")
@@ -83,11 +85,10 @@ def run_persona(state):
     * **Ambiguous Answers:** If feedback indicates ambiguity, infer the most likely issues and recommend clarifying activities.
 
     """
-    persona = structured_llm.invoke(prompt)
-    state.persona_summary = persona # Ensure you're storing the full PersonaSummary object
+    persona = await ainvoke_structured(structured_llm, streaming_llm, PersonaSummary, prompt, "persona")
     print(f"Persona Summary: {persona.learner_profile_summary}")
     print(f"Preliminary Roadmap: {persona.preliminary_personalized_roadmap_suggestions}")
-    save_persona(state.session_id, state.persona_summary) 
+    await save_persona(state.session_id, persona) 
     # You might want to save persona to MongoDB here as well, if it's not handled by SaveAll node
     # persona_col.insert_one(persona.model_dump()) # Example if direct save needed
-    return state
\ No newline at end of file
+    return {"persona_summary": persona} # Ensure you're storing the full PersonaSummary object
\ No newline at end of file
@@ -0,0 +1,44 @@
+from interview_module.langraph_flow.nodes.rag_question import generate_question_rag
+from interview_module.langraph_flow.nodes.llm_question import generate_question_llm
+from interview_module.langraph_flow.streaming import no_streaming
+from interview_module.core.llm import llm_priority, BACKGROUND
+
+prefetch_stats = {"prefetched": 0, "served": 0, "discarded": 0}
+
+
+async def prefetch_next_question(state):
+    """
+    Runs alongside ScoreAnswer: generates the next concept's question so a
+    "next" decision can serve it without another LLM round trip. Only part of
+    the graph when speculative questions are disabled (see interview_graph.py).
+    """
+    next_index = state.current_concept_index + 1
+    if next_index >= len(state.curriculum):
+        return {"prefetched_question": None}
+
+    next_state = state.model_copy(update={"current_concept_index": next_index, "retry_count": 0})
+    generate = generate_question_rag if state.use_rag else generate_question_llm
+    # The user may never see this question, so it is not streamed and yields
+    # to calls a user is waiting on
+    with no_streaming(), llm_priority(BACKGROUND):
+        update = await generate(next_state)
+    prefetch_stats["prefetched"] += 1
+    return {"prefetched_question": {"concept_index": next_index, "update": update}}
+
+
+def serve_prefetched(generate):
+    """
+    Wraps a question node so a prefetched next-concept question is served when
+    the decision moved on; on a retry the prefetch is discarded.
+    """
+    async def node(state):
+        prefetched = state.prefetched_question
+        if prefetched:
+            if prefetched["concept_index"] == state.current_concept_index and state.retry_count == 0:
+                prefetch_stats["served"] += 1
+                return {**prefetched["update"], "prefetched_question": None}
+            prefetch_stats["discarded"] += 1
+        update = await generate(state)
+        return {**update, "prefetched_question": None}
+
+    return node
@@ -1,7 +1,9 @@
-from interview_module.core.vector_Store import search_similar_chunks
-from langchain_google_genai import ChatGoogleGenerativeAI
+from interview_module.langraph_flow.streaming import ainvoke_structured, json_streaming_llm
+from interview_module.core.vector_Store import search_similar_chunks, to_context_records
+from interview_module.langraph_flow.nodes.concept_context import build_concept_context, CONCEPT_CONTEXT_TOP_K
+from interview_module.core.llm import get_chat_model, gated_llm
 import random
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
+llm = get_chat_model()
 from pydantic import BaseModel, Field
 from typing import List
 question_variations = [
@@ -20,24 +22,22 @@ variation_prompts = {
 class QuestionResponse(BaseModel):
     question_type: str = Field(..., description="The type of question generated (e.g., 'mcq', 'detailed_answer', 'one_word_answer', 'fill_in_the_blanks')")
     question: str = Field(..., description="LLM-generated interview question for current concept it might be detailed_answer, one_word_answer, mcq, or fill_in_the_blanks")
-structured_llm = llm.with_structured_output(QuestionResponse)
-def generate_question_rag(state):
+structured_llm = gated_llm(llm.with_structured_output(QuestionResponse))
+streaming_llm = gated_llm(json_streaming_llm(llm, QuestionResponse))
+async def generate_question_rag(state):
     concept = state.curriculum[state.current_concept_index]
-    results = search_similar_chunks(concept, top_k=5)
+    concept_context = state.concept_contexts.get(concept)
+    if concept_context is None:
+        # Sessions without precomputed contexts fall back to a live search
+        results = await search_similar_chunks(concept, top_k=CONCEPT_CONTEXT_TOP_K)
+        concept_context = build_concept_context(to_context_records(results))
     variation = random.choice(question_variations)
     extra_instruction = variation_prompts[variation]
 
-    context_chunks = [
-        r.payload.get("content", "")
-        for r in results
-        if r.payload.get("type") == "content" and "content" in r.payload
-    ]
+    if not concept_context["chunk_ids"]:
+        return {"current_question": f"What do you know about: {concept}?"}
 
-    if not context_chunks:
-        state.current_question = f"What do you know about: {concept}?"
-        return state
-
-    context = "\n\n".join(context_chunks[:3])
+    context = concept_context["context"]
 
     prompt = f"""
     You are a helpful tutor. Generate one concise question on basis of {extra_instruction} to assess a Level {state.level} student's understanding of the following:
@@ -59,9 +59,7 @@ def generate_question_rag(state):
     Only generate one clear question.
     """
 
-    response= structured_llm.invoke(prompt)
+    response = await ainvoke_structured(structured_llm, streaming_llm, QuestionResponse, prompt, "question")
     print(response)
-    state.current_question_type = variation
     print(response.question)
-    state.current_question = response.question
-    return state
+    return {"current_question": response.question, "current_question_type": variation}
@@ -1,18 +1,20 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from interview_module.langraph_flow.streaming import ainvoke_structured, json_streaming_llm
+from interview_module.core.llm import get_chat_model, gated_llm
 from dotenv import load_dotenv
 load_dotenv()
 from pydantic import BaseModel, Field
 from typing import List
 
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
+llm = get_chat_model()
 
 class ScoreEvaluation(BaseModel):
     score: int = Field(..., ge=0, le=100, description="Score between 0 and 100 for the user's last answer, reflecting accuracy and completeness.")
     feedback: str = Field()
 
-structured_llm = llm.with_structured_output(ScoreEvaluation)
+structured_llm = gated_llm(llm.with_structured_output(ScoreEvaluation))
+streaming_llm = gated_llm(json_streaming_llm(llm, ScoreEvaluation))
 
-def score_answer(state):
+async def score_answer(state):
     answer = state.answer
     question = state.current_question
     subject = state.subject
@@ -138,7 +140,7 @@ def score_answer(state):
     Return the score and feedback in the exact Pydantic `ScoreEvaluation` JSON format. Do not include any additional conversational text, preambles, or explanations outside the JSON.
     """
     
-    result = structured_llm.invoke(prompt)
+    result = await ainvoke_structured(structured_llm, streaming_llm, ScoreEvaluation, prompt, "feedback")
     score = result.score
     feedback = result.feedback
 
@@ -146,9 +148,9 @@ def score_answer(state):
     print(f"Feedback: {feedback}")
 
     # Update state - ensure feedback is stored alongside Q, A, Score
-    state.score_history.append(score)
-    state.answer_history.append(answer)
-    state.question_history.append(question)
-    state.feedback_history.append(feedback) # Store feedback
-
-    return state
\ No newline at end of file
+    return {
+        "score_history": state.score_history + [score],
+        "answer_history": state.answer_history + [answer],
+        "question_history": state.question_history + [question],
+        "feedback_history": state.feedback_history + [feedback], # Store feedback
+    }
\ No newline at end of file
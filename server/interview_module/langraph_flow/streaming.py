@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from langgraph.config import get_config, get_stream_writer
+
+# Set by the SSE routes in the run config to make nodes stream their LLM output
+STREAM_TOKENS_KEY = "stream_tokens"
+
+_suppressed = ContextVar("interview_streaming_suppressed", default=False)
+
+
+@contextmanager
+def no_streaming():
+    """Runs LLM calls silently, e.g. for prefetched questions the user may never see."""
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+def streaming_enabled():
+    if _suppressed.get():
+        return False
+    try:
+        return bool(get_config()["configurable"].get(STREAM_TOKENS_KEY))
+    except RuntimeError:
+        # Called outside a graph run (e.g. speculative generation)
+        return False
+
+
+def json_streaming_llm(llm, schema):
+    """
+    Structured output as raw JSON, so partial objects can be parsed while the
+    response is still being generated. json_mode makes Gemini answer with
+    response_mime_type=application/json parsed by JsonOutputParser; the
+    function-calling path would return the arguments in one piece.
+    """
+    return llm.with_structured_output(schema.model_json_schema(), method="json_mode")
+
+
+async def astream_structured(streaming_llm, schema, prompt, event):
+    """
+    Streams a structured response as custom graph events and returns the
+    validated `schema` instance. String fields are sent as deltas while they
+    grow; other fields are sent once complete, i.e. when the next field starts.
+    """
+    writer = get_stream_writer()
+    sent = {}
+    data = {}
+
+    def send(field, value):
+        writer({"event": event, "field": field, "value": value})
+        sent[field] = value
+
+    async for data in streaming_llm.astream(prompt):
+        fields = list(data)
+        for position, field in enumerate(fields):
+            value = data[field]
+            if isinstance(value, str):
+                previous = sent.get(field, "")
+                if value != previous and value.startswith(previous):
+                    writer({"event": event, "field": field, "delta": value[len(previous):]})
+                    sent[field] = value
+            elif field not in sent and position < len(fields) - 1:
+                send(field, value)
+
+    for field, value in data.items():
+        if not isinstance(value, str) and field not in sent:
+            send(field, value)
+    return schema(**data)
+
+
+async def ainvoke_structured(structured_llm, streaming_llm, schema, prompt, event):
+    """Calls the node's structured LLM, streaming the response when the run asks for it."""
+    if streaming_enabled():
+        return await astream_structured(streaming_llm, schema, prompt, event)
+    return await structured_llm.ainvoke(prompt)
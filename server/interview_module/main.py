@@ -2,13 +2,14 @@ from fastapi import FastAPI
 from routes.interview_routes import router as interview_router
 import sys
 import os
-from interview_module.core.mongo import client  # ensures MongoDB connection is tested at startup
+from interview_module.core.mongo import ping as mongo_ping
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 app = FastAPI()
 app.include_router(interview_router)
 
 @app.on_event("startup")
 async def startup_event():
+    await mongo_ping()
     print("✅ FastAPI server started. MongoDB connection initialized.")
 
 @app.get("/")
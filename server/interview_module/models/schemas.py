@@ -1,11 +1,14 @@
 from pydantic import BaseModel
+from typing import Optional
 
 class InterviewStartInput(BaseModel):
     user_id: str
     subject: str
     goal: str
     level: str
+    refresh_curriculum: bool = False  # Skip the curriculum cache and generate a new one
 
 class AnswerInput(BaseModel):
     user_id: str
     answer: str
+    session_id: Optional[str] = None  # Defaults to the user's most recent interview
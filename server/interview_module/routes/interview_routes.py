@@ -1,22 +1,25 @@
+import json
 from fastapi import APIRouter, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from interview_module.models.schemas import InterviewStartInput, AnswerInput
-from interview_module.langraph_flow.interview_graph import initial_question_graph, answer_loop_graph
-from interview_module.services.session_state import init_state, load_state, save_state
+from interview_module.langraph_flow.interview_graph import get_interview_graph, thread_config, start_question_speculation
+from interview_module.services.speculative_questions import speculative_questions
+from interview_module.langraph_flow.streaming import STREAM_TOKENS_KEY
+from interview_module.services.session_state import init_state, load_active_session, save_active_session
 from interview_module.services.mongo_persistence import (
     create_interview_session,
     save_qa,
-    save_persona,
     
 )
-from lesson_plan_module.core.mongo import sessions_col, persona_col, qa_col
+from interview_module.core.mongo import persona_col
 from bson import ObjectId
 
 router = APIRouter()
 
-@router.post("/interview/start")
-def start_interview(data: InterviewStartInput):
+async def _prepare_start(data: InterviewStartInput):
     # Create DB session
-    session_id = create_interview_session(
+    session_id = await create_interview_session(
         user_id=data.user_id,
         subject=data.subject,
         goal=data.goal,
@@ -26,10 +29,10 @@ def start_interview(data: InterviewStartInput):
     # Create LangGraph state
     state = init_state(data)
     state["session_id"] = session_id
-    
-    # Use initial_question_graph to just get curriculum and first question
-    result = initial_question_graph.invoke(state)
-    
+    return session_id, state
+
+
+async def _finish_start(data: InterviewStartInput, session_id, result):
     # Process the result
     if isinstance(result, dict) and "state" in result:
         updated_state = result["state"]
@@ -38,8 +41,8 @@ def start_interview(data: InterviewStartInput):
     else:
         updated_state = result
     
-    # Save session state
-    save_state(data.user_id, updated_state)
+    # Remember the user's active session
+    await save_active_session(data.user_id, session_id)
     
     # Check if curriculum exists and has content
     if not updated_state.get("curriculum") or len(updated_state["curriculum"]) == 0:
@@ -48,6 +51,9 @@ def start_interview(data: InterviewStartInput):
             "message": "No curriculum was generated. Please try again.",
             "session_id": session_id
         }
+
+    # Prepare the candidate follow-up questions while the user answers
+    start_question_speculation(updated_state)
     
     # Return the first question
     return {
@@ -58,20 +64,29 @@ def start_interview(data: InterviewStartInput):
     }
 
 
-@router.post("/interview/answer")
-def answer_question(data: AnswerInput):
-    # Load session state
-    state = load_state(data.user_id)
-    if not state:
+async def _prepare_answer(data: AnswerInput):
+    # Resume the session from its last checkpoint
+    session_id = data.session_id or await load_active_session(data.user_id)
+    if not session_id:
         raise HTTPException(status_code=404, detail="Session not found.")
 
-    # Add user answer
-    state["answer"] = data.answer
+    interview_graph = await get_interview_graph()
+    config = thread_config(session_id)
+    snapshot = await interview_graph.aget_state(config)
+    if not snapshot.values:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    if not snapshot.next:
+        raise HTTPException(status_code=409, detail="Interview already finished.")
+
+    state = snapshot.values
     concept = state["curriculum"][state["current_concept_index"]]
-    
-    # Use answer_loop_graph which starts from scoring
-    result = answer_loop_graph.invoke(state)
-    
+
+    # Add user answer and continue from ScoreAnswer
+    await interview_graph.aupdate_state(config, {"answer": data.answer})
+    return session_id, concept
+
+
+async def _finish_answer(session_id, concept, result):
     # Process result
     if isinstance(result, dict) and "state" in result:
         updated_state = result["state"]
@@ -79,28 +94,21 @@ def answer_question(data: AnswerInput):
     #     updated_state = result.state
     else:
         updated_state = result
-        
-    save_state(data.user_id, updated_state)
 
     # Save Q/A to MongoDB
-    save_qa(
+    await save_qa(
         session_id=updated_state["session_id"],
         concept=concept,
-        feedback=updated_state["feedback_history"],
+        feedback=updated_state["feedback_history"][-1] if updated_state["feedback_history"] else None,
         question=updated_state["current_question"],
         answer=updated_state["answer"],
         score=updated_state["score_history"][-1],
         retry=updated_state["retry_count"],
     )
 
-    # If finished, save persona report and return summary
+    # If finished, return the summary (the Persona node saved the report)
     if updated_state.get("done", False):
-        save_persona(
-            session_id=updated_state["user_id"],
-            report_text=updated_state.get("persona_summary", ""),
-            type="interview",
-            #feedback=updated_state["feedback_history"],
-        )
+        await speculative_questions.discard(session_id)
         return {
             "status": "done",
             "final_score": sum(updated_state["score_history"]) // len(updated_state["score_history"]),
@@ -109,7 +117,8 @@ def answer_question(data: AnswerInput):
 
         }
 
-    # Else, return next question
+    # Else, prepare the candidate follow-ups and return next question
+    start_question_speculation(updated_state)
     return {
         "status": "ok",
         "question": updated_state["current_question"],
@@ -118,8 +127,79 @@ def answer_question(data: AnswerInput):
     }
 
 
+@router.post("/interview/start")
+async def start_interview(data: InterviewStartInput):
+    session_id, state = await _prepare_start(data)
+    
+    # Run until the first question; the graph pauses before ScoreAnswer.
+    # durability="exit" persists one checkpoint per turn instead of one per node.
+    interview_graph = await get_interview_graph()
+    result = await interview_graph.ainvoke(state, thread_config(session_id), durability="exit")
+    return await _finish_start(data, session_id, result)
+
+
+@router.post("/interview/answer")
+async def answer_question(data: AnswerInput):
+    session_id, concept = await _prepare_answer(data)
+    interview_graph = await get_interview_graph()
+    result = await interview_graph.ainvoke(None, thread_config(session_id), durability="exit")
+    return await _finish_answer(session_id, concept, result)
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+async def _stream_turn(graph_input, session_id, finish):
+    """
+    Runs one interview turn, yielding Server-Sent Events: `question`, `feedback`
+    and `persona` carry LLM output as it is generated, then `result` carries
+    the same body the non-streaming endpoint returns.
+    """
+    interview_graph = await get_interview_graph()
+    config = thread_config(session_id)
+    config["configurable"][STREAM_TOKENS_KEY] = True
+    try:
+        result = {}
+        async for mode, chunk in interview_graph.astream(
+            graph_input, config, stream_mode=["custom", "values"], durability="exit"
+        ):
+            if mode == "custom":
+                yield _sse(chunk.pop("event"), chunk)
+            else:
+                result = chunk
+        yield _sse("result", await finish(result))
+    except Exception as e:
+        print(f"❌ Error streaming interview turn: {str(e)}")
+        yield _sse("error", {"detail": str(e)})
+
+
+def _event_stream(events):
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/interview/start/stream")
+async def start_interview_stream(data: InterviewStartInput):
+    session_id, state = await _prepare_start(data)
+    return _event_stream(_stream_turn(
+        state, session_id, lambda result: _finish_start(data, session_id, result)
+    ))
+
+
+@router.post("/interview/answer/stream")
+async def answer_question_stream(data: AnswerInput):
+    session_id, concept = await _prepare_answer(data)
+    return _event_stream(_stream_turn(
+        None, session_id, lambda result: _finish_answer(session_id, concept, result)
+    ))
+
+
 @router.get("/persona/{session_id}")
-def get_persona_report(session_id: str):
+async def get_persona_report(session_id: str):
     """
     Retrieve the persona report for a specific session.
     
@@ -136,7 +216,7 @@ def get_persona_report(session_id: str):
             session_obj_id = ObjectId(session_id)
         
         # Find the most recent persona report for this session
-        persona_report = persona_col.find_one(
+        persona_report = await persona_col.find_one(
             {"session_id": session_id},
             sort=[("created_at", -1)]
         )
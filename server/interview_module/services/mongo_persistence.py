@@ -1,8 +1,18 @@
-from interview_module.core.mongo import sessions_col, qa_col, persona_col, lesson_plan
+import os
+from interview_module.core.mongo import sessions_col, persona_col, lesson_plan, lesson_plan_versions
 from datetime import datetime
 from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo import DeleteMany, InsertOne, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from interview_module.services.qa_writer import qa_writer
 
-def create_interview_session(user_id, subject, goal, level,curriculum=None):
+load_dotenv()
+
+# Prior versions of each session's lesson plan kept in lesson_plan_versions (0 disables)
+LESSON_PLAN_VERSIONS_KEPT = int(os.getenv("LESSON_PLAN_VERSIONS_KEPT", "5"))
+
+async def create_interview_session(user_id, subject, goal, level,curriculum=None):
     session = {
         "user_id": user_id,
         "subject": subject,
@@ -12,22 +22,28 @@ def create_interview_session(user_id, subject, goal, level,curriculum=None):
     }
     if curriculum:
         session["curriculum"] = curriculum 
-    result = sessions_col.insert_one(session)
+    result = await sessions_col.insert_one(session)
     return str(result.inserted_id)
 
-def save_qa(session_id,feedback, concept, question, answer, score, retry):
-    qa_col.insert_one({
+async def save_qa(session_id,feedback, concept, question, answer, score, retry):
+    """
+    Queues the Q&A document of one answer turn on the write-behind buffer
+    (see qa_writer.py). `feedback` is this turn's feedback only; the whole
+    history is in the interview state.
+    """
+    await qa_writer.add({
+        "_id": ObjectId(),  # Assigned here so batch retries can't duplicate it
         "session_id": session_id,
         "concept": concept,
         "question": question,
         "answer": answer,
-        "feedback_history": feedback,  # Placeholder for feedback
+        "feedback": feedback,
         "score": score,
         "retry_count": retry,
         "created_at": datetime.utcnow()
     })
 
-def save_persona(session_id, report_text, type="interview"):
+async def save_persona(session_id, report_text, type="interview"):
     # Create a base document
     persona_doc = {
         "session_id": session_id,
@@ -49,53 +65,83 @@ def save_persona(session_id, report_text, type="interview"):
         persona_doc["report_text"] = report_text
     
     # Save to MongoDB
-    persona_col.insert_one(persona_doc)
+    await persona_col.insert_one(persona_doc)
 
-def get_persona_report(user_id, type="interview"):
-    return persona_col.find_one({"user_id": user_id, "type": type}, {"_id": 0})
+async def get_persona_report(user_id, type="interview"):
+    return await persona_col.find_one({"user_id": user_id, "type": type}, {"_id": 0})
 
-def save_curriculum(session_id, curriculum_list):
+async def save_curriculum(session_id, curriculum_list):
     """
     Saves the generated curriculum to an existing session.
     """
-    sessions_col.update_one(
+    await sessions_col.update_one(
         {"_id": ObjectId(session_id)},
         {"$set": {"curriculum": curriculum_list}}
     )
     print(f"Curriculum saved for session {session_id}")
 
-def save_lesson_plan(session_id, lesson_plan_data):
+async def save_lesson_plan(session_id, lesson_plan_data):
     """
     Saves the generated lesson plan and associated data.
+
+    One atomic upsert per session (lesson_plans.session_id is unique, see
+    core/indexes.py), so overlapping generations can't create duplicates.
+    Each save bumps `version`; the plan it replaces is moved to
+    lesson_plan_versions, which keeps the last LESSON_PLAN_VERSIONS_KEPT
+    prior versions of every session.
     """
     try:
-        # Create a new document for the lesson plan
         lesson_plan_doc = {
+            **lesson_plan_data,
             "session_id": session_id,
             "created_at": datetime.utcnow()
         }
-        
-        # Add all the data from lesson_plan_data
-        lesson_plan_doc.update(lesson_plan_data)
-        
-        # Get the correct collection - use lesson_plans (plural)
-        lesson_plans_col = sessions_col.database.lesson_plans
-        
-        # Check if a lesson plan for this session already exists
-        existing_plan = lesson_plans_col.find_one({"session_id": session_id})
-        
-        if existing_plan:
-            # Update existing plan
-            result = lesson_plans_col.update_one(
-                {"session_id": session_id},
-                {"$set": lesson_plan_doc}
+        lesson_plan_doc.pop("_id", None)
+        lesson_plan_doc.pop("version", None)
+
+        # The _id a new plan gets, so the pre-update document (None when new) is all we need back
+        new_id = ObjectId()
+        update = {"$set": lesson_plan_doc, "$inc": {"version": 1}, "$setOnInsert": {"_id": new_id}}
+        try:
+            previous = await lesson_plan.find_one_and_update(
+                {"session_id": session_id}, update, upsert=True, return_document=ReturnDocument.BEFORE
             )
-            return str(existing_plan["_id"])
-        else:
-            # Insert new plan
-            result = lesson_plans_col.insert_one(lesson_plan_doc)
-            return str(result.inserted_id)
+        except DuplicateKeyError:
+            # Lost an upsert race for a new session; the plan exists now, so this updates it
+            previous = await lesson_plan.find_one_and_update(
+                {"session_id": session_id}, update, return_document=ReturnDocument.BEFORE
+            )
+
+        if previous is None:
+            return str(new_id)
+        await _archive_lesson_plan_version(previous)
+        return str(previous["_id"])
     except Exception as e:
         print(f"Exception in save_lesson_plan: {str(e)}")
         raise
 
+async def _archive_lesson_plan_version(previous):
+    """Moves a replaced plan to lesson_plan_versions and prunes old versions, in one round trip."""
+    if LESSON_PLAN_VERSIONS_KEPT <= 0:
+        return
+    version = previous.get("version", 0)  # Plans saved before versioning count as 0
+    version_doc = {key: value for key, value in previous.items() if key != "_id"}
+    version_doc["version"] = version
+    version_doc["lesson_plan_id"] = str(previous["_id"])
+    try:
+        await lesson_plan_versions.bulk_write([
+            InsertOne(version_doc),
+            DeleteMany({
+                "session_id": previous["session_id"],
+                "version": {"$lte": version - LESSON_PLAN_VERSIONS_KEPT},
+            }),
+        ], ordered=False)
+    except Exception as e:
+        # The new plan is saved; only the history entry of the old one is missing
+        print(f"❌ Could not archive lesson plan version {version}: {str(e)}")
+
+async def get_lesson_plan_versions(session_id):
+    """The prior versions of a session's lesson plan, newest first."""
+    return await lesson_plan_versions.find(
+        {"session_id": session_id}, {"_id": 0}
+    ).sort("version", -1).to_list(length=None)
@@ -0,0 +1,188 @@
+"""
+Write-behind buffer for per-answer Q&A documents.
+
+/interview/answer hands its Q&A document to `qa_writer` and responds without
+waiting for MongoDB. A background task writes the buffered documents with
+insert_many once QA_BATCH_SIZE are waiting or every QA_FLUSH_INTERVAL_SECONDS,
+and whatever is left is written on shutdown.
+
+Durability:
+- A document is acknowledged to the user before it is in MongoDB. Documents
+  still buffered when the process is killed without a clean shutdown are lost:
+  at most QA_QUEUE_SIZE of them, normally one flush interval's worth. The
+  interview itself is unaffected, its answers, scores and feedback are also in
+  the graph checkpoint.
+- On shutdown the writer finishes the batch it is writing, then everything
+  still buffered is written.
+- The buffer is bounded. When it is full, save_qa waits for the writer to
+  catch up instead of dropping documents.
+- _ids are assigned when a document is buffered, so retrying a batch that was
+  partly written doesn't duplicate documents, and Q&A order is kept.
+- A batch that still fails after QA_WRITE_RETRIES attempts is logged and
+  counted in `lost`.
+- Readers in this process see their writes: readers of qa_history call
+  flush() first. Another worker can lag by up to one flush interval.
+
+Set QA_WRITE_BEHIND=false to write each document synchronously as before.
+"""
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+from pymongo.errors import BulkWriteError
+from interview_module.core.mongo import qa_col
+
+load_dotenv()
+
+QA_WRITE_BEHIND = os.getenv("QA_WRITE_BEHIND", "true").lower() == "true"
+QA_BATCH_SIZE = int(os.getenv("QA_BATCH_SIZE", "50"))
+QA_FLUSH_INTERVAL_SECONDS = float(os.getenv("QA_FLUSH_INTERVAL_SECONDS", "1.0"))
+QA_QUEUE_SIZE = int(os.getenv("QA_QUEUE_SIZE", "1000"))
+QA_WRITE_RETRIES = int(os.getenv("QA_WRITE_RETRIES", "3"))
+
+DUPLICATE_KEY = 11000
+
+
+class QAWriteBuffer:
+    """Bounded in-process buffer of Q&A documents, written in batches."""
+
+    def __init__(
+        self,
+        collection=qa_col,
+        enabled: bool = QA_WRITE_BEHIND,
+        batch_size: int = QA_BATCH_SIZE,
+        flush_interval: float = QA_FLUSH_INTERVAL_SECONDS,
+        max_queue_size: int = QA_QUEUE_SIZE,
+        retries: int = QA_WRITE_RETRIES,
+        retry_delay: float = 0.2,
+    ):
+        if retries < 1:
+            raise ValueError(f"QA_WRITE_RETRIES must be at least 1, got {retries}")
+        self.collection = collection
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._queue = None
+        self._wake = None
+        self._flush_lock = None
+        self._task = None
+        self._stopping = False
+        self.buffered = 0
+        self.written = 0
+        self.batches = 0
+        self.write_retries = 0
+        self.lost = 0
+        self.largest_batch = 0
+        self.backpressure_waits = 0
+        self.flush_seconds = 0.0
+
+    async def start(self):
+        if self._task:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._wake = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stops the background writer and writes everything still buffered. The
+        writer is asked to exit rather than cancelled, so a batch it is
+        writing is finished first.
+        """
+        if not self._task:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+        await self.flush()
+        if self.lost:
+            print(f"❌ {self.lost} Q&A documents could not be written")
+
+    async def add(self, document):
+        if not self.enabled:
+            await self.collection.insert_one(document)
+            return
+        await self.start()
+        if self._queue.full():
+            self.backpressure_waits += 1
+            self._wake.set()
+        await self._queue.put(document)
+        self.buffered += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    async def flush(self):
+        """Writes everything buffered so far."""
+        if not self._queue:
+            return
+        async with self._flush_lock:
+            while not self._queue.empty():
+                batch = [self._queue.get_nowait() for _ in range(min(self.batch_size, self._queue.qsize()))]
+                # The batch is off the queue: finish writing it even if the caller is cancelled
+                await asyncio.shield(self._write(batch))
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Q&A write-behind flush failed: {str(e)}")
+
+    async def _write(self, batch):
+        start = time.perf_counter()
+        try:
+            for attempt in range(self.retries):
+                try:
+                    await self.collection.insert_many(batch, ordered=False)
+                    self._written(batch)
+                    return
+                except BulkWriteError as e:
+                    # Duplicates are documents an earlier attempt already wrote
+                    errors = [error for error in e.details.get("writeErrors", []) if error.get("code") != DUPLICATE_KEY]
+                    if not errors:
+                        self._written(batch)
+                        return
+                    error = errors[0].get("errmsg")
+                except Exception as e:
+                    error = str(e)
+                if attempt + 1 < self.retries:
+                    self.write_retries += 1
+                    await asyncio.sleep(self.retry_delay * 2 ** attempt)
+            self.lost += len(batch)
+            print(f"❌ Could not write {len(batch)} Q&A documents: {error}")
+        finally:
+            self.flush_seconds += time.perf_counter() - start
+
+    def _written(self, batch):
+        self.written += len(batch)
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "pending": self._queue.qsize() if self._queue else 0,
+            "buffered": self.buffered,
+            "written": self.written,
+            "batches": self.batches,
+            "largest_batch": self.largest_batch,
+            "retries": self.write_retries,
+            "lost": self.lost,
+            "backpressure_waits": self.backpressure_waits,
+            "flush_seconds": round(self.flush_seconds, 3),
+        }
+
+
+qa_writer = QAWriteBuffer()
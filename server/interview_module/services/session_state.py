@@ -1,4 +1,9 @@
-_sessions = {}
+from interview_module.services.session_store import build_session_store
+
+# Backend is chosen with SESSION_STORE_BACKEND (memory | mongo | redis).
+# The interview state itself lives in the graph checkpointer; the store only
+# remembers each user's active session.
+session_store = build_session_store()
 
 def init_state(data):
     return {
@@ -6,6 +11,7 @@ def init_state(data):
         "subject": data.subject,
         "goal": data.goal,
         "level": data.level,
+        "refresh_curriculum": data.refresh_curriculum,
         "curriculum": [],
         "current_concept_index": 0,
         "current_question": "",
@@ -18,8 +24,9 @@ def init_state(data):
         "feedback_history": [],
     }
 
-def save_state(user_id, state):
-    _sessions[user_id] = state
+async def save_active_session(user_id, session_id):
+    await session_store.set(user_id, {"session_id": session_id})
 
-def load_state(user_id):
-    return _sessions.get(user_id)
+async def load_active_session(user_id):
+    active = await session_store.get(user_id)
+    return active["session_id"] if active else None
@@ -0,0 +1,203 @@
+import json
+import os
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from bson.binary import Binary
+from interview_module.core.cache import LRUTTLCache
+
+load_dotenv()
+
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "memory")  # memory | mongo | redis
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", str(6 * 3600)))
+SESSION_STORE_MAX_SIZE = int(os.getenv("SESSION_STORE_MAX_SIZE", "10000"))
+SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+
+
+def _to_jsonable(value):
+    # PersonaSummary and other Pydantic models stored in the state
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
+
+
+def serialize_state(state) -> bytes:
+    """Compact wire format for an interview state: minified JSON, zlib-compressed."""
+    if hasattr(state, "model_dump"):
+        state = state.model_dump()
+    payload = json.dumps(state, separators=(",", ":"), default=_to_jsonable)
+    return zlib.compress(payload.encode("utf-8"))
+
+
+def deserialize_state(data: bytes):
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+class SessionStore(ABC):
+    """
+    Interface for interview state storage. Implementations store serialized
+    states so every backend behaves the same (no shared mutable objects).
+    """
+
+    def __init__(self):
+        self.reads = 0
+        self.hits = 0
+        self.writes = 0
+        self.deletes = 0
+
+    async def get(self, key: str):
+        self.reads += 1
+        data = await self._get(key)
+        if data is None:
+            return None
+        self.hits += 1
+        return deserialize_state(data)
+
+    async def set(self, key: str, state):
+        self.writes += 1
+        await self._set(key, serialize_state(state))
+
+    async def delete(self, key: str):
+        self.deletes += 1
+        await self._delete(key)
+
+    @abstractmethod
+    async def _get(self, key):
+        """The stored bytes for `key`, or None if missing or expired."""
+
+    @abstractmethod
+    async def _set(self, key, data):
+        """Stores `data` (bytes) under `key` with the store's TTL."""
+
+    @abstractmethod
+    async def _delete(self, key):
+        """Removes `key`; a missing key is not an error."""
+
+    @abstractmethod
+    async def size(self):
+        """Number of stored sessions, reported in stats()."""
+
+    async def stats(self):
+        return {
+            "backend": type(self).__name__,
+            "size": await self.size(),
+            "reads": self.reads,
+            "hits": self.hits,
+            "misses": self.reads - self.hits,
+            "writes": self.writes,
+            "deletes": self.deletes,
+        }
+
+
+class InMemorySessionStore(SessionStore):
+    """Single-process store with LRU eviction and a sliding TTL."""
+
+    def __init__(self, max_size: int = SESSION_STORE_MAX_SIZE, ttl_seconds: float = SESSION_TTL_SECONDS):
+        super().__init__()
+        self._cache = LRUTTLCache(max_size=max_size, ttl_seconds=ttl_seconds, sliding=True)
+
+    async def _get(self, key):
+        return self._cache.get(key)
+
+    async def _set(self, key, data):
+        self._cache.set(key, data)
+
+    async def _delete(self, key):
+        self._cache.delete(key)
+
+    async def size(self):
+        return len(self._cache)
+
+    async def stats(self):
+        stats = await super().stats()
+        stats["evictions"] = self._cache.evictions
+        stats["max_size"] = self._cache.max_size
+        return stats
+
+
+class MongoSessionStore(SessionStore):
+    """
+    Shared store in a Mongo collection. Reads and writes push `expires_at`
+    forward (sliding TTL); expired documents are removed by a TTL index on
+    `expires_at` and ignored on read until then.
+    """
+
+    def __init__(self, collection, ttl_seconds: float = SESSION_TTL_SECONDS):
+        super().__init__()
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self._index_ready = False
+
+    async def _ensure_index(self):
+        if not self._index_ready:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+            self._index_ready = True
+
+    async def _get(self, key):
+        now = datetime.utcnow()
+        doc = await self.collection.find_one_and_update(
+            {"_id": key, "expires_at": {"$gt": now}},
+            {"$set": {"expires_at": now + timedelta(seconds=self.ttl_seconds)}},
+            projection={"data": 1},
+        )
+        return bytes(doc["data"]) if doc else None
+
+    async def _set(self, key, data):
+        await self._ensure_index()
+        await self.collection.replace_one(
+            {"_id": key},
+            {"data": Binary(data), "expires_at": datetime.utcnow() + timedelta(seconds=self.ttl_seconds)},
+            upsert=True,
+        )
+
+    async def _delete(self, key):
+        await self.collection.delete_one({"_id": key})
+
+    async def size(self):
+        return await self.collection.estimated_document_count()
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Shared store for any Redis-protocol server. Pass `client` to use an existing
+    redis.asyncio-compatible client (e.g. a local stand-in such as fakeredis).
+    Reads refresh the key's TTL with GETEX (Redis 6.2+), so the TTL slides.
+    """
+
+    def __init__(self, url: str = SESSION_REDIS_URL, ttl_seconds: float = SESSION_TTL_SECONDS,
+                 client=None, prefix: str = "viveka:session:"):
+        super().__init__()
+        if client is None:
+            import redis.asyncio as redis  # optional dependency
+
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    async def _get(self, key):
+        return await self.client.getex(self.prefix + key, ex=int(self.ttl_seconds))
+
+    async def _set(self, key, data):
+        await self.client.set(self.prefix + key, data, ex=int(self.ttl_seconds))
+
+    async def _delete(self, key):
+        await self.client.delete(self.prefix + key)
+
+    async def size(self):
+        # SCAN walks the keyspace without blocking the server; only /stats calls this
+        count = 0
+        async for _ in self.client.scan_iter(match=self.prefix + "*", count=1000):
+            count += 1
+        return count
+
+
+def build_session_store(backend: str = SESSION_STORE_BACKEND):
+    if backend == "mongo":
+        from interview_module.core.mongo import db
+
+        return MongoSessionStore(db["interview_state"])
+    if backend == "redis":
+        return RedisSessionStore()
+    return InMemorySessionStore()
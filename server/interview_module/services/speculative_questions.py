@@ -0,0 +1,164 @@
+import asyncio
+import os
+from dotenv import load_dotenv
+from langchain_core.callbacks import get_usage_metadata_callback
+from interview_module.services.session_state import session_store
+from interview_module.core.llm import llm_priority, BACKGROUND
+
+load_dotenv()
+
+SPECULATIVE_QUESTIONS = os.getenv("SPECULATIVE_QUESTIONS", "true").lower() == "true"
+
+
+def _total_tokens(usage_callback):
+    return sum(usage.get("total_tokens", 0) for usage in usage_callback.usage_metadata.values())
+
+
+class SpeculativeQuestions:
+    """
+    Pre-generates the questions an answer turn may need while the user is
+    still answering: one for retrying the current concept and one for the next
+    concept. Candidates are stored with the session in the session store and
+    served by the AskQuestion nodes when the decision matches a branch.
+    """
+
+    def __init__(self, enabled: bool = SPECULATIVE_QUESTIONS):
+        self.enabled = enabled
+        self._pending = {}
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.generated_tokens = 0
+        self.wasted_tokens = 0
+        self.failures = 0
+
+    @staticmethod
+    def _key(session_id):
+        return f"speculative:{session_id}"
+
+    def start(self, state, generate, branches):
+        """
+        Starts background generation for each (concept_index, retry_count)
+        branch using the question node `generate`.
+        """
+        if not self.enabled or not state.session_id or not branches:
+            return
+        previous = self._pending.pop(state.session_id, None)
+        if previous:
+            previous.cancel()
+        self.started += 1
+        task = asyncio.create_task(self._run(state, generate, branches))
+        self._pending[state.session_id] = task
+        task.add_done_callback(lambda t, sid=state.session_id: self._forget(sid, t))
+
+    def _forget(self, session_id, task):
+        if self._pending.get(session_id) is task:
+            del self._pending[session_id]
+
+    async def _generate_branch(self, state, generate, concept_index, retry_count):
+        branch_state = state.model_copy(update={
+            "current_concept_index": concept_index,
+            "retry_count": retry_count,
+        })
+        with get_usage_metadata_callback() as usage, llm_priority(BACKGROUND):
+            update = await generate(branch_state)
+        return {
+            "concept_index": concept_index,
+            "retry_count": retry_count,
+            "update": update,
+            "tokens": _total_tokens(usage),
+        }
+
+    async def _run(self, state, generate, branches):
+        results = await asyncio.gather(
+            *(self._generate_branch(state, generate, index, retry) for index, retry in branches),
+            return_exceptions=True,
+        )
+        candidates = []
+        for result in results:
+            if isinstance(result, Exception):
+                self.failures += 1
+                print(f"❌ Speculative question failed: {str(result)}")
+                continue
+            self.generated_tokens += result["tokens"]
+            candidates.append(result)
+        if candidates:
+            await session_store.set(self._key(state.session_id), {"candidates": candidates})
+
+    async def take(self, state):
+        """
+        Returns the stored question update for the state's concept and retry
+        count, or None. Waits for an in-flight speculation for this session so
+        its work is not duplicated. Unused candidates count as wasted tokens.
+        """
+        if not self.enabled or not state.session_id:
+            return None
+        pending = self._pending.get(state.session_id)
+        if pending:
+            await asyncio.wait([pending])
+
+        stored = await session_store.get(self._key(state.session_id))
+        if not stored:
+            return None
+        await session_store.delete(self._key(state.session_id))
+
+        match = None
+        for candidate in stored["candidates"]:
+            if (candidate["concept_index"] == state.current_concept_index
+                    and candidate["retry_count"] == state.retry_count and match is None):
+                match = candidate
+            else:
+                self.wasted_tokens += candidate["tokens"]
+        if match is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return match["update"]
+
+    async def discard(self, session_id):
+        """Drops any speculation for a finished session, counting it as wasted."""
+        pending = self._pending.pop(session_id, None)
+        if pending:
+            pending.cancel()
+        stored = await session_store.get(self._key(session_id))
+        if stored:
+            await session_store.delete(self._key(session_id))
+            self.wasted_tokens += sum(candidate["tokens"] for candidate in stored["candidates"])
+
+    async def stop(self):
+        for task in list(self._pending.values()):
+            task.cancel()
+        await asyncio.gather(*self._pending.values(), return_exceptions=True)
+        self._pending.clear()
+
+    def stats(self):
+        served = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "started": self.started,
+            "in_flight": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / served if served else 0.0,
+            "failures": self.failures,
+            "generated_tokens": self.generated_tokens,
+            "wasted_tokens": self.wasted_tokens,
+        }
+
+
+speculative_questions = SpeculativeQuestions()
+
+
+def serve_speculative(generate):
+    """
+    Wraps a question node so a matching pre-generated question is served
+    instead of calling the LLM.
+    """
+    async def node(state):
+        update = await speculative_questions.take(state)
+        if update is not None:
+            print(f"✅ Served speculative question for concept {state.current_concept_index}")
+            return update
+        return await generate(state)
+
+    return node
@@ -1,24 +1,13 @@
-# interview_module/core/mongo.py
-from pymongo.mongo_client import MongoClient
-import os
-import certifi
-from dotenv import load_dotenv
-
-load_dotenv()
-
-uri = os.getenv("MONGO_URI")
-
-client = MongoClient(uri,tlsCAFile=certifi.where(),
-    serverSelectionTimeoutMS=5000 )
-
-try:
-    client.admin.command('ping')
-    print("✅ Successfully connected to MongoDB!")
-except Exception as e:
-    print("❌ MongoDB connection error:", e)
-
-db = client["interview_ai"]  # Your MongoDB database name
-sessions_col = db["interview_sessions"]
-qa_col = db["qa_history"]
-persona_col = db["persona_reports"]
-lesson_plans = db["lesson_plans"]
\ No newline at end of file
+# The lesson plan module shares the interview module's client and connection
+# pool; see interview_module/core/mongo.py for its settings.
+from interview_module.core.mongo import (
+    MONGO_PROVIDER,
+    client,
+    db,
+    ping,
+    sessions_col,
+    qa_col,
+    persona_col,
+    lesson_plan as lesson_plans,
+    lesson_plan_versions,
+)
@@ -1,13 +1,16 @@
 # core/mongo_fetch.py
 
-from interview_module.core.mongo import sessions_col, qa_col, persona_col
+from lesson_plan_module.core.mongo import MONGO_PROVIDER, sessions_col, qa_col, persona_col
 from bson.objectid import ObjectId
+from interview_module.services.qa_writer import qa_writer
 
-def fetch_session_details(session_id: str):
+async def fetch_session_details(session_id: str):
     """
     Fetches subject, goal, and level for a given session ID.
     """
-    session = sessions_col.find_one({"_id": ObjectId(session_id)})
+    session = await sessions_col.find_one(
+        {"_id": ObjectId(session_id)}, {"subject": 1, "goal": 1, "level": 1}
+    )
     if session:
         return {
             "subject": session.get("subject"),
@@ -16,28 +19,29 @@ def fetch_session_details(session_id: str):
         }
     return None
 
-def fetch_curriculum_generated(session_id: str):
+async def fetch_curriculum_generated(session_id: str):
     """
     Fetches the curriculum generated for a given session ID.
     Note: The curriculum is stored within the 'sessions_col' document itself,
     as observed in the workflow output (`output till persona RAW.txt`).
     """
-    session = sessions_col.find_one({"_id": ObjectId(session_id)})
+    session = await sessions_col.find_one({"_id": ObjectId(session_id)}, {"curriculum": 1})
     if session and "curriculum" in session:
         return session.get("curriculum")
     return []
 
-def fetch_feedback_history(session_id: str):
+async def fetch_feedback_history(session_id: str):
     """
     Fetches the feedback history (questions, answers, scores, feedback)
     for a given session ID.
     """
     # Assuming feedback, questions, answers, and scores are stored together
     # in qa_col, as implied by score.py where all are appended.
+    await qa_writer.flush()  # Include answers still in the write-behind buffer
     feedback_entries = qa_col.find({"session_id": session_id}).sort("created_at", 1)
     
     history = []
-    for entry in feedback_entries:
+    async for entry in feedback_entries:
         history.append({
             "question": entry.get("question"),
             "answer": entry.get("answer"),
@@ -47,35 +51,135 @@ def fetch_feedback_history(session_id: str):
         })
     return history
 
-def fetch_persona_summary(user_id: str):
+async def fetch_persona_summary(user_id: str):
     """
     Fetches the latest persona summary for a given user ID.
     """
     # Assuming the persona is saved per user and you want the latest one
-    persona = persona_col.find_one({"user_id": user_id}, sort=[("created_at", -1)])
+    persona = await persona_col.find_one({"user_id": user_id}, sort=[("created_at", -1)])
     if persona:
         # Exclude MongoDB's internal '_id' field if not needed in the output
         persona.pop("_id", None)
         return persona
     return None
 
-def fetch_all_session_data(session_id: str, user_id: str):
+# Session fields and Q&A fields the lesson plan pipeline reads
+SESSION_FIELDS = ("user_id", "subject", "goal", "level", "curriculum")
+QA_FIELDS = ("concept", "question", "answer", "feedback", "score", "retry_count", "created_at")
+
+
+def _session_lookup(collection, stages, as_field):
+    """$lookup of `collection` documents whose session_id is this session's key."""
+    return {"$lookup": {
+        "from": collection.name,
+        "let": {"session_key": "$session_key"},
+        "pipeline": [{"$match": {"$expr": {"$eq": ["$session_id", "$$session_key"]}}}, *stages],
+        "as": as_field,
+    }}
+
+
+def session_bundle_pipeline(session_id: str):
     """
-    Fetches all requested modular data for a given session and user ID.
+    One aggregation over interview_sessions that joins the session's Q&A
+    history (oldest first, only QA_FIELDS) and its latest persona report.
+    Both are stored with the session id as a string, hence the $toString join
+    key; the lookups use the session_id indexes (see
+    interview_module/core/indexes.py).
     """
-    session_details = fetch_session_details(session_id)
-    curriculum = fetch_curriculum_generated(session_id)
-    feedback_history = fetch_feedback_history(session_id)
-    persona_summary = fetch_persona_summary(user_id) # Persona is tied to user_id, not session_id directly in save_persona
+    return [
+        {"$match": {"_id": ObjectId(session_id)}},
+        {"$project": {**{field: 1 for field in SESSION_FIELDS}, "session_key": {"$toString": "$_id"}}},
+        _session_lookup(qa_col, [
+            {"$sort": {"created_at": 1}},
+            {"$project": {field: 1 for field in QA_FIELDS}},
+        ], "qa_history"),
+        _session_lookup(persona_col, [
+            {"$sort": {"created_at": -1}},
+            {"$limit": 1},
+        ], "persona_reports"),
+        {"$project": {"session_key": 0}},
+    ]
+
+
+async def _fetch_session_bundle_by_queries(session_id: str):
+    """
+    The same bundle from three queries, for the mongomock provider, which
+    doesn't implement $lookup with let/pipeline.
+    """
+    session = await sessions_col.find_one({"_id": ObjectId(session_id)}, {field: 1 for field in SESSION_FIELDS})
+    if not session:
+        return None
+    qa_history = qa_col.find({"session_id": session_id}, {field: 1 for field in QA_FIELDS}).sort("created_at", 1)
+    persona_report = await persona_col.find_one({"session_id": session_id}, sort=[("created_at", -1)])
+    return {
+        **session,
+        "qa_history": await qa_history.to_list(length=None),
+        "persona_reports": [persona_report] if persona_report else [],
+    }
+
+
+async def fetch_session_bundle(session_id: str):
+    """
+    Loads a session with its Q&A history (oldest first) and latest persona
+    report in one round trip. Returns None if the session doesn't exist;
+    raises bson.errors.InvalidId for a malformed id.
+    """
+    await qa_writer.flush()  # Include answers still in the write-behind buffer
+    if MONGO_PROVIDER == "mock":
+        bundle = await _fetch_session_bundle_by_queries(session_id)
+    else:
+        bundles = await sessions_col.aggregate(session_bundle_pipeline(session_id)).to_list(length=1)
+        bundle = bundles[0] if bundles else None
+    if not bundle:
+        return None
+    bundle["_id"] = str(bundle["_id"])
+
+    for qa in bundle["qa_history"]:
+        qa["_id"] = str(qa["_id"])
+
+    persona_reports = bundle.pop("persona_reports")
+    persona_report = persona_reports[0] if persona_reports else None
+    if persona_report:
+        persona_report["_id"] = str(persona_report["_id"])
+    bundle["persona_report"] = persona_report
+    return bundle
+
+
+async def fetch_all_session_data(session_id: str):
+    """
+    Fetches all requested modular data for a given session in one round trip.
+    Persona reports are saved per session by the Persona node, so the latest
+    one of this session is returned.
+    """
+    bundle = await fetch_session_bundle(session_id)
+    if not bundle:
+        return None
+
+    persona_summary = bundle["persona_report"]
+    if persona_summary:
+        persona_summary.pop("_id", None)
 
     return {
-        "session_details": session_details,
-        "curriculum_generated": curriculum,
-        "feedback_history": feedback_history,
+        "session_details": {
+            "subject": bundle.get("subject"),
+            "goal": bundle.get("goal"),
+            "level": bundle.get("level")
+        },
+        "curriculum_generated": bundle.get("curriculum", []),
+        "feedback_history": [
+            {
+                "question": qa.get("question"),
+                "answer": qa.get("answer"),
+                "score": qa.get("score"),
+                "feedback": qa.get("feedback"),
+                "retry_count": qa.get("retry_count")
+            }
+            for qa in bundle["qa_history"]
+        ],
         "persona_summary": persona_summary
     }
 
-def fetch_lesson_plan(session_id: str):
+async def fetch_lesson_plan(session_id: str):
     """
     Fetches the saved lesson plan for a given session ID.
     """
@@ -83,7 +187,7 @@ def fetch_lesson_plan(session_id: str):
     lesson_plans_col = sessions_col.database.lesson_plans
     
     # Find the lesson plan for this session
-    lesson_plan = lesson_plans_col.find_one({"session_id": session_id})
+    lesson_plan = await lesson_plans_col.find_one({"session_id": session_id})
     
     if lesson_plan:
         # Convert ObjectId to string for JSON serialization
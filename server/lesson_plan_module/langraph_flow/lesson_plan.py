@@ -1,14 +1,13 @@
 from langgraph.graph import StateGraph, END
+from interview_module.core.instrumentation import instrument_node
 # Ensure these imports point to your files
-from lesson_plan_module.langraph_flow.nodes.lesson_plan_generator import generate_lesson_plan
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_repair import regenerate_lesson_plan, repair_chapters
 from lesson_plan_module.langraph_flow.nodes.lesson_plan_evaluator import validate_lesson_plan 
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_structure import MAX_RETRIES, prevalidate_lesson_plan
 
 from pydantic import BaseModel, Field
 from typing import List, Literal, Optional, Dict, Any, Union
 
-# Define maximum retries as a constant
-MAX_RETRIES = 3  # Must match the value in lesson_plan_evaluator.py
-
 class LessonPlanInput(BaseModel):
     subject: str = Field(..., description="The subject user wants to study")
     goal: str = Field(..., description="The main goal user wants to achieve by studying the subject")
@@ -32,6 +31,10 @@ class LessonPlanInput(BaseModel):
     # Retry counter
     retry_count: int = Field(0, description="Counter for retry attempts")
 
+    # Targeted repair: retry rounds rewrite only the chapters blamed for a "Bad" grade
+    chapters_to_revise: List[int] = Field(default_factory=list, description="1-based chapters to rewrite on retry; empty means regenerate the whole plan")
+    revised_chapters: List[int] = Field(default_factory=list, description="Chapters rewritten by the last repair, re-checked on their own")
+
 
 def check_retry_limit(state):
     """Check if we've reached the maximum number of retries."""
@@ -49,8 +52,10 @@ def route_after_validation(state):
 
 
 def check_retry_status(state):
-    """Determine whether to continue retrying or stop."""
+    """Determine whether to repair chapters, regenerate the plan or stop."""
     if state.retry_count < MAX_RETRIES:
+        if state.lesson_plan and 0 < len(state.chapters_to_revise) < len(state.lesson_plan.chapters):
+            return "repair"
         return "continue"
     else:
         # Add a final note about reaching retry limit
@@ -64,15 +69,29 @@ def lesson_plan_graph():
     builder = StateGraph(LessonPlanInput)
 
     # Add nodes
-    builder.add_node("GenerateLessonPlan", generate_lesson_plan)
-    builder.add_node("ValidateLessonPlan", validate_lesson_plan)
-    builder.add_node("CheckRetries", check_retry_limit)
+    builder.add_node("GenerateLessonPlan", instrument_node("GenerateLessonPlan", regenerate_lesson_plan))
+    builder.add_node("RepairChapters", instrument_node("RepairChapters", repair_chapters))
+    builder.add_node("PrevalidateLessonPlan", instrument_node("PrevalidateLessonPlan", prevalidate_lesson_plan))
+    builder.add_node("ValidateLessonPlan", instrument_node("ValidateLessonPlan", validate_lesson_plan))
+    builder.add_node("CheckRetries", instrument_node("CheckRetries", check_retry_limit))
 
     # Set entry point
     builder.set_entry_point("GenerateLessonPlan")
     
     # Add edges
-    builder.add_edge("GenerateLessonPlan", "ValidateLessonPlan")
+    builder.add_edge("GenerateLessonPlan", "PrevalidateLessonPlan")
+    builder.add_edge("RepairChapters", "PrevalidateLessonPlan")
+
+    # Mechanical checks run first; only structurally sound plans reach the LLM evaluator
+    builder.add_conditional_edges(
+        "PrevalidateLessonPlan",
+        lambda state: state.next_step,
+        {
+            "evaluate": "ValidateLessonPlan",
+            "retry": "CheckRetries",
+            "valid": END
+        },
+    )
 
     # Add conditional edge from validation
     builder.add_conditional_edges(
@@ -90,6 +109,7 @@ def lesson_plan_graph():
         check_retry_status,  # Use the helper function
         {
             "continue": "GenerateLessonPlan",
+            "repair": "RepairChapters",
             "stop": END
         },
     )
@@ -1,4 +1,6 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from interview_module.core.llm import get_chat_model, gated_llm, BACKGROUND
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_repair import failing_criteria, plan_outline
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_structure import MAX_RETRIES
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
@@ -7,13 +9,14 @@ import json
 import re
 
 # Initialize LLM with lower temperature for more consistent evaluations
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", temperature=0.1)
+llm = gated_llm(get_chat_model().bind(generation_config={"temperature": 0.1}), BACKGROUND)
 
 class LessonPlanEvaluation(BaseModel):
     """Structured evaluation of a lesson plan."""
     grade: Literal["Good", "Bad"] = Field(..., description="Overall grade of the lesson plan")
     feedback: str = Field(..., description="Comprehensive feedback on the lesson plan")
     evaluation_metrics: Dict[str, Dict[str, Any]] = Field(..., description="Detailed metrics for each evaluation criterion")
+    chapters_to_revise: List[int] = Field(default_factory=list, description="Numbers (1-based) of the chapters causing the low scores. Empty if the plan is Good or the problems concern the whole plan")
 
 # Create evaluation prompt template
 EVALUATION_PROMPT = """
@@ -34,6 +37,8 @@ You are an expert educational evaluator specializing in personalized curriculum
 {lesson_plan_text}
 
 ## EVALUATION CRITERIA
+The chapter count (2-7), non-empty outcomes and time arithmetic (chapter totals and total hours)
+have already been verified automatically; judge the qualitative aspects below.
 Evaluate the lesson plan on these key dimensions, assigning a score (1-10) and providing specific comments:
 
 1.  **Total Hour Match:**
@@ -41,7 +46,7 @@ Evaluate the lesson plan on these key dimensions, assigning a score (1-10) and p
     - Score: 1 (insufficient time) to 10 (perfectly appropriate)
 
 2.  **Topic Structure:**
-    - Are there 2-7 main chapters with appropriate sub-topics?
+    - Are the chapters and their sub-topics well chosen and well grouped?
     - Score: 1 (poor structure) to 10 (excellent structure)
 
 3.  **Syllabus Coverage:**
@@ -76,6 +81,47 @@ Provide actionable feedback explaining:
 3.  How the plan could better address the learner's specific needs
 4.  How to improve any low-scoring areas
 
+If the plan is "Bad" and the problems are confined to particular chapters (their content,
+sub-topics or time allocation), list those chapter numbers in `chapters_to_revise` so only
+they are rewritten. Leave it empty when the whole plan needs rethinking, e.g. the wrong
+overall scope or choice of chapters.
+
+## IMPORTANT: YOUR RESPONSE FORMAT
+{format_instructions}
+"""
+
+# Re-check after a chapter repair: only the rewritten chapters are reviewed in full
+REVISION_REVIEW_PROMPT = """
+# LESSON PLAN EVALUATOR: REVISED CHAPTERS
+
+You are an expert educational evaluator. You previously graded this lesson plan "Bad".
+Some chapters have since been rewritten; decide whether the rewrite fixed the problems.
+
+## CONTEXT
+- **Subject:** {subject}
+- **Goal:** {goal}
+- **Learner Level:** {level}
+
+## LEARNER PROFILE
+{persona_summary}
+
+## YOUR PREVIOUS FEEDBACK
+{feedback}
+
+## CRITERIA THAT SCORED BELOW 7
+{failing_criteria}
+
+## PLAN OUTLINE (unchanged chapters were already reviewed)
+{outline}
+
+## REWRITTEN CHAPTERS
+{revised_chapters}
+
+## GRADING
+Score each criterion listed above again (1-10) in `evaluation_metrics`, using the same
+names. Grade "Good" if every one of them now scores 7 or more, otherwise "Bad", listing the
+chapters that still need work in `chapters_to_revise`.
+
 ## IMPORTANT: YOUR RESPONSE FORMAT
 {format_instructions}
 """
@@ -151,7 +197,29 @@ def format_lesson_plan_text(lesson_plan: Union[str, BaseModel, Dict[str, Any]])
     except Exception as e:
         return f"Error formatting lesson plan: {str(e)}\n{str(lesson_plan)}"
 
-def validate_lesson_plan(state: BaseModel) -> str:
+def format_revision_review(state, persona_summary, parser) -> str:
+    """The re-check prompt for a plan whose `revised_chapters` were just rewritten."""
+    plan = state.lesson_plan
+    revised_chapters = "\n\n".join(
+        f"### Chapter {number}\n{plan.chapters[number - 1].model_dump_json(indent=2)}"
+        for number in state.revised_chapters
+    )
+    review_prompt = ChatPromptTemplate.from_template(
+        REVISION_REVIEW_PROMPT,
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    return review_prompt.format(
+        subject=state.subject,
+        goal=state.goal,
+        level=state.level,
+        persona_summary=persona_summary,
+        feedback=state.feedback or "None",
+        failing_criteria=failing_criteria(state.evaluation_metrics),
+        outline=plan_outline(plan),
+        revised_chapters=revised_chapters,
+    )
+
+async def validate_lesson_plan(state: BaseModel) -> str:
     """
     LangGraph node to evaluate the generated lesson plan.
     Updates the state with evaluation results and returns a routing string.
@@ -169,9 +237,6 @@ def validate_lesson_plan(state: BaseModel) -> str:
     # Increment the retry counter
     state.retry_count += 1
     
-    # Set maximum retries
-    MAX_RETRIES = 3  # Adjust as needed
-    
     # Check if lesson plan was generated successfully
     if not hasattr(state, "lesson_plan") or not state.lesson_plan:
         state.grade = "Bad"
@@ -206,29 +271,33 @@ def validate_lesson_plan(state: BaseModel) -> str:
             else:
                 curriculum = str(state.taken_test_curriculum)
         
-        # Format lesson plan for evaluation
-        lesson_plan_text = format_lesson_plan_text(state.lesson_plan)
-        
         # Initialize Pydantic parser for the evaluation response
         parser = PydanticOutputParser(pydantic_object=LessonPlanEvaluation)
 
-        # Create prompt for evaluation
-        evaluation_prompt = ChatPromptTemplate.from_template(
-            EVALUATION_PROMPT,
-            partial_variables={"format_instructions": parser.get_format_instructions()}
-        )
-        
-        formatted_prompt = evaluation_prompt.format(
-            subject=state.subject,
-            goal=state.goal,
-            level=state.level,
-            curriculum=curriculum,
-            persona_summary=persona_summary,
-            lesson_plan_text=lesson_plan_text
-        )
+        if state.revised_chapters:
+            # After a chapter repair only the rewritten chapters need a full review
+            formatted_prompt = format_revision_review(state, persona_summary, parser)
+        else:
+            # Format lesson plan for evaluation
+            lesson_plan_text = format_lesson_plan_text(state.lesson_plan)
+
+            # Create prompt for evaluation
+            evaluation_prompt = ChatPromptTemplate.from_template(
+                EVALUATION_PROMPT,
+                partial_variables={"format_instructions": parser.get_format_instructions()}
+            )
+
+            formatted_prompt = evaluation_prompt.format(
+                subject=state.subject,
+                goal=state.goal,
+                level=state.level,
+                curriculum=curriculum,
+                persona_summary=persona_summary,
+                lesson_plan_text=lesson_plan_text
+            )
         
         # Generate evaluation
-        response = llm.invoke(formatted_prompt)
+        response = await llm.ainvoke(formatted_prompt)
         
         # --- Robust JSON Parsing (as LLMs can sometimes add conversational text) ---
         evaluation_data = None
@@ -251,7 +320,15 @@ def validate_lesson_plan(state: BaseModel) -> str:
             # Update state with evaluation results from the parsed Pydantic object
             state.grade = evaluation_data.grade
             state.feedback = evaluation_data.feedback
-            state.evaluation_metrics = evaluation_data.evaluation_metrics
+            if state.revised_chapters:
+                # Re-scored criteria replace their previous scores
+                state.evaluation_metrics = {**(state.evaluation_metrics or {}), **evaluation_data.evaluation_metrics}
+            else:
+                state.evaluation_metrics = evaluation_data.evaluation_metrics
+            chapter_count = len(state.lesson_plan.chapters)
+            state.chapters_to_revise = sorted(
+                {n for n in evaluation_data.chapters_to_revise if 1 <= n <= chapter_count}
+            ) if state.grade == "Bad" else []
         else:
             # Fallback if parsing completely fails
             state.grade = "Bad"
@@ -268,6 +345,9 @@ def validate_lesson_plan(state: BaseModel) -> str:
         state.next_step = "retry"
         return state # Error during evaluation, means invalid
 
+    finally:
+        state.revised_chapters = []
+
     # Determine routing based on grade
     if state.grade == "Good":
         #state.lesson_plan = state.lesson_plan
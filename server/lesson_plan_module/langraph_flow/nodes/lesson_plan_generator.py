@@ -1,11 +1,11 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from interview_module.core.llm import get_chat_model, gated_llm, BACKGROUND
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any, Literal, Union
 
 # Initialize LLM
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", temperature=0.2)
+llm = gated_llm(get_chat_model().bind(generation_config={"temperature": 0.2}), BACKGROUND)
 
 # Define Pydantic models for structured output
 class SubTopic(BaseModel):
@@ -37,6 +37,9 @@ class LessonPlanModule(BaseModel):
 # Create parser once
 parser = PydanticOutputParser(pydantic_object=LessonPlanModule)
 
+# Bump whenever the generator or evaluator prompts change, so cached lesson plans are regenerated
+PROMPT_VERSION = 3
+
 # Define the improved prompt template
 LESSON_PLAN_PROMPT = """
 # PERSONALIZED LESSON PLAN CREATOR
@@ -122,7 +125,7 @@ def format_list_or_string(data: Union[List, str, None], default: str = "None ava
         
     return str(data)
 
-def generate_lesson_plan(state):
+async def generate_lesson_plan(state):
     """
     Generate a personalized lesson plan based on the state data.
     Designed for direct integration with LangGraph.
@@ -150,8 +153,7 @@ def generate_lesson_plan(state):
         )
         
         # Generate the lesson plan using the LLM
-        response = llm.invoke(formatted_prompt)
-        print("Raw LLM response:", response.content)
+        response = await llm.ainvoke(formatted_prompt)
         
         # Parse the structured output
         lesson_plan = parser.parse(response.content)
@@ -169,7 +171,7 @@ def generate_lesson_plan(state):
     return state
 
 # For direct use outside of LangGraph (e.g., API endpoints)
-def generate_lesson_plan_from_data(data: Dict[str, Any]) -> LessonPlanModule:
+async def generate_lesson_plan_from_data(data: Dict[str, Any]) -> LessonPlanModule:
     """
     Generate a lesson plan from raw dictionary data.
     
@@ -190,7 +192,7 @@ def generate_lesson_plan_from_data(data: Dict[str, Any]) -> LessonPlanModule:
         setattr(state, key, value)
     
     # Use the main function
-    result_state = generate_lesson_plan(state)
+    result_state = await generate_lesson_plan(state)
     
     # Return just the lesson plan
     if hasattr(result_state, "error"):
@@ -0,0 +1,143 @@
+from interview_module.core.llm import get_chat_model, gated_llm, BACKGROUND
+from langchain.prompts import ChatPromptTemplate
+from langchain.output_parsers import PydanticOutputParser
+from pydantic import BaseModel, Field
+from typing import List
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_generator import (
+    Chapter,
+    LessonPlanModule,
+    format_list_or_string,
+    format_persona_summary,
+    generate_lesson_plan,
+)
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_structure import STRUCTURAL_CRITERION
+
+llm = gated_llm(get_chat_model().bind(generation_config={"temperature": 0.2}), BACKGROUND)
+
+# full: whole plans generated, targeted: chapter-level repairs, chapters: chapters they rewrote,
+# fallbacks: repairs that fell back to a full generation
+repair_stats = {"full": 0, "targeted": 0, "chapters": 0, "fallbacks": 0}
+
+
+class ChapterRevision(BaseModel):
+    """Replacement chapters, in the order they were requested."""
+    chapters: List[Chapter] = Field(..., description="One revised chapter for each chapter to revise, in the same order.")
+
+
+parser = PydanticOutputParser(pydantic_object=ChapterRevision)
+
+CHAPTER_REPAIR_PROMPT = """
+# LESSON PLAN CHAPTER REPAIR
+
+You are an expert educational curriculum designer. A lesson plan was reviewed and
+only some of its chapters need changes. Rewrite ONLY the chapters listed below;
+the rest of the plan stays as it is.
+
+## LEARNER CONTEXT
+- **Subject:** {subject}
+- **Goal:** {goal}
+- **Current Level:** {level}
+- **Prior Curriculum:** {curriculum}
+
+## LEARNER PROFILE
+{persona_summary}
+
+## FULL PLAN OUTLINE (for context, do not rewrite)
+{outline}
+
+## REVIEW FEEDBACK TO ADDRESS
+{feedback}
+
+## LOW-SCORING CRITERIA
+{failing_criteria}
+
+## CHAPTERS TO REWRITE
+{chapters}
+
+## YOUR TASK
+Return exactly {count} chapter(s), one per chapter above and in the same order.
+Keep each chapter's place in the overall progression, fix the issues the
+feedback raises (content, sub-topic scope or time allocation), and set
+chapter_total_time_minutes to the sum of the sub-topic minutes.
+
+## OUTPUT FORMAT
+{format_instructions}
+"""
+
+
+def failing_criteria(evaluation_metrics, threshold: int = 7):
+    """The criteria scored below `threshold` by the evaluator."""
+    failing = []
+    for criterion, metric in (evaluation_metrics or {}).items():
+        score = metric.get("score") if isinstance(metric, dict) else None
+        if isinstance(score, (int, float)) and score < threshold:
+            failing.append(f"- {criterion}: {score}/10. {metric.get('comment', '')}".strip())
+    return "\n".join(failing) if failing else "None reported."
+
+
+def plan_outline(plan: LessonPlanModule):
+    lines = [f"Total: {plan.total_module_time_hours} hours"]
+    for number, chapter in enumerate(plan.chapters, 1):
+        sub_topics = "; ".join(sub_topic.sub_topic_title for sub_topic in chapter.sub_topics)
+        lines.append(f"{number}. {chapter.chapter_title} ({chapter.chapter_total_time_minutes} min): {sub_topics}")
+    return "\n".join(lines)
+
+
+async def repair_chapters(state):
+    """
+    LangGraph node: rewrites only `state.chapters_to_revise` and splices them
+    into the existing plan, so a retry round costs a few chapters instead of a
+    whole plan. Falls back to full regeneration if the repair can't be used.
+    """
+    plan = state.lesson_plan
+    if isinstance(plan, dict):
+        plan = LessonPlanModule.model_validate(plan)
+    numbers = sorted(set(state.chapters_to_revise))
+
+    try:
+        prompt_template = ChatPromptTemplate.from_template(CHAPTER_REPAIR_PROMPT)
+        formatted_prompt = prompt_template.format(
+            subject=state.subject,
+            goal=state.goal,
+            level=state.level,
+            curriculum=format_list_or_string(getattr(state, "taken_test_curriculum", None)),
+            persona_summary=format_persona_summary(getattr(state, "persona_summary", None)),
+            outline=plan_outline(plan),
+            feedback=state.feedback or "None",
+            failing_criteria=failing_criteria(state.evaluation_metrics),
+            chapters="\n\n".join(
+                f"### Chapter {number}\n{plan.chapters[number - 1].model_dump_json(indent=2)}" for number in numbers
+            ),
+            count=len(numbers),
+            format_instructions=parser.get_format_instructions(),
+        )
+        response = await llm.ainvoke(formatted_prompt)
+        revision = parser.parse(response.content)
+        if len(revision.chapters) != len(numbers):
+            raise ValueError(f"Expected {len(numbers)} chapters, got {len(revision.chapters)}")
+    except Exception as e:
+        print(f"❌ Chapter repair failed, regenerating the whole plan: {str(e)}")
+        repair_stats["fallbacks"] += 1
+        return await regenerate_lesson_plan(state)
+
+    for number, chapter in zip(numbers, revision.chapters):
+        plan.chapters[number - 1] = chapter
+    plan.total_module_time_hours = round(sum(c.chapter_total_time_minutes for c in plan.chapters) / 60, 2)
+
+    repair_stats["targeted"] += 1
+    repair_stats["chapters"] += len(numbers)
+    state.lesson_plan = plan
+    # A plan rejected by structural validation was never seen by the evaluator,
+    # so it gets a full evaluation rather than a review of the rewritten chapters
+    structural_only = STRUCTURAL_CRITERION in (state.evaluation_metrics or {})
+    state.revised_chapters = [] if structural_only else numbers
+    state.chapters_to_revise = []
+    return state
+
+
+async def regenerate_lesson_plan(state):
+    """LangGraph node: the full generator, clearing any pending chapter repair."""
+    repair_stats["full"] += 1
+    state.chapters_to_revise = []
+    state.revised_chapters = []
+    return await generate_lesson_plan(state)
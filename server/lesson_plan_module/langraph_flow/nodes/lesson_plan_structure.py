@@ -0,0 +1,113 @@
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_generator import LessonPlanModule
+
+MIN_CHAPTERS = 2
+MAX_CHAPTERS = 7
+# Evaluation rounds before the best plan so far is returned; the one value used by
+# prevalidation, the evaluator and check_retry_status in lesson_plan.py
+MAX_RETRIES = 3
+# evaluation_metrics key for plans rejected here, before any LLM evaluation
+STRUCTURAL_CRITERION = "Structural Validation"
+# Allowed gap between total_module_time_hours and the chapter minutes it should add up to
+HOURS_TOLERANCE = 0.05
+
+# passed: sent on to the LLM evaluator, rejected: sent straight back to the
+# generator without an evaluator call, repaired: arithmetic fixed locally
+prevalidation_stats = {"passed": 0, "repaired": 0, "rejected": 0}
+
+
+def _blank(text):
+    return not text or not str(text).strip()
+
+
+def check_structure(plan: LessonPlanModule):
+    """
+    Checks the mechanically verifiable rules of a lesson plan, fixing arithmetic
+    in place. Returns (repairs, problems): what was fixed, and what needs
+    rewriting as (chapter number, message) pairs, chapter None for the whole plan.
+    """
+    repairs, problems = [], []
+
+    if not MIN_CHAPTERS <= len(plan.chapters) <= MAX_CHAPTERS:
+        problems.append((None, f"The plan has {len(plan.chapters)} chapters; it needs {MIN_CHAPTERS}-{MAX_CHAPTERS}."))
+    if _blank(plan.overall_course_outcome):
+        problems.append((None, "overall_course_outcome is empty."))
+
+    for number, chapter in enumerate(plan.chapters, 1):
+        label = f"Chapter {number} ('{chapter.chapter_title}')"
+        if _blank(chapter.chapter_title):
+            problems.append((number, f"Chapter {number} has no title."))
+        if _blank(chapter.chapter_outcome):
+            problems.append((number, f"{label} has an empty chapter_outcome."))
+        if not chapter.sub_topics:
+            problems.append((number, f"{label} has no sub-topics."))
+            continue
+
+        for sub_number, sub_topic in enumerate(chapter.sub_topics, 1):
+            sub_label = f"{label}, sub-topic {sub_number} ('{sub_topic.sub_topic_title}')"
+            if _blank(sub_topic.sub_topic_title):
+                problems.append((number, f"{label}, sub-topic {sub_number} has no title."))
+            if _blank(sub_topic.sub_topic_outcome):
+                problems.append((number, f"{sub_label} has an empty sub_topic_outcome."))
+            if sub_topic.estimated_time_minutes <= 0:
+                problems.append((number, f"{sub_label} has estimated_time_minutes={sub_topic.estimated_time_minutes}."))
+
+        minutes = sum(sub_topic.estimated_time_minutes for sub_topic in chapter.sub_topics)
+        if chapter.chapter_total_time_minutes != minutes:
+            repairs.append(
+                f"{label}: chapter_total_time_minutes {chapter.chapter_total_time_minutes} -> {minutes} "
+                f"(sum of its sub-topics)."
+            )
+            chapter.chapter_total_time_minutes = minutes
+
+    hours = round(sum(chapter.chapter_total_time_minutes for chapter in plan.chapters) / 60, 2)
+    if abs(plan.total_module_time_hours - hours) > HOURS_TOLERANCE:
+        repairs.append(f"total_module_time_hours {plan.total_module_time_hours} -> {hours} (sum of chapter totals).")
+        plan.total_module_time_hours = hours
+
+    return repairs, problems
+
+
+async def prevalidate_lesson_plan(state):
+    """
+    LangGraph node run before the LLM evaluator. Arithmetic inconsistencies are
+    repaired in place; structural failures skip the evaluator and go straight
+    back to the generator (or chapter repair) with precise feedback.
+    """
+    if not state.lesson_plan:
+        # Nothing to check; the evaluator reports the missing plan
+        state.next_step = "evaluate"
+        return state
+
+    plan = state.lesson_plan
+    if isinstance(plan, dict):
+        plan = LessonPlanModule.model_validate(plan)
+    repairs, problems = check_structure(plan)
+    state.lesson_plan = plan
+
+    if repairs:
+        prevalidation_stats["repaired"] += 1
+        print(f"✅ Repaired lesson plan arithmetic: {' '.join(repairs)}")
+
+    if not problems:
+        prevalidation_stats["passed"] += 1
+        state.next_step = "evaluate"
+        return state
+
+    # Counts as an evaluation round, like a "Bad" grade from the evaluator
+    prevalidation_stats["rejected"] += 1
+    state.retry_count += 1
+    state.grade = "Bad"
+    messages = [message for _, message in problems]
+    state.feedback = "The lesson plan failed structural validation:\n" + "\n".join(f"- {m}" for m in messages)
+    state.evaluation_metrics = {
+        STRUCTURAL_CRITERION: {"score": 1, "comment": " ".join(messages)},
+    }
+    chapters = {number for number, _ in problems}
+    # Chapter-level problems can be repaired chapter by chapter; plan-wide ones need a new plan
+    state.chapters_to_revise = [] if None in chapters else sorted(chapters)
+    if state.retry_count >= MAX_RETRIES:
+        state.feedback += f"\n\nMaximum retry attempts ({MAX_RETRIES}) reached. Returning best available lesson plan."
+        state.next_step = "valid"
+    else:
+        state.next_step = "retry"
+    return state
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from bson import ObjectId
-from lesson_plan_module.core.mongo import sessions_col, persona_col, qa_col
+from lesson_plan_module.core.mongo import sessions_col
 from lesson_plan_module.core.mongo_fetch import fetch_lesson_plan
-from interview_module.services.mongo_persistence import save_lesson_plan
-from lesson_plan_module.langraph_flow.lesson_plan import xlesson_plan_graph
-from datetime import datetime
+from lesson_plan_module.services.lesson_plan_service import generate_and_store_lesson_plan, lesson_plan_etag
+from lesson_plan_module.services.job_queue import lesson_plan_jobs, public_job, QueueFullError, SUCCEEDED
+from interview_module.services.mongo_persistence import get_lesson_plan_versions
 
 router = APIRouter(
     prefix="/lesson-plan",
@@ -13,131 +13,77 @@ router = APIRouter(
 
 
 @router.get("/generate/{session_id}")
-async def generate_lesson_plan(session_id: str):
+async def generate_lesson_plan(session_id: str, force: bool = False):
     """
     Generate a lesson plan for a specific session and save it to the database.
+    Returns the stored plan if its inputs are unchanged, unless `force` is set.
+    Holds the connection for the whole pipeline; prefer POST /lesson-plan/jobs/{session_id}.
     """
-    # 1. Get session data
-    try:
-        session_data = sessions_col.find_one({"_id": ObjectId(session_id)})
-        if not session_data:
-            raise HTTPException(status_code=404, detail=f"Session not found")
-        session_data["_id"] = str(session_data["_id"])
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid session ID: {str(e)}")
+    return await generate_and_store_lesson_plan(session_id, force=force)
 
-    # 2. Get persona report
-    try:
-        persona_report = persona_col.find_one(
-            {"session_id": session_id},
-            sort=[("created_at", -1)]
-        )
-        if not persona_report:
-            raise HTTPException(status_code=404, detail="No persona report found")
-        persona_report_id = str(persona_report["_id"])
-        persona_report["_id"] = persona_report_id
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving persona report: {str(e)}")
 
-    # 3. Get Q&A and feedback history
+@router.post("/jobs/{session_id}", status_code=202)
+async def enqueue_lesson_plan_job(session_id: str, force: bool = False):
+    """
+    Queue lesson plan generation for a session. While a job for the same
+    session is queued or running, that job is returned instead of a new one.
+    """
+    if not ObjectId.is_valid(session_id):
+        raise HTTPException(status_code=400, detail=f"Invalid session ID: {session_id}")
     try:
-        qa_history = list(qa_col.find(
-            {"session_id": session_id},
-            {
-                "concept": 1,
-                "question": 1,
-                "answer": 1,
-                "feedback": 1,
-                "score": 1,
-                "_id": 1
-            }
-        ).sort("created_at", 1))
-        
-        # Convert ObjectId to string for each item
-        for qa in qa_history:
-            if "_id" in qa:
-                qa["_id"] = str(qa["_id"])
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving Q&A history: {str(e)}")
-
-    # 4. Prepare state for lesson plan generation
-    state = {
-        "session_id": session_id,
-        "user_id": session_data.get("user_id"),
-        "subject": session_data.get("subject"),
-        "goal": session_data.get("goal"),
-        "level": session_data.get("level"),
-        "persona_report": persona_report,
-        "feedback_history": qa_history,
-        "taken_test_curriculum": session_data.get("curriculum", [])
+        job, created = await lesson_plan_jobs.enqueue(session_id, force=force)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {
+        "status": "queued" if created else "already_in_progress",
+        "job": public_job(job)
     }
 
-    # 5. Generate lesson plan
-    try:
-        result = xlesson_plan_graph.invoke(state)
-        
-        # 6. Prepare response data
-        lesson_plan = result.get("lesson_plan")
-        lesson_plan_dict = None
 
-        if lesson_plan:
-            # Convert Pydantic model to dict for MongoDB storage
-            try:
-                # First try the model_dump method (Pydantic v2)
-                if hasattr(lesson_plan, "model_dump"):
-                    lesson_plan_dict = lesson_plan.model_dump()
-                # Fall back to dict() for Pydantic v1k
-                else:
-                    lesson_plan_dict = lesson_plan.dict()
-            except Exception as e:
-                # If conversion fails, use a string representation
-                lesson_plan_dict = {
-                    "raw_plan": str(lesson_plan),
-                    "conversion_error": str(e)
-                }
+@router.get("/jobs/{job_id}")
+async def get_lesson_plan_job(job_id: str):
+    """
+    Poll a lesson plan job. Once it has succeeded the stored lesson plan is included.
+    """
+    job = lesson_plan_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    response = {"job": public_job(job)}
+    if job["status"] == SUCCEEDED:
+        response["data"] = await fetch_lesson_plan(job["session_id"])
+    return response
 
-        response_data = {
-            "session_id": session_id,
-            "user_id": session_data.get("user_id"),
-            "subject": session_data.get("subject"),
-            "goal": session_data.get("goal"),
-            "level": session_data.get("level"),
-            "lesson_plan": lesson_plan_dict,  # Use the converted dict
-            "grade": result.get("grade"),
-            "feedback": result.get("feedback"),
-            "persona_report_id": persona_report_id,
-            "qa_history_ids": [qa["_id"] for qa in qa_history if "_id" in qa],
-            "curriculum_generated": session_data.get("curriculum", []),
-        }
-        
-        # 7. Save lesson plan to MongoDB
-        try:
-            lesson_plan_id = save_lesson_plan(session_id, response_data)
-            response_data["lesson_plan_id"] = lesson_plan_id
-            print(f"✅ Lesson plan saved with ID: {lesson_plan_id}")
-        except Exception as e:
-            print(f"❌ Error saving lesson plan: {str(e)}")
-            # Continue even if save fails
-            response_data["save_error"] = str(e)
-            
-        return response_data
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating lesson plan: {str(e)}")
+
+@router.get("/{session_id}/versions")
+async def get_lesson_plan_history(session_id: str):
+    """
+    The prior versions of a session's lesson plan, newest first. The current
+    plan is served by GET /lesson-plan/{session_id}.
+    """
+    versions = await get_lesson_plan_versions(session_id)
+    for version in versions:
+        if "created_at" in version:
+            version["created_at"] = version["created_at"].isoformat()
+    return {
+        "status": "success",
+        "data": versions
+    }
 
 
 @router.get("/{session_id}")
-async def get_lesson_plan(session_id: str):
+async def get_lesson_plan(session_id: str, request: Request, response: Response):
     """
     Retrieve the saved lesson plan for a specific session.
+    Supports ETag / If-None-Match so clients can revalidate without re-downloading.
     """
     try:
         # Get the saved lesson plan
-        lesson_plan = fetch_lesson_plan(session_id)
+        lesson_plan = await fetch_lesson_plan(session_id)
         
         if not lesson_plan:
             # Check if session exists
-            session_exists = sessions_col.find_one({"_id": ObjectId(session_id)})
+            session_exists = await sessions_col.find_one({"_id": ObjectId(session_id)})
             
             if not session_exists:
                 raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
@@ -147,6 +93,13 @@ async def get_lesson_plan(session_id: str):
                     detail=f"No lesson plan found for session {session_id}. Generate one first."
                 )
         
+        etag = lesson_plan_etag(lesson_plan)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+
         return {
             "status": "success",
             "data": lesson_plan
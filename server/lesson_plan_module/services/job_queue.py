@@ -0,0 +1,156 @@
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from lesson_plan_module.services.lesson_plan_service import generate_and_store_lesson_plan
+
+load_dotenv()
+
+LESSON_PLAN_WORKERS = int(os.getenv("LESSON_PLAN_WORKERS", "2"))
+LESSON_PLAN_QUEUE_SIZE = int(os.getenv("LESSON_PLAN_QUEUE_SIZE", "100"))
+# Finished jobs are kept this long so clients can still poll their result
+LESSON_PLAN_JOB_RETENTION_SECONDS = float(os.getenv("LESSON_PLAN_JOB_RETENTION_SECONDS", "3600"))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class LessonPlanJobQueue:
+    """
+    In-process job queue for lesson plan generation.
+
+    Jobs are deduplicated per session_id while one is queued or running, and
+    processed by a fixed pool of asyncio workers so at most `worker_count`
+    generation pipelines run at once per process.
+    """
+
+    def __init__(self, worker_count: int = LESSON_PLAN_WORKERS, max_queue_size: int = LESSON_PLAN_QUEUE_SIZE):
+        self.worker_count = worker_count
+        self.max_queue_size = max_queue_size
+        self.jobs = {}
+        self._active_by_session = {}
+        self._queue = None
+        self._workers = []
+
+    async def start(self):
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.worker_count)
+        ]
+        print(f"✅ Lesson plan job queue started with {self.worker_count} workers")
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def enqueue(self, session_id: str, **options):
+        """
+        Returns (job, created). If a job for this session is already queued or
+        running, that job is returned instead of creating a new one.
+        """
+        await self.start()
+        self._prune_finished()
+
+        active_job_id = self._active_by_session.get(session_id)
+        if active_job_id:
+            return self.jobs[active_job_id], False
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "session_id": session_id,
+            "options": options,
+            "status": QUEUED,
+            "stage": None,
+            "created_at": datetime.utcnow().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "lesson_plan_id": None,
+            "error": None,
+        }
+        try:
+            self._queue.put_nowait(job["job_id"])
+        except asyncio.QueueFull:
+            raise QueueFullError("Lesson plan queue is full, try again later")
+
+        self.jobs[job["job_id"]] = job
+        self._active_by_session[session_id] = job["job_id"]
+        return job, True
+
+    def get(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    def stats(self):
+        statuses = [job["status"] for job in self.jobs.values()]
+        return {
+            "workers": len(self._workers),
+            "queued": statuses.count(QUEUED),
+            "running": statuses.count(RUNNING),
+            "succeeded": statuses.count(SUCCEEDED),
+            "failed": statuses.count(FAILED),
+        }
+
+    async def _worker(self, worker_index: int):
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            try:
+                if job:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job):
+        job["status"] = RUNNING
+        job["started_at"] = datetime.utcnow().isoformat()
+
+        def on_progress(stage):
+            job["stage"] = stage
+
+        try:
+            result = await generate_and_store_lesson_plan(
+                job["session_id"], on_progress=on_progress, **job["options"]
+            )
+            job["lesson_plan_id"] = result.get("lesson_plan_id")
+            job["error"] = result.get("save_error")
+            job["status"] = FAILED if job["error"] else SUCCEEDED
+        except HTTPException as e:
+            job["status"] = FAILED
+            job["error"] = e.detail
+        except Exception as e:
+            job["status"] = FAILED
+            job["error"] = str(e)
+            print(f"❌ Lesson plan job {job['job_id']} failed: {str(e)}")
+        finally:
+            job["finished_at"] = datetime.utcnow().isoformat()
+            job["_finished_monotonic"] = time.monotonic()
+            self._active_by_session.pop(job["session_id"], None)
+
+    def _prune_finished(self):
+        cutoff = time.monotonic() - LESSON_PLAN_JOB_RETENTION_SECONDS
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.get("_finished_monotonic", float("inf")) < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+
+lesson_plan_jobs = LessonPlanJobQueue()
+
+
+def public_job(job):
+    """Job fields safe to return to clients."""
+    return {key: value for key, value in job.items() if not key.startswith("_") and key != "options"}
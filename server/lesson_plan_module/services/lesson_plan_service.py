@@ -0,0 +1,155 @@
+import hashlib
+import json
+from fastapi import HTTPException
+from lesson_plan_module.core.mongo_fetch import fetch_lesson_plan, fetch_session_bundle
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_generator import PROMPT_VERSION
+from interview_module.services.mongo_persistence import save_lesson_plan
+from lesson_plan_module.langraph_flow.lesson_plan import xlesson_plan_graph
+
+
+def lesson_plan_input_hash(session_data, persona_report, qa_history_ids):
+    """
+    Content hash of everything a lesson plan is generated from. A stored plan
+    with the same hash can be served instead of regenerating.
+    """
+    inputs = {
+        "session": {
+            key: session_data.get(key)
+            for key in ("user_id", "subject", "goal", "level", "curriculum")
+        },
+        "persona_report": persona_report,
+        "qa_history_ids": qa_history_ids,
+        "prompt_version": PROMPT_VERSION,
+    }
+    encoded = json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def lesson_plan_etag(lesson_plan_doc):
+    encoded = json.dumps(lesson_plan_doc, sort_keys=True, default=str).encode("utf-8")
+    return '"' + hashlib.sha256(encoded).hexdigest()[:32] + '"'
+
+
+async def generate_and_store_lesson_plan(session_id: str, on_progress=None, force: bool = False):
+    """
+    Runs the full generate/validate/retry pipeline for a session and saves the result.
+    If a stored plan was generated from identical inputs it is returned instead,
+    unless `force` is set.
+
+    Args:
+        session_id: The interview session to build the lesson plan for
+        on_progress: Optional callable receiving a short stage name as the pipeline advances
+        force: Regenerate even if the stored plan is up to date
+
+    Returns:
+        The stored lesson plan document (with "lesson_plan_id" on success)
+    """
+    def report(stage):
+        if on_progress:
+            on_progress(stage)
+
+    report("loading_inputs")
+
+    # 1-3. Session, latest persona report and Q&A history in one round trip
+    try:
+        session_data = await fetch_session_bundle(session_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid session ID: {str(e)}")
+    if not session_data:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    persona_report = session_data.pop("persona_report")
+    if not persona_report:
+        raise HTTPException(status_code=404, detail="No persona report found")
+    persona_report_id = persona_report["_id"]
+
+    # Only the fields the generator prompt has always seen
+    qa_history = [
+        {key: qa[key] for key in ("_id", "concept", "question", "answer", "feedback", "score") if key in qa}
+        for qa in session_data.pop("qa_history")
+    ]
+
+    qa_history_ids = [qa["_id"] for qa in qa_history if "_id" in qa]
+    input_hash = lesson_plan_input_hash(session_data, persona_report, qa_history_ids)
+
+    # Serve the stored plan if nothing it depends on has changed
+    if not force:
+        stored_plan = await fetch_lesson_plan(session_id)
+        if stored_plan and stored_plan.get("input_hash") == input_hash:
+            report("cached")
+            stored_plan["lesson_plan_id"] = stored_plan["_id"]
+            stored_plan["cached"] = True
+            return stored_plan
+
+    # 4. Prepare state for lesson plan generation
+    state = {
+        "session_id": session_id,
+        "user_id": session_data.get("user_id"),
+        "subject": session_data.get("subject"),
+        "goal": session_data.get("goal"),
+        "level": session_data.get("level"),
+        "persona_report": persona_report,
+        "feedback_history": qa_history,
+        "taken_test_curriculum": session_data.get("curriculum", [])
+    }
+
+    # 5. Generate lesson plan, reporting each finished graph node as progress
+    try:
+        result = {}
+        async for mode, chunk in xlesson_plan_graph.astream(state, stream_mode=["updates", "values"]):
+            if mode == "updates":
+                for node_name in chunk:
+                    report(node_name)
+            else:
+                result = chunk
+
+        # 6. Prepare response data
+        lesson_plan = result.get("lesson_plan")
+        lesson_plan_dict = None
+
+        if lesson_plan:
+            # Convert Pydantic model to dict for MongoDB storage
+            try:
+                # First try the model_dump method (Pydantic v2)
+                if hasattr(lesson_plan, "model_dump"):
+                    lesson_plan_dict = lesson_plan.model_dump()
+                # Fall back to dict() for Pydantic v1k
+                else:
+                    lesson_plan_dict = lesson_plan.dict()
+            except Exception as e:
+                # If conversion fails, use a string representation
+                lesson_plan_dict = {
+                    "raw_plan": str(lesson_plan),
+                    "conversion_error": str(e)
+                }
+
+        response_data = {
+            "session_id": session_id,
+            "user_id": session_data.get("user_id"),
+            "subject": session_data.get("subject"),
+            "goal": session_data.get("goal"),
+            "level": session_data.get("level"),
+            "lesson_plan": lesson_plan_dict,  # Use the converted dict
+            "grade": result.get("grade"),
+            "feedback": result.get("feedback"),
+            "persona_report_id": persona_report_id,
+            "qa_history_ids": qa_history_ids,
+            "curriculum_generated": session_data.get("curriculum", []),
+            "input_hash": input_hash,
+        }
+
+        # 7. Save lesson plan to MongoDB
+        report("saving")
+        try:
+            lesson_plan_id = await save_lesson_plan(session_id, response_data)
+            response_data["lesson_plan_id"] = lesson_plan_id
+            print(f"✅ Lesson plan saved with ID: {lesson_plan_id}")
+        except Exception as e:
+            print(f"❌ Error saving lesson plan: {str(e)}")
+            # Continue even if save fails
+            response_data["save_error"] = str(e)
+
+        return response_data
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating lesson plan: {str(e)}")
@@ -1,6 +1,22 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from interview_module.routes.interview_routes import router as interview_router
 from lesson_plan_module.routes.lesson_plan_routes import router as lesson_plan_router
+from interview_module.core.embedding_cache import embedding_cache_stats
+from interview_module.core.curriculum_cache import curriculum_cache
+from interview_module.core.llm import llm_gateway
+from interview_module.core.mongo import ping as mongo_ping, close as close_mongo, stats as mongo_stats
+from interview_module.core.indexes import index_provisioner
+from lesson_plan_module.services.job_queue import lesson_plan_jobs
+from interview_module.services.session_state import session_store
+from interview_module.services.qa_writer import qa_writer
+from interview_module.langraph_flow.interview_graph import close_interview_graph
+from interview_module.langraph_flow.nodes.decide import decision_stats
+from interview_module.services.speculative_questions import speculative_questions
+from interview_module.langraph_flow.nodes.prefetch import prefetch_stats
+from interview_module.core.instrumentation import node_stats, prometheus_metrics
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_structure import prevalidation_stats
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_repair import repair_stats
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI()
@@ -23,8 +39,82 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup_event():
+    await mongo_ping()
+    await index_provisioner.start()
+    await qa_writer.start()
+    await lesson_plan_jobs.start()
     print("✅ FastAPI server started. All modules initialized.")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await index_provisioner.stop()
+    await lesson_plan_jobs.stop()
+    await speculative_questions.stop()
+    await qa_writer.stop()
+    await close_interview_graph()
+    close_mongo()
+
 @app.get("/")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@app.get("/stats/embedding-cache")
+def embedding_cache_statistics():
+    return embedding_cache_stats()
+
+@app.get("/stats/curriculum-cache")
+def curriculum_cache_statistics():
+    return curriculum_cache.stats()
+
+@app.get("/stats/llm")
+def llm_gateway_statistics():
+    return llm_gateway.stats()
+
+@app.get("/stats/mongo")
+def mongo_statistics():
+    return mongo_stats()
+
+@app.get("/stats/mongo-indexes")
+def mongo_index_statistics():
+    return index_provisioner.stats()
+
+@app.get("/stats/lesson-plan-jobs")
+def lesson_plan_job_statistics():
+    return lesson_plan_jobs.stats()
+
+@app.get("/stats/qa-writes")
+def qa_write_statistics():
+    return qa_writer.stats()
+
+@app.get("/stats/sessions")
+async def session_store_statistics():
+    return await session_store.stats()
+
+@app.get("/stats/decisions")
+def decision_statistics():
+    return decision_stats
+
+@app.get("/stats/speculative-questions")
+def speculative_question_statistics():
+    return speculative_questions.stats()
+
+@app.get("/stats/prefetch")
+def prefetch_statistics():
+    return prefetch_stats
+
+@app.get("/stats/lesson-plan-prevalidation")
+def lesson_plan_prevalidation_statistics():
+    return prevalidation_stats
+
+@app.get("/stats/lesson-plan-repairs")
+def lesson_plan_repair_statistics():
+    return repair_stats
+
+@app.get("/stats/nodes")
+def node_statistics():
+    return node_stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(prometheus_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,14 @@
+import os
+import sys
+from pathlib import Path
+
+# The app imports its modules from the server directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Offline providers unless a real MongoDB is configured (see interview_module/core/fakes.py)
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("VECTOR_STORE_PROVIDER", "memory")
+os.environ.setdefault("INTERVIEW_CHECKPOINTER", "memory")
+os.environ.setdefault("GOOGLE_API_KEY", "offline")
+if not os.getenv("MONGO_URI"):
+    os.environ.setdefault("MONGO_PROVIDER", "mock")
@@ -0,0 +1,22 @@
+import pytest
+from interview_module.langraph_flow.nodes.decide import decide_by_rules
+
+POLICY = {"pass_score": 50, "max_retries": 3}
+
+
+@pytest.mark.parametrize("score, retry_count, margin, expected", [
+    (80, 0, 0, "next"),      # Pass
+    (50, 0, 0, "next"),      # Exactly the pass mark passes
+    (49, 0, 0, "retry"),     # Below the pass mark
+    (10, 2, 0, "retry"),     # Retries left
+    (10, 3, 0, "next"),      # Retry limit reached
+    (52, 3, 10, "next"),     # The retry limit wins over the ambiguous band
+    (45, 0, 10, None),       # Ambiguous: the LLM decides
+    (55, 1, 10, None),
+    (40, 0, 10, "retry"),    # The band excludes its edges
+    (60, 0, 10, "next"),
+])
+def test_decide_by_rules(score, retry_count, margin, expected):
+    decision = decide_by_rules(score, retry_count, ambiguous_margin=margin, **POLICY)
+
+    assert (decision.action if decision else None) == expected
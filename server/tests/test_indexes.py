@@ -0,0 +1,36 @@
+"""
+The hot queries must be planned with the indexes declared for them. Needs a
+real MongoDB (mongomock has no query planner): set MONGO_URI to run it. It
+works in a scratch database, MONGO_TEST_DB_NAME, dropped afterwards.
+"""
+import asyncio
+import os
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.getenv("MONGO_URI"), reason="needs a real MongoDB (MONGO_URI)")
+
+MONGO_TEST_DB_NAME = os.getenv("MONGO_TEST_DB_NAME", "interview_ai_index_test")
+
+
+def test_hot_queries_use_their_indexes():
+    from interview_module.core.indexes import HOT_QUERIES, IndexProvisioner, explain_hot_queries, missing_indexes
+    from interview_module.core.mongo import get_client
+
+    async def run():
+        database = get_client()[MONGO_TEST_DB_NAME]
+        try:
+            provisioner = IndexProvisioner(database=database, create=True)
+            await provisioner._provision()
+            assert provisioner.errors == []
+            assert await missing_indexes(database) == []
+            return await explain_hot_queries(database)
+        finally:
+            await get_client().drop_database(MONGO_TEST_DB_NAME)
+
+    results = asyncio.run(run())
+    assert len(results) == len(HOT_QUERIES)
+    for result in results:
+        assert result["ok"], (
+            f"{result['collection']} {result['query']} planned with {result['indexes_used'] or 'COLLSCAN'}, "
+            f"expected {result['expected_index']}"
+        )
@@ -0,0 +1,15 @@
+from interview_module.langraph_flow.interview_graph import create_interview_graph
+
+
+def test_speculation_replaces_the_prefetch_fan_out():
+    graph = create_interview_graph(speculative=True)
+
+    assert "PrefetchNextQuestion" not in graph.nodes
+    assert ("ScoreAnswer", "DecideNext") in graph.builder.edges
+
+
+def test_prefetch_runs_alongside_scoring_without_speculation():
+    graph = create_interview_graph(speculative=False)
+
+    assert ("AskQuestionLLM", "PrefetchNextQuestion") in graph.builder.edges
+    assert (("ScoreAnswer", "PrefetchNextQuestion"), "DecideNext") in graph.builder.waiting_edges
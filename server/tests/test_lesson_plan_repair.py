@@ -0,0 +1,101 @@
+"""Chapter-level repair of lesson plans (see lesson_plan_repair.py)."""
+import asyncio
+from types import SimpleNamespace
+from lesson_plan_module.langraph_flow.lesson_plan import LessonPlanInput
+from lesson_plan_module.langraph_flow.nodes import lesson_plan_repair
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_generator import Chapter, LessonPlanModule, SubTopic
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_repair import (
+    ChapterRevision,
+    failing_criteria,
+    plan_outline,
+    repair_chapters,
+)
+
+
+def chapter(title, minutes=30):
+    sub_topic = SubTopic(sub_topic_title=f"{title} basics", sub_topic_outcome="Can apply it",
+                         estimated_time_minutes=minutes)
+    return Chapter(chapter_title=title, chapter_outcome="Understands it", sub_topics=[sub_topic],
+                   chapter_total_time_minutes=minutes)
+
+
+def plan():
+    chapters = [chapter("Lists"), chapter("Loops"), chapter("Functions")]
+    return LessonPlanModule(
+        subject_name="Python", learner_level="beginner", learner_goal="Automate tasks",
+        overall_course_outcome="Writes small scripts", chapters=chapters, total_module_time_hours=1.5,
+    )
+
+
+class FakeLLM:
+    def __init__(self, *chapters):
+        self.content = ChapterRevision(chapters=list(chapters)).model_dump_json()
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        return SimpleNamespace(content=self.content)
+
+
+def state_for(lesson_plan, chapters_to_revise, evaluation_metrics=None):
+    return LessonPlanInput(subject="Python", goal="Automate tasks", level="beginner", lesson_plan=lesson_plan,
+                           chapters_to_revise=chapters_to_revise, evaluation_metrics=evaluation_metrics,
+                           feedback="Chapter 2 is too shallow.")
+
+
+def test_failing_criteria_lists_only_low_scores():
+    metrics = {
+        "Relevance": {"score": 9, "comment": "Fine"},
+        "Depth": {"score": 4, "comment": "Too shallow"},
+        "Pacing": {"comment": "No score"},
+    }
+
+    assert failing_criteria(metrics) == "- Depth: 4/10. Too shallow"
+    assert failing_criteria(None) == "None reported."
+
+
+def test_plan_outline_numbers_chapters_with_their_sub_topics():
+    outline = plan_outline(plan()).splitlines()
+
+    assert outline[0] == "Total: 1.5 hours"
+    assert outline[2] == "2. Loops (30 min): Loops basics"
+
+
+def test_only_the_failing_chapters_are_replaced(monkeypatch):
+    llm = FakeLLM(chapter("Loops in depth", minutes=90))
+    monkeypatch.setattr(lesson_plan_repair, "llm", llm)
+    original = plan()
+    state = state_for(original.model_copy(deep=True), [2], {"Depth": {"score": 4, "comment": "Too shallow"}})
+
+    state = asyncio.run(repair_chapters(state))
+
+    chapters = state.lesson_plan.chapters
+    assert llm.calls == 1
+    assert [c.chapter_title for c in chapters] == ["Lists", "Loops in depth", "Functions"]
+    assert chapters[0] == original.chapters[0] and chapters[2] == original.chapters[2]
+    assert state.lesson_plan.total_module_time_hours == 2.5
+    assert state.revised_chapters == [2] and state.chapters_to_revise == []
+
+
+def test_structurally_rejected_plan_gets_a_full_evaluation(monkeypatch):
+    monkeypatch.setattr(lesson_plan_repair, "llm", FakeLLM(chapter("Loops")))
+    metrics = {lesson_plan_repair.STRUCTURAL_CRITERION: {"score": 1, "comment": "Empty outcome"}}
+
+    state = asyncio.run(repair_chapters(state_for(plan(), [2], metrics)))
+
+    assert state.revised_chapters == []
+
+
+def test_unusable_repair_falls_back_to_a_full_plan(monkeypatch):
+    monkeypatch.setattr(lesson_plan_repair, "llm", FakeLLM(chapter("One"), chapter("Two")))
+    regenerated = []
+
+    async def generate_lesson_plan(state):
+        regenerated.append(state.chapters_to_revise)
+        return state
+
+    monkeypatch.setattr(lesson_plan_repair, "generate_lesson_plan", generate_lesson_plan)
+
+    asyncio.run(repair_chapters(state_for(plan(), [2])))
+
+    assert regenerated == [[]]
@@ -0,0 +1,108 @@
+"""Local structural checks that decide whether the LLM evaluator runs (see lesson_plan_structure.py)."""
+import asyncio
+from lesson_plan_module.langraph_flow.lesson_plan import LessonPlanInput, check_retry_status
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_generator import Chapter, LessonPlanModule, SubTopic
+from lesson_plan_module.langraph_flow.nodes.lesson_plan_structure import (
+    MAX_RETRIES,
+    STRUCTURAL_CRITERION,
+    check_structure,
+    prevalidate_lesson_plan,
+)
+
+
+def chapter(title, minutes=(30, 30)):
+    sub_topics = [
+        SubTopic(sub_topic_title=f"{title} {n}", sub_topic_outcome="Can apply it", estimated_time_minutes=m)
+        for n, m in enumerate(minutes, 1)
+    ]
+    return Chapter(chapter_title=title, chapter_outcome="Understands it", sub_topics=sub_topics,
+                   chapter_total_time_minutes=sum(minutes))
+
+
+def plan(*chapters, hours=None):
+    chapters = list(chapters) or [chapter("Lists"), chapter("Loops"), chapter("Functions")]
+    return LessonPlanModule(
+        subject_name="Python", learner_level="beginner", learner_goal="Automate tasks",
+        overall_course_outcome="Writes small scripts", chapters=chapters,
+        total_module_time_hours=hours if hours is not None else sum(c.chapter_total_time_minutes for c in chapters) / 60,
+    )
+
+
+def state_for(lesson_plan, retry_count=0):
+    return LessonPlanInput(subject="Python", goal="Automate tasks", level="beginner",
+                           lesson_plan=lesson_plan, retry_count=retry_count)
+
+
+def test_valid_plan_passes_unchanged():
+    repairs, problems = check_structure(plan())
+
+    assert repairs == [] and problems == []
+
+
+def test_arithmetic_is_repaired_in_place():
+    broken = plan(chapter("Lists"), chapter("Loops"), hours=5)
+    broken.chapters[1].chapter_total_time_minutes = 10
+
+    repairs, problems = check_structure(broken)
+
+    assert problems == []
+    assert len(repairs) == 2
+    assert broken.chapters[1].chapter_total_time_minutes == 60
+    assert broken.total_module_time_hours == 2
+
+
+def test_problems_name_their_chapter():
+    broken = plan(chapter("Lists"), chapter("Loops", minutes=(30, 0)), chapter("Functions"))
+    broken.chapters[2].chapter_outcome = " "
+
+    _, problems = check_structure(broken)
+
+    assert sorted(number for number, _ in problems) == [2, 3]
+
+
+def test_plan_wide_problems_have_no_chapter():
+    broken = plan()
+    broken.overall_course_outcome = ""
+
+    _, problems = check_structure(broken)
+
+    assert [number for number, _ in problems] == [None]
+
+
+def test_broken_plan_skips_the_evaluator_and_repairs_its_chapters():
+    broken = plan()
+    broken.chapters[1].sub_topics[0].sub_topic_outcome = ""
+
+    state = asyncio.run(prevalidate_lesson_plan(state_for(broken)))
+
+    # Not "evaluate": the LLM evaluator is never called for this plan
+    assert state.next_step == "retry"
+    assert state.grade == "Bad" and state.retry_count == 1
+    assert STRUCTURAL_CRITERION in state.evaluation_metrics
+    assert state.chapters_to_revise == [2]
+    assert check_retry_status(state) == "repair"
+
+
+def test_plan_wide_problem_regenerates_the_plan():
+    broken = plan()
+    broken.overall_course_outcome = ""
+
+    state = asyncio.run(prevalidate_lesson_plan(state_for(broken)))
+
+    assert state.chapters_to_revise == []
+    assert check_retry_status(state) == "continue"
+
+
+def test_valid_plan_goes_to_the_evaluator():
+    state = asyncio.run(prevalidate_lesson_plan(state_for(plan())))
+
+    assert state.next_step == "evaluate" and state.retry_count == 0
+
+
+def test_last_round_returns_the_best_plan():
+    broken = plan()
+    broken.chapters[0].chapter_title = ""
+
+    state = asyncio.run(prevalidate_lesson_plan(state_for(broken, retry_count=MAX_RETRIES - 1)))
+
+    assert state.next_step == "valid"
@@ -0,0 +1,198 @@
+"""Durability guarantees of the Q&A write-behind buffer (see qa_writer.py)."""
+import asyncio
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from interview_module.services.qa_writer import DUPLICATE_KEY, QAWriteBuffer
+
+
+class FakeCollection:
+    """
+    insert_many with MongoDB's unordered semantics. `fail_times` attempts
+    write their documents and then raise, like a write acknowledged too late;
+    `gate` holds every write until it is set.
+    """
+
+    def __init__(self, fail_times=0, delay=0.0, gate=None):
+        self.documents = {}
+        self.calls = 0
+        self.fail_times = fail_times
+        self.delay = delay
+        self.gate = gate
+
+    async def insert_many(self, batch, ordered=True):
+        self.calls += 1
+        if self.gate:
+            await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        errors = []
+        for index, document in enumerate(batch):
+            if document["_id"] in self.documents:
+                errors.append({"index": index, "code": DUPLICATE_KEY, "errmsg": "E11000 duplicate key"})
+            else:
+                self.documents[document["_id"]] = document
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionError("connection reset")
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+
+def documents(count):
+    return [{"_id": ObjectId(), "turn": turn} for turn in range(count)]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_flushes_when_a_batch_is_full():
+    async def scenario():
+        collection = FakeCollection()
+        writer = QAWriteBuffer(collection=collection, batch_size=3, flush_interval=60)
+        pending = documents(3)
+        for document in pending[:2]:
+            await writer.add(document)
+        await asyncio.sleep(0.05)
+        below_batch = len(collection.documents)
+        await writer.add(pending[2])
+        await asyncio.sleep(0.05)
+        full_batch = len(collection.documents)
+        await writer.stop()
+        return below_batch, full_batch, writer.stats()
+
+    below_batch, full_batch, stats = run(scenario())
+    assert below_batch == 0
+    assert full_batch == 3
+    assert stats["batches"] == 1 and stats["largest_batch"] == 3
+
+
+def test_flushes_on_the_interval():
+    async def scenario():
+        collection = FakeCollection()
+        writer = QAWriteBuffer(collection=collection, batch_size=50, flush_interval=0.05)
+        await writer.add(documents(1)[0])
+        await asyncio.sleep(0.2)
+        written = len(collection.documents)
+        await writer.stop()
+        return written
+
+    assert run(scenario()) == 1
+
+
+def test_stop_writes_everything_buffered():
+    async def scenario():
+        collection = FakeCollection()
+        writer = QAWriteBuffer(collection=collection, batch_size=2, flush_interval=60)
+        for document in documents(5):
+            await writer.add(document)
+        await writer.stop()
+        return collection, writer.stats()
+
+    collection, stats = run(scenario())
+    assert len(collection.documents) == 5
+    assert stats["written"] == 5 and stats["pending"] == 0 and stats["lost"] == 0
+
+
+def test_stop_finishes_a_batch_in_flight():
+    async def scenario():
+        collection = FakeCollection(delay=0.2)
+        writer = QAWriteBuffer(collection=collection, batch_size=5, flush_interval=60)
+        for document in documents(7):
+            await writer.add(document)
+        await asyncio.sleep(0.05)  # The first batch of 5 is now being written
+        assert collection.calls == 1 and not collection.documents
+        await writer.stop()
+        return collection, writer.stats()
+
+    collection, stats = run(scenario())
+    assert len(collection.documents) == 7
+    assert stats["written"] == 7 and stats["lost"] == 0
+
+
+def test_cancelled_flush_still_writes_its_batch():
+    async def scenario():
+        collection = FakeCollection(delay=0.1)
+        writer = QAWriteBuffer(collection=collection, batch_size=50, flush_interval=60)
+        for document in documents(3):
+            await writer.add(document)
+        reader = asyncio.create_task(writer.flush())
+        await asyncio.sleep(0.02)
+        reader.cancel()
+        await asyncio.sleep(0.15)
+        await writer.stop()
+        return collection
+
+    assert len(run(scenario()).documents) == 3
+
+
+def test_retry_after_partial_write_skips_duplicates():
+    async def scenario():
+        collection = FakeCollection(fail_times=1)
+        writer = QAWriteBuffer(collection=collection, batch_size=4, flush_interval=60, retry_delay=0.01)
+        for document in documents(4):
+            await writer.add(document)
+        await writer.stop()
+        return collection, writer.stats()
+
+    collection, stats = run(scenario())
+    assert collection.calls == 2
+    assert len(collection.documents) == 4
+    assert stats["written"] == 4 and stats["retries"] == 1 and stats["lost"] == 0
+
+
+def test_batches_that_keep_failing_are_counted_as_lost():
+    async def scenario():
+        collection = FakeCollection(fail_times=100)
+        writer = QAWriteBuffer(collection=collection, batch_size=2, flush_interval=60, retries=2, retry_delay=0.01)
+        for document in documents(3):
+            await writer.add(document)
+        await writer.stop()
+        return collection, writer.stats()
+
+    collection, stats = run(scenario())
+    assert collection.calls == 4  # Two batches, two attempts each
+    assert stats["written"] == 0 and stats["lost"] == 3 and stats["retries"] == 2
+
+
+def test_at_least_one_write_attempt_is_required():
+    with pytest.raises(ValueError):
+        QAWriteBuffer(collection=FakeCollection(), retries=0)
+
+
+def test_full_buffer_blocks_instead_of_dropping():
+    async def scenario():
+        gate = asyncio.Event()
+        collection = FakeCollection(gate=gate)
+        writer = QAWriteBuffer(collection=collection, batch_size=1, flush_interval=60, max_queue_size=2)
+        pending = documents(4)
+        for document in pending[:3]:  # One is being written, two fill the buffer
+            await writer.add(document)
+            await asyncio.sleep(0.01)
+        blocked = asyncio.create_task(writer.add(pending[3]))
+        await asyncio.sleep(0.05)
+        was_blocked = not blocked.done()
+        gate.set()
+        await asyncio.wait_for(blocked, timeout=1)
+        await writer.stop()
+        return was_blocked, collection, writer.stats()
+
+    was_blocked, collection, stats = run(scenario())
+    assert was_blocked
+    assert stats["backpressure_waits"] >= 1
+    assert len(collection.documents) == 4 and stats["lost"] == 0
+
+
+def test_disabled_writes_synchronously():
+    class Collection:
+        def __init__(self):
+            self.inserted = []
+
+        async def insert_one(self, document):
+            self.inserted.append(document)
+
+    collection = Collection()
+    writer = QAWriteBuffer(collection=collection, enabled=False)
+    run(writer.add({"_id": ObjectId()}))
+    assert len(collection.inserted) == 1 and writer.stats()["pending"] == 0
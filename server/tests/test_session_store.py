@@ -0,0 +1,34 @@
+import asyncio
+import pytest
+from interview_module.services.session_store import RedisSessionStore, SessionStore
+
+
+def test_incomplete_backend_fails_at_construction():
+    class NoDelete(SessionStore):
+        async def _get(self, key):
+            return None
+
+        async def _set(self, key, data):
+            pass
+
+        async def size(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        NoDelete()
+
+
+def test_redis_size_counts_only_session_keys():
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def scenario():
+        client = fakeredis.FakeAsyncRedis()
+        store = RedisSessionStore(client=client)
+        await client.set("unrelated", b"x")
+        await store.set("a", {"n": 1})
+        await store.set("b", {"n": 2})
+        await store.delete("a")
+        return await store.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["size"] == 1